@@ -14,6 +14,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from src.data.database import db_manager
 from src.data.models import Product, Site, ProductURL, PriceHistory
+from src.data.aggregates import rebuild_price_aggregates
 
 
 def generate_comprehensive_test_data():
@@ -208,6 +209,10 @@ def generate_comprehensive_test_data():
         # Final commit
         session.commit()
         print(f"✅ Created {len(price_records)} price records")
+
+        # Records were added directly, so recompute the latest-price aggregates
+        rebuild_price_aggregates(session)
+        session.commit()
         
         # Verify record count
         total_records = session.query(PriceHistory).count()
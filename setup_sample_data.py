@@ -19,9 +19,14 @@ def setup_fixed_urls():
     db_manager.initialize()
     
     with db_manager.get_session() as session:
-        from src.data.models import Site, Product, ProductURL
+        from src.data.models import (Site, Product, ProductURL, LatestPrice, DailyPriceRollup,
+                                     PageFingerprint, FetchTier)
         
         print("📋 Clearing existing data...")
+        session.query(LatestPrice).delete()
+        session.query(DailyPriceRollup).delete()
+        session.query(PageFingerprint).delete()
+        session.query(FetchTier).delete()
         session.query(ProductURL).delete()
         session.query(Product).delete() 
         session.query(Site).delete()
@@ -98,12 +98,9 @@ class ReportGenerator:
             price_df = pd.read_sql(price_query.statement, session.bind)
             
             # Product statistics
-            product_stats = []
-            products = session.query(Product).limit(10).all()
-            for product in products:
-                stats = self.stats_analyzer.get_price_statistics_for_product(product.id)
-                if stats:
-                    product_stats.append(stats)
+            product_ids = [product_id for (product_id,) in session.query(Product.id).limit(10).all()]
+            bulk_stats = self.stats_analyzer.get_price_statistics_bulk(product_ids)
+            product_stats = [bulk_stats[product_id] for product_id in product_ids if product_id in bulk_stats]
             
             # Recent price records with proper joins
             recent_prices_query = session.query(
@@ -0,0 +1,269 @@
+"""
+Columnar price-history snapshot for analysis workloads.
+Maintains an incrementally appended Parquet dataset of PriceHistory rows, partitioned
+by scrape date and site, that analyzers can read memory-mapped instead of through the ORM.
+"""
+
+import json
+import shutil
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy import func
+
+from ..data.database import db_manager
+from ..data.models import Product, PriceHistory, ProductURL, Site
+from ..cli.utils.config import config_manager
+from ..cli.utils.logger import get_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+except ImportError:  # The columnar snapshot is optional
+    pa = None
+
+logger = get_logger(__name__)
+
+# Low-cardinality string columns stored dictionary-encoded
+DICTIONARY_COLUMNS = ['product_name', 'category', 'currency', 'availability']
+
+
+class PriceHistorySnapshot:
+    """
+    Incrementally maintained Parquet snapshot of price history.
+    New rows are appended by primary-key watermark, so a refresh only reads
+    rows scraped since the previous refresh. Ids are not committed in order
+    when several writers insert at once, so each refresh also re-scans the
+    last `rescan_window` ids below the watermark for rows that committed
+    late; rows landing further behind are only picked up by rebuild().
+    """
+
+    def __init__(self, snapshot_dir: Optional[str] = None, chunk_size: int = None,
+                 rescan_window: int = None):
+        """
+        Initialize the snapshot.
+
+        Args:
+            snapshot_dir: Root directory of the Parquet dataset
+            chunk_size: Number of rows read from the database per chunk
+            rescan_window: Ids below the watermark checked for late commits on each refresh
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for the columnar snapshot. Install with: pip install pyarrow")
+
+        self.snapshot_dir = Path(snapshot_dir or config_manager.get_setting(
+            'analysis.snapshot.directory', 'data/snapshots/price_history'))
+        self.chunk_size = chunk_size or config_manager.get_setting('analysis.snapshot.chunk_size', 100000)
+        self.rescan_window = rescan_window if rescan_window is not None else config_manager.get_setting(
+            'analysis.snapshot.rescan_window', 1000)
+        self.state_path = self.snapshot_dir / '_state.json'
+
+    def refresh(self) -> int:
+        """
+        Append price rows added since the last refresh.
+        Rebuilds from scratch if the database no longer contains the rows already exported.
+
+        Returns:
+            int: Number of rows appended
+        """
+        state = self._load_state()
+        if state.get('writing'):
+            # A refresh stopped between writing a part and recording it; its rows are exported again
+            self._remove_part(state.pop('writing'))
+        last_id = state.get('last_id', 0)
+
+        with db_manager.get_session() as session:
+            max_id = session.query(func.max(PriceHistory.id)).scalar() or 0
+
+            if max_id < last_id:
+                logger.warning("Price history shrank since the last snapshot, rebuilding")
+                self._clear()
+                state, last_id = {}, 0
+
+            if 'recent_ids' not in state:
+                # Snapshots written before the re-scan window existed: take the window as exported
+                state['recent_ids'] = self._ids(session, max(0, last_id - self.rescan_window), last_id)
+
+            appended = 0
+            late_ids = sorted(set(self._ids(session, max(0, last_id - self.rescan_window), last_id))
+                              - set(state['recent_ids']))
+            if late_ids:
+                df = pd.read_sql(self._rows_query(session).filter(PriceHistory.id.in_(late_ids)).statement,
+                                 session.bind)
+                state = self._write_chunk(df, state, last_id)
+                appended += len(df)
+                logger.info(f"Snapshot picked up {len(df)} rows committed behind the watermark")
+
+            while last_id < max_id:
+                query = self._rows_query(session)\
+                    .filter(PriceHistory.id > last_id)\
+                    .filter(PriceHistory.id <= max_id)\
+                    .order_by(PriceHistory.id)\
+                    .limit(self.chunk_size)
+
+                df = pd.read_sql(query.statement, session.bind)
+                if df.empty:
+                    break
+
+                # Progress is recorded per chunk so an interrupted refresh resumes
+                last_id = int(df['id'].max())
+                state = self._write_chunk(df, state, last_id)
+                appended += len(df)
+
+        logger.info(f"Price history snapshot refreshed: {appended} rows appended (watermark {last_id})")
+        return appended
+
+    def rebuild(self) -> int:
+        """Discard the snapshot and export all price history again."""
+        self._clear()
+        return self.refresh()
+
+    def read(self, columns: Optional[List[str]] = None, product_ids: Optional[List[int]] = None,
+             site_name: Optional[str] = None, start_date: Optional[date] = None,
+             end_date: Optional[date] = None, with_price_only: bool = True) -> pd.DataFrame:
+        """
+        Read price history from the snapshot with column and predicate pushdown.
+
+        Args:
+            columns: Columns to load (defaults to all)
+            product_ids: Restrict to these product IDs
+            site_name: Restrict to a single site
+            start_date: First scrape date to include
+            end_date: Last scrape date to include
+            with_price_only: Skip rows without a price
+
+        Returns:
+            A DataFrame with one row per price record
+        """
+        if not self.snapshot_dir.exists() or not any(self.snapshot_dir.glob('**/*.parquet')):
+            return pd.DataFrame(columns=columns or [])
+
+        dataset = ds.dataset(
+            str(self.snapshot_dir),
+            format='parquet',
+            partitioning='hive',
+            filesystem=pafs.LocalFileSystem(use_mmap=True)
+        )
+
+        expression = None
+        conditions = []
+        if product_ids is not None:
+            conditions.append(ds.field('product_id').isin(list(product_ids)))
+        if site_name:
+            conditions.append(ds.field('site_name') == site_name)
+        if start_date:
+            conditions.append(ds.field('scrape_date') >= start_date.isoformat())
+        if end_date:
+            conditions.append(ds.field('scrape_date') <= end_date.isoformat())
+        if with_price_only:
+            conditions.append(ds.field('price').is_valid())
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        table = dataset.to_table(columns=columns, filter=expression)
+        return table.to_pandas()
+
+    def get_info(self) -> Dict[str, Any]:
+        """Get snapshot location, watermark and size on disk."""
+        files = list(self.snapshot_dir.glob('**/*.parquet')) if self.snapshot_dir.exists() else []
+        state = self._load_state()
+        return {
+            'directory': str(self.snapshot_dir),
+            'last_id': state.get('last_id', 0),
+            'refreshed_at': state.get('refreshed_at'),
+            'files': len(files),
+            'size_bytes': sum(f.stat().st_size for f in files)
+        }
+
+    def _rows_query(self, session):
+        """Query joining price rows with their product and site dimensions."""
+        return session.query(
+            PriceHistory.id,
+            PriceHistory.product_url_id,
+            ProductURL.product_id,
+            Product.name.label('product_name'),
+            Product.category,
+            Site.name.label('site_name'),
+            PriceHistory.price,
+            PriceHistory.currency,
+            PriceHistory.availability,
+            PriceHistory.scraped_at
+        ).join(ProductURL, PriceHistory.product_url_id == ProductURL.id)\
+         .join(Product, ProductURL.product_id == Product.id)\
+         .join(Site, ProductURL.site_id == Site.id)
+
+    def _ids(self, session, after_id: int, up_to_id: int) -> List[int]:
+        """Price history ids in (after_id, up_to_id]."""
+        return [row_id for row_id, in session.query(PriceHistory.id)
+                .filter(PriceHistory.id > after_id, PriceHistory.id <= up_to_id)]
+
+    def _write_chunk(self, df: pd.DataFrame, state: Dict[str, Any], last_id: int) -> Dict[str, Any]:
+        """
+        Write a chunk of rows into the date/site partitions and record it with the new watermark.
+        The part name is saved before writing, so a refresh interrupted in between
+        removes the part instead of exporting its rows twice.
+
+        Returns:
+            The saved state
+        """
+        ids = df['id'].astype(int)
+        part = f"part-{ids.min()}-{ids.max()}"
+        self._save_state({**state, 'writing': part})
+
+        df['scraped_at'] = pd.to_datetime(df['scraped_at'])
+        df['scrape_date'] = df['scraped_at'].dt.strftime('%Y-%m-%d')
+
+        table = pa.table({
+            'id': pa.array(df['id'], type=pa.int64()),
+            'product_url_id': pa.array(df['product_url_id'], type=pa.int32()),
+            'product_id': pa.array(df['product_id'], type=pa.int32()),
+            'price': pa.array(pd.to_numeric(df['price'], errors='coerce'), type=pa.float64()),
+            'scraped_at': pa.array(df['scraped_at'], type=pa.timestamp('us')),
+            **{
+                column: pa.array(df[column].astype(object).where(df[column].notna(), None),
+                                 type=pa.string()).dictionary_encode()
+                for column in DICTIONARY_COLUMNS
+            },
+            'site_name': pa.array(df['site_name'], type=pa.string()),
+            'scrape_date': pa.array(df['scrape_date'], type=pa.string()),
+        })
+
+        pq.write_to_dataset(
+            table,
+            root_path=str(self.snapshot_dir),
+            partition_cols=['scrape_date', 'site_name'],
+            basename_template=f"{part}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+
+        recent_ids = [row_id for row_id in state.get('recent_ids', []) + ids.tolist()
+                      if row_id > last_id - self.rescan_window]
+        state = {'last_id': last_id, 'recent_ids': sorted(recent_ids),
+                 'refreshed_at': datetime.utcnow().isoformat()}
+        self._save_state(state)
+        return state
+
+    def _remove_part(self, part: str) -> None:
+        for path in self.snapshot_dir.glob(f'**/{part}-*.parquet'):
+            path.unlink()
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.state_path.exists():
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        tmp_path.replace(self.state_path)
+
+    def _clear(self) -> None:
+        if self.snapshot_dir.exists():
+            shutil.rmtree(self.snapshot_dir)
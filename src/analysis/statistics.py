@@ -9,7 +9,7 @@ from sqlalchemy import func, case
 from typing import Dict, Any, List, Optional
 
 from ..data.database import db_manager
-from ..data.models import Product, PriceHistory, ProductURL, Site
+from ..data.models import Product, PriceHistory, ProductURL, Site, LatestPrice
 from ..cli.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -21,9 +21,19 @@ class StatisticsAnalyzer:
     Uses pandas for data manipulation and analysis.
     """
 
-    def __init__(self):
-        """Initialize the statistics analyzer."""
-        logger.info("StatisticsAnalyzer initialized.")
+    def __init__(self, use_snapshot: bool = False):
+        """
+        Initialize the statistics analyzer.
+
+        Args:
+            use_snapshot: Read price history from the columnar snapshot instead of the ORM.
+        """
+        self.snapshot = None
+        if use_snapshot:
+            from .snapshot import PriceHistorySnapshot
+            self.snapshot = PriceHistorySnapshot()
+            self.snapshot.refresh()
+        logger.info(f"StatisticsAnalyzer initialized{' (snapshot mode)' if self.snapshot else ''}.")
 
     def get_price_statistics_for_product(self, product_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -42,17 +52,20 @@ class StatisticsAnalyzer:
                 logger.warning(f"Product with ID {product_id} not found.")
                 return None
 
-            # Query to get price history for the product across all its URLs
-            query = session.query(
-                PriceHistory.price,
-                PriceHistory.scraped_at,
-                Site.name.label('site_name')
-            ).join(ProductURL, PriceHistory.product_url_id == ProductURL.id)\
-             .join(Site, ProductURL.site_id == Site.id)\
-             .filter(ProductURL.product_id == product_id)\
-             .filter(PriceHistory.price.isnot(None))
+            if self.snapshot is not None:
+                df = self.snapshot.read(columns=['price', 'scraped_at', 'site_name'], product_ids=[product_id])
+            else:
+                # Query to get price history for the product across all its URLs
+                query = session.query(
+                    PriceHistory.price,
+                    PriceHistory.scraped_at,
+                    Site.name.label('site_name')
+                ).join(ProductURL, PriceHistory.product_url_id == ProductURL.id)\
+                 .join(Site, ProductURL.site_id == Site.id)\
+                 .filter(ProductURL.product_id == product_id)\
+                 .filter(PriceHistory.price.isnot(None))
 
-            df = pd.read_sql(query.statement, query.session.bind)
+                df = pd.read_sql(query.statement, query.session.bind)
 
             if df.empty:
                 logger.info(f"No price history found for product ID {product_id}.")
@@ -75,6 +88,82 @@ class StatisticsAnalyzer:
 
             return stats
 
+    def get_price_statistics_bulk(self, product_ids: Optional[List[int]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Calculate price statistics for many products with a single query.
+        Produces the same statistics as get_price_statistics_for_product, computed
+        with grouped aggregations instead of one query per product.
+
+        Args:
+            product_ids: The IDs of the products to analyze, or None for all products.
+
+        Returns:
+            A dictionary mapping product ID to its statistics. Products without price data are omitted.
+        """
+        if product_ids is not None and not product_ids:
+            return {}
+
+        with db_manager.get_session() as session:
+            if self.snapshot is not None:
+                df = self.snapshot.read(columns=['product_id', 'price', 'scraped_at', 'site_name'],
+                                        product_ids=product_ids)
+                names_query = session.query(Product.id, Product.name)
+                if product_ids is not None:
+                    names_query = names_query.filter(Product.id.in_(product_ids))
+                product_names = dict(names_query.all())
+                df['product_name'] = df['product_id'].map(product_names)
+            else:
+                query = session.query(
+                    ProductURL.product_id,
+                    Product.name.label('product_name'),
+                    PriceHistory.price,
+                    PriceHistory.scraped_at,
+                    Site.name.label('site_name')
+                ).join(ProductURL, PriceHistory.product_url_id == ProductURL.id)\
+                 .join(Product, ProductURL.product_id == Product.id)\
+                 .join(Site, ProductURL.site_id == Site.id)\
+                 .filter(PriceHistory.price.isnot(None))
+
+                if product_ids is not None:
+                    query = query.filter(ProductURL.product_id.in_(product_ids))
+
+                df = pd.read_sql(query.statement, query.session.bind)
+
+        if df.empty:
+            return {}
+
+        df['site_name'] = df['site_name'].astype(str)
+        grouped = df.groupby('product_id')['price']
+        overall = grouped.agg(['count', 'mean', 'median', 'min', 'max', 'std'])
+        overall['last_price'] = df.sort_values('scraped_at').groupby('product_id')['price'].last()
+        overall['product_name'] = df.groupby('product_id')['product_name'].first()
+
+        by_site = df.groupby(['product_id', 'site_name'])['price'].agg(['mean', 'min', 'max', 'count'])
+        site_stats: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        for (product_id, site_name), row in by_site.iterrows():
+            site_stats.setdefault(product_id, {})[site_name] = {
+                'mean': row['mean'], 'min': row['min'], 'max': row['max'], 'count': int(row['count'])
+            }
+
+        results = {}
+        for product_id, row in overall.iterrows():
+            product_id = int(product_id)
+            results[product_id] = {
+                'product_id': product_id,
+                'product_name': row['product_name'],
+                'total_data_points': int(row['count']),
+                'mean_price': row['mean'],
+                'median_price': row['median'],
+                'min_price': row['min'],
+                'max_price': row['max'],
+                'std_dev_price': row['std'],
+                'last_price': row['last_price'],
+                'price_range': row['max'] - row['min'],
+                'stats_by_site': site_stats.get(product_id, {})
+            }
+
+        return results
+
     def get_overall_database_statistics(self) -> Dict[str, Any]:
         """
         Calculate overall statistics for the entire database.
@@ -123,16 +212,21 @@ class StatisticsAnalyzer:
             A pandas DataFrame with the most volatile products, or None.
         """
         with db_manager.get_session() as session:
-            # Query to get price data for each product (SQLite compatible)
-            query = session.query(
-                Product.id.label('product_id'),
-                Product.name.label('product_name'),
-                PriceHistory.price,
-                func.count(PriceHistory.id).over(partition_by=Product.id).label('data_points')
-            ).join(ProductURL, Product.id == ProductURL.product_id)\
-             .join(PriceHistory, ProductURL.id == PriceHistory.product_url_id)
+            if self.snapshot is not None:
+                df = self.snapshot.read(columns=['product_id', 'product_name', 'price'], with_price_only=False)
+                df['product_name'] = df['product_name'].astype(str)
+                df['data_points'] = df.groupby('product_id')['price'].transform('size')
+            else:
+                # Query to get price data for each product (SQLite compatible)
+                query = session.query(
+                    Product.id.label('product_id'),
+                    Product.name.label('product_name'),
+                    PriceHistory.price,
+                    func.count(PriceHistory.id).over(partition_by=Product.id).label('data_points')
+                ).join(ProductURL, Product.id == ProductURL.product_id)\
+                 .join(PriceHistory, ProductURL.id == PriceHistory.product_url_id)
 
-            df = pd.read_sql(query.statement, query.session.bind)
+                df = pd.read_sql(query.statement, query.session.bind)
 
             if df.empty:
                 return None
@@ -178,34 +272,26 @@ class StatisticsAnalyzer:
             A pandas DataFrame with the best deals, or None.
         """
         with db_manager.get_session() as session:
-            # Subquery to get the latest price for each product URL
-            latest_price_subq = session.query(
-                PriceHistory.product_url_id,
-                func.max(PriceHistory.scraped_at).label('latest_scrape')
-            ).group_by(PriceHistory.product_url_id).subquery()
-
-            # Query to get product details, average price, and latest price
+            # Latest price and running average per product URL come from the maintained aggregate
             query = session.query(
                 Product.id.label('product_id'),
                 Product.name.label('product_name'),
                 Site.name.label('site_name'),
-                func.avg(PriceHistory.price).label('avg_price'),
-                # Correlated subquery to get the latest price
-                (
-                    session.query(PriceHistory.price)
-                           .filter(PriceHistory.product_url_id == ProductURL.id)
-                           .filter(PriceHistory.scraped_at == latest_price_subq.c.latest_scrape)
-                           .scalar_subquery()
-                ).label('latest_price')
+                LatestPrice.price_sum,
+                LatestPrice.price_count,
+                LatestPrice.price.label('latest_price')
             ).join(ProductURL, Product.id == ProductURL.product_id)\
-             .join(PriceHistory, ProductURL.id == PriceHistory.product_url_id)\
+             .join(LatestPrice, ProductURL.id == LatestPrice.product_url_id)\
              .join(Site, ProductURL.site_id == Site.id)\
-             .group_by(Product.id, Product.name, Site.name)
+             .filter(LatestPrice.price_count > 0)
             
             if category:
                 query = query.filter(Product.category == category)
             
             df = pd.read_sql(query.statement, query.session.bind)
+            df[['price_sum', 'latest_price']] = df[['price_sum', 'latest_price']].astype(float)
+            # Divided here rather than in SQL, where SQLite truncates whole-number sums
+            df['avg_price'] = df.pop('price_sum') / df.pop('price_count')
 
             if df.empty or 'latest_price' not in df.columns or df['latest_price'].isnull().all():
                 return None
@@ -5,10 +5,11 @@ Analyzes price history to identify trends, moving averages, and significant chan
 
 import pandas as pd
 import numpy as np
+from datetime import date
 from typing import Optional, Dict, List, Any
 
 from ..data.database import db_manager
-from ..data.models import Product, PriceHistory, ProductURL, Site
+from ..data.models import Product, PriceHistory, ProductURL, Site, DailyPriceRollup
 from ..cli.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,9 +20,19 @@ class TrendAnalyzer:
     Performs time-based trend analysis on price data.
     """
 
-    def __init__(self):
-        """Initialize the trend analyzer."""
-        logger.info("TrendAnalyzer initialized.")
+    def __init__(self, use_snapshot: bool = False):
+        """
+        Initialize the trend analyzer.
+
+        Args:
+            use_snapshot: Read price history from the columnar snapshot instead of the ORM.
+        """
+        self.snapshot = None
+        if use_snapshot:
+            from .snapshot import PriceHistorySnapshot
+            self.snapshot = PriceHistorySnapshot()
+            self.snapshot.refresh()
+        logger.info(f"TrendAnalyzer initialized{' (snapshot mode)' if self.snapshot else ''}.")
 
     def get_price_history_dataframe(self, product_id: int, site_name: Optional[str] = None) -> Optional[pd.DataFrame]:
         """
@@ -34,6 +45,18 @@ class TrendAnalyzer:
         Returns:
             A DataFrame with price history, or None if no data.
         """
+        if self.snapshot is not None:
+            df = self.snapshot.read(columns=['scraped_at', 'price', 'site_name'],
+                                    product_ids=[product_id], site_name=site_name)
+            if df.empty:
+                return None
+
+            df = df.rename(columns={'site_name': 'site'})
+            df['site'] = df['site'].astype(str)
+            df.sort_values('scraped_at', inplace=True)
+            df.set_index('scraped_at', inplace=True)
+            return df
+
         with db_manager.get_session() as session:
             query = session.query(
                 PriceHistory.scraped_at,
@@ -59,55 +82,126 @@ class TrendAnalyzer:
             
             return df
 
-    def calculate_moving_average(self, product_id: int, window: int = 7) -> Optional[pd.Series]:
+    def get_daily_price_dataframe(self, product_id: int, site_name: Optional[str] = None,
+                                  start_date: Optional[date] = None,
+                                  end_date: Optional[date] = None) -> Optional[pd.DataFrame]:
+        """
+        Retrieve daily price aggregates for a product across all its URLs.
+        Reads the maintained daily rollups, so the cost grows with days rather than scrapes.
+
+        Args:
+            product_id: The ID of the product.
+            site_name: Optional site name to filter results.
+            start_date: Optional first day to include.
+            end_date: Optional last day to include.
+
+        Returns:
+            A DataFrame indexed by day with mean, min, max, count and last columns, or None if no data.
+        """
+        if self.snapshot is not None:
+            df = self.snapshot.read(columns=['scraped_at', 'price'], product_ids=[product_id],
+                                    site_name=site_name, start_date=start_date, end_date=end_date)
+            if df.empty:
+                return None
+
+            df.sort_values('scraped_at', inplace=True)
+            df['day'] = pd.to_datetime(df['scraped_at']).dt.normalize()
+            return df.groupby('day')['price'].agg(['mean', 'min', 'max', 'count', 'last'])
+
+        with db_manager.get_session() as session:
+            query = session.query(
+                DailyPriceRollup.day,
+                DailyPriceRollup.min_price,
+                DailyPriceRollup.max_price,
+                DailyPriceRollup.price_sum,
+                DailyPriceRollup.price_count,
+                DailyPriceRollup.last_price,
+                DailyPriceRollup.last_scraped_at
+            ).join(ProductURL, DailyPriceRollup.product_url_id == ProductURL.id)\
+             .filter(ProductURL.product_id == product_id)
+
+            if site_name:
+                query = query.join(Site, ProductURL.site_id == Site.id).filter(Site.name == site_name)
+            if start_date:
+                query = query.filter(DailyPriceRollup.day >= start_date)
+            if end_date:
+                query = query.filter(DailyPriceRollup.day <= end_date)
+
+            df = pd.read_sql(query.statement, query.session.bind)
+
+        if df.empty:
+            return None
+
+        # Combine the rollups of all the product's URLs into one row per day
+        price_columns = ['min_price', 'max_price', 'price_sum', 'last_price']
+        df[price_columns] = df[price_columns].astype(float)
+        df['day'] = pd.to_datetime(df['day'])
+        df.sort_values('last_scraped_at', inplace=True)
+
+        grouped = df.groupby('day')
+        daily = pd.DataFrame({
+            'mean': grouped['price_sum'].sum() / grouped['price_count'].sum(),
+            'min': grouped['min_price'].min(),
+            'max': grouped['max_price'].max(),
+            'count': grouped['price_count'].sum(),
+            'last': grouped['last_price'].last()
+        })
+        return daily
+
+    def calculate_moving_average(self, product_id: int, window: int = 7,
+                                 start_date: Optional[date] = None,
+                                 end_date: Optional[date] = None) -> Optional[pd.Series]:
         """
         Calculate the moving average for a product's price.
 
         Args:
             product_id: The ID of the product.
             window: The rolling window size in days.
+            start_date: Optional first day to include.
+            end_date: Optional last day to include.
 
         Returns:
             A pandas Series with the moving average, or None.
         """
-        df = self.get_price_history_dataframe(product_id)
-        if df is None:
+        daily = self.get_daily_price_dataframe(product_id, start_date=start_date, end_date=end_date)
+        if daily is None:
             return None
 
-        # Resample to daily frequency, taking the mean for days with multiple scrapes
-        daily_prices = df['price'].resample('D').mean().ffill()
+        # Daily mean price, carried forward over days without scrapes
+        daily_prices = daily['mean'].asfreq('D').ffill()
         
         # Calculate rolling average
         moving_avg = daily_prices.rolling(window=f'{window}D').mean()
         
         return moving_avg
 
-    def analyze_price_trend(self, product_id: int) -> Optional[Dict[str, Any]]:
+    def analyze_price_trend(self, product_id: int, start_date: Optional[date] = None,
+                            end_date: Optional[date] = None) -> Optional[Dict[str, Any]]:
         """
         Analyze the price trend for a product using linear regression.
 
         Args:
             product_id: The ID of the product.
+            start_date: Optional first day to include.
+            end_date: Optional last day to include.
 
         Returns:
             A dictionary with trend analysis results, or None.
         """
-        df = self.get_price_history_dataframe(product_id)
-        if df is None or len(df) < 2:
+        daily = self.get_daily_price_dataframe(product_id, start_date=start_date, end_date=end_date)
+        if daily is None or daily['count'].sum() < 2:
             return None
 
-        # Convert timestamps to numeric values for regression
-        df['time_ordinal'] = df.index.map(pd.Timestamp.toordinal)
-        
-        # Perform linear regression
-        X = df['time_ordinal'].values
-        y = df['price'].values
+        # Convert days to numeric values for regression
+        X = daily.index.map(pd.Timestamp.toordinal).values.astype(float)
+        y = daily['mean'].values
         
         # Add a constant for the intercept
         A = np.vstack([X, np.ones(len(X))]).T
         
-        # Solve for slope and intercept
-        slope, intercept = np.linalg.lstsq(A, y, rcond=None)[0]
+        # Weighting each daily mean by its scrape count gives the same fit as regressing every scrape
+        weights = np.sqrt(daily['count'].values.astype(float))
+        slope, intercept = np.linalg.lstsq(A * weights[:, None], y * weights, rcond=None)[0]
         
         trend_direction = "stable"
         if slope > 0.01:  # Threshold to avoid noise
@@ -120,12 +214,14 @@ class TrendAnalyzer:
             'trend_direction': trend_direction,
             'slope': slope,  # Price change per day
             'intercept': intercept,
-            'start_date': df.index.min(),
-            'end_date': df.index.max(),
-            'data_points': len(df)
+            'start_date': daily.index.min(),
+            'end_date': daily.index.max(),
+            'data_points': int(daily['count'].sum())
         }
 
-    def detect_significant_price_changes(self, product_id: int, period_days: int = 30, threshold: float = 0.10) -> List[Dict[str, Any]]:
+    def detect_significant_price_changes(self, product_id: int, period_days: int = 30, threshold: float = 0.10,
+                                         start_date: Optional[date] = None,
+                                         end_date: Optional[date] = None) -> List[Dict[str, Any]]:
         """
         Detect significant price drops or increases over a period.
 
@@ -133,30 +229,32 @@ class TrendAnalyzer:
             product_id: The ID of the product.
             period_days: The time window in days to look for changes.
             threshold: The percentage change to be considered significant (e.g., 0.10 for 10%).
+            start_date: Optional first day to include.
+            end_date: Optional last day to include.
 
         Returns:
             A list of dictionaries, each representing a significant price change.
         """
-        df = self.get_price_history_dataframe(product_id)
-        if df is None:
+        daily = self.get_daily_price_dataframe(product_id, start_date=start_date, end_date=end_date)
+        if daily is None:
             return []
         
-        # Resample to daily prices
-        daily_prices = df['price'].resample('D').mean().ffill()
+        # Daily mean prices, carried forward over days without scrapes
+        daily_prices = daily['mean'].asfreq('D').ffill()
         
         # Calculate percentage change over the period
         price_changes = daily_prices.pct_change(periods=period_days)
         
         significant_changes = []
-        for date, change in price_changes.dropna().items():
+        for day, change in price_changes.dropna().items():
             if abs(change) >= threshold:
                 change_type = "drop" if change < 0 else "increase"
                 significant_changes.append({
-                    'date': date,
+                    'date': day,
                     'change_percent': change * 100,
                     'change_type': change_type,
-                    'price_before': daily_prices.loc[date - pd.Timedelta(days=period_days)],
-                    'price_after': daily_prices.loc[date]
+                    'price_before': daily_prices.loc[day - pd.Timedelta(days=period_days)],
+                    'price_after': daily_prices.loc[day]
                 })
                 
         return significant_changes
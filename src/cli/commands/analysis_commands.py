@@ -20,10 +20,43 @@ def analyze():
 
 
 @analyze.command()
-@click.argument('product_id', type=int)
-def product(product_id: int):
-    """Get price statistics for a specific product."""
-    analyzer = StatisticsAnalyzer()
+@click.argument('product_ids', type=int, nargs=-1)
+@click.option('--all', 'all_products', is_flag=True, help='Summarize every product with price data.')
+@click.option('--snapshot', 'use_snapshot', is_flag=True, help='Read from the columnar price-history snapshot.')
+def product(product_ids: tuple, all_products: bool, use_snapshot: bool):
+    """Get price statistics for one or more products."""
+    if not product_ids and not all_products:
+        raise click.UsageError("Provide at least one PRODUCT_ID or --all.")
+
+    analyzer = StatisticsAnalyzer(use_snapshot=use_snapshot)
+
+    if all_products or len(product_ids) > 1:
+        all_stats = analyzer.get_price_statistics_bulk(None if all_products else list(product_ids))
+        if not all_stats:
+            click.echo("No statistics found for the requested products.")
+            return
+
+        rows = [{
+            'product_id': stats['product_id'],
+            'product_name': stats['product_name'][:40],
+            'records': stats['total_data_points'],
+            'mean': stats['mean_price'],
+            'median': stats['median_price'],
+            'min': stats['min_price'],
+            'max': stats['max_price'],
+            'last': stats['last_price'],
+            'sites': len(stats['stats_by_site'])
+        } for stats in all_stats.values()]
+
+        click.echo(f"--- Statistics for {len(rows)} Products ---")
+        click.echo(pd.DataFrame(rows).set_index('product_id').round(2).to_string())
+
+        missing = [product_id for product_id in product_ids if product_id not in all_stats]
+        if missing:
+            click.echo(f"\nNo statistics found for product ID(s): {', '.join(map(str, missing))}")
+        return
+
+    product_id = product_ids[0]
     stats = analyzer.get_price_statistics_for_product(product_id)
     
     if not stats:
@@ -42,9 +75,10 @@ def product(product_id: int):
 
 @analyze.command()
 @click.option('--top-n', default=10, help='Number of volatile products to show.')
-def volatility(top_n: int):
+@click.option('--snapshot', 'use_snapshot', is_flag=True, help='Read from the columnar price-history snapshot.')
+def volatility(top_n: int, use_snapshot: bool):
     """Identify products with the most volatile prices."""
-    analyzer = StatisticsAnalyzer()
+    analyzer = StatisticsAnalyzer(use_snapshot=use_snapshot)
     df = analyzer.get_price_volatility(top_n=top_n)
     
     if df is None or df.empty:
@@ -57,10 +91,17 @@ def volatility(top_n: int):
 
 @analyze.command()
 @click.argument('product_id', type=int)
-def trend(product_id: int):
+@click.option('--start-date', type=click.DateTime(formats=['%Y-%m-%d']), help='First day to include (YYYY-MM-DD).')
+@click.option('--end-date', type=click.DateTime(formats=['%Y-%m-%d']), help='Last day to include (YYYY-MM-DD).')
+@click.option('--snapshot', 'use_snapshot', is_flag=True, help='Read from the columnar price-history snapshot.')
+def trend(product_id: int, start_date, end_date, use_snapshot: bool):
     """Analyze the price trend for a specific product."""
-    analyzer = TrendAnalyzer()
-    trend_data = analyzer.analyze_price_trend(product_id)
+    analyzer = TrendAnalyzer(use_snapshot=use_snapshot)
+    trend_data = analyzer.analyze_price_trend(
+        product_id,
+        start_date=start_date.date() if start_date else None,
+        end_date=end_date.date() if end_date else None
+    )
     
     if not trend_data:
         click.echo(f"Could not analyze trend for product ID {product_id}. Not enough data.")
@@ -72,6 +113,26 @@ def trend(product_id: int):
     click.echo(f"  Analysis Period: {trend_data['start_date'].date()} to {trend_data['end_date'].date()}")
 
 
+@analyze.command()
+@click.option('--rebuild', is_flag=True, help='Discard the snapshot and export all price history again.')
+def snapshot(rebuild: bool):
+    """Refresh the columnar price-history snapshot used by --snapshot."""
+    try:
+        from ...analysis.snapshot import PriceHistorySnapshot
+        price_snapshot = PriceHistorySnapshot()
+    except ImportError as e:
+        click.echo(f"❌ {e}")
+        return
+
+    appended = price_snapshot.rebuild() if rebuild else price_snapshot.refresh()
+    info = price_snapshot.get_info()
+
+    click.echo(f"{'Rebuilt' if rebuild else 'Refreshed'} snapshot: {appended} rows added")
+    click.echo(f"  Directory: {info['directory']}")
+    click.echo(f"  Watermark: price_history.id <= {info['last_id']}")
+    click.echo(f"  Files: {info['files']} ({info['size_bytes'] / 1024:.1f} KB)")
+
+
 @analyze.command()
 @click.option('--type', default='comprehensive', help='Report type (comprehensive, summary, trends)')
 @click.option('--all', 'generate_all', is_flag=True, help='Generate all report types')
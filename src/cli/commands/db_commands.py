@@ -5,7 +5,7 @@ CLI commands for database management.
 import click
 
 from ...data.database import db_manager
-from ...data.models import Product, ProductURL, PriceHistory, Site
+from ...data.models import LatestPrice
 from ...cli.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -45,18 +45,30 @@ def reset():
         click.echo(f"Error: {e}", err=True)
 
 
+@db.command('rebuild-aggregates')
+def rebuild_aggregates():
+    """Recompute the latest-price and daily rollup aggregates from the full price history."""
+    try:
+        click.echo("Rebuilding price aggregates...")
+        count = db_manager.rebuild_price_aggregates()
+        click.echo(f"Price aggregates rebuilt for {count} product URLs.")
+    except Exception as e:
+        logger.error(f"Aggregate rebuild failed: {e}")
+        click.echo(f"Error: {e}", err=True)
+
+
 @db.command('show-last-product')
 def show_last_product():
     """Show details of the last scraped product."""
     logger.info("Attempting to retrieve last scraped product.")
     with db_manager.get_session() as session:
-        last_price_entry = session.query(PriceHistory).order_by(PriceHistory.scraped_at.desc()).first()
+        last_price_entry = session.query(LatestPrice).order_by(LatestPrice.scraped_at.desc()).first()
 
         if last_price_entry:
-            product_url = session.query(ProductURL).filter_by(id=last_price_entry.product_url_id).first()
+            product_url = last_price_entry.product_url
             if product_url:
-                product = session.query(Product).filter_by(id=product_url.product_id).first()
-                site = session.query(Site).filter_by(id=product_url.site_id).first()
+                product = product_url.product
+                site = product_url.site
 
                 click.echo(f"--- Last Scraped Product ---")
                 click.echo(f"Product Name: {product.name if product else 'N/A'}")
@@ -69,4 +81,4 @@ def show_last_product():
                 click.echo("Could not find product URL details for the last price entry.")
         else:
             click.echo("No product data found in the database. Please scrape some data first.")
-    logger.info("Finished retrieving last scraped product.") 
\ No newline at end of file
+    logger.info("Finished retrieving last scraped product.")
\ No newline at end of file
@@ -3,13 +3,18 @@ CLI commands for running scrapers.
 """
 
 import click
+import signal
+from datetime import datetime
 from typing import List
 from sqlalchemy import func
 
 from ...scrapers.concurrent_manager import ConcurrentScrapingManager
+from ...scrapers.queue_worker import QueueWorker
 from ...cli.utils.logger import get_logger
 from ...data.database import db_manager
-from ...data.models import ProductURL, Site
+from ...data.job_queue import JobQueue
+from ...data.refresh_schedule import RefreshScheduler
+from ...data.models import ProductURL, QueuedJob, ScrapingSession, Site
 
 logger = get_logger(__name__)
 
@@ -23,17 +28,79 @@ def scrape():
 @scrape.command()
 @click.option('--site', '-s', multiple=True, help='Run scraper for specific site(s). Can be used multiple times.')
 @click.option('--workers', '-w', type=int, default=3, help='Number of concurrent workers.')
-@click.option('--use-multiprocessing', is_flag=True, help='Use multiprocessing instead of threading.')
+@click.option('--use-multiprocessing', is_flag=True, help='Download in worker threads and parse in a process pool (one process per core).')
 @click.option('--limit', '-l', type=int, help='Limit the number of URLs to scrape per site.')
-def run(site: List[str], workers: int, use_multiprocessing: bool, limit: int):
+@click.option('--async-mode', is_flag=True, help='Fetch pages on an asyncio event loop with pooled connections.')
+@click.option('--concurrency', '-c', type=int, help='Maximum in-flight requests in async mode.')
+@click.option('--resume', 'resume_session', metavar='SESSION_ID',
+              help='Continue an interrupted run with the jobs it has not stored yet.')
+@click.option('--queue-only', is_flag=True, help='Only queue the jobs, for `scrape worker` processes to run.')
+@click.option('--due', 'due_only', is_flag=True,
+              help='Only scrape URLs due for a refresh, most overdue first (see `scrape schedule`).')
+def run(site: List[str], workers: int, use_multiprocessing: bool, limit: int,
+        async_mode: bool, concurrency: int, resume_session: str, queue_only: bool, due_only: bool):
     """Run scrapers for specified sites or all sites."""
     logger.info(f"Starting concurrent scraping run with {workers} workers.")
-    
+
+    if resume_session:
+        try:
+            job_queue = JobQueue.resume(resume_session)
+        except ValueError as e:
+            click.echo(str(e), err=True)
+            return
+    else:
+        if due_only:
+            # Most overdue first; the queue and each site's scheduler keep that order
+            jobs = [{'site_name': entry.site_name, 'url': entry.url}
+                    for entry in RefreshScheduler().due(sites=site, limit=limit)]
+        else:
+            jobs = _active_url_jobs(site, limit)
+
+        if not jobs:
+            if due_only:
+                click.echo("No URLs are due for a refresh.")
+            else:
+                logger.warning("No active URLs found in the database to scrape.")
+            return
+
+        # Persist the jobs before fetching anything so the run can be resumed
+        job_queue = JobQueue.create({'sites': list(site), 'limit': limit, 'workers': workers,
+                                     'due': due_only})
+        job_queue.enqueue(jobs)
+        if queue_only:
+            click.echo(f"Queued {len(jobs)} jobs in session {job_queue.session_id}.")
+            return
+
     manager = ConcurrentScrapingManager(
         max_workers=workers,
-        use_multiprocessing=use_multiprocessing
+        use_multiprocessing=use_multiprocessing,
+        job_queue=job_queue
     )
+    if not manager.load_queued_jobs():
+        job_queue.finish()
+        click.echo(f"Session {job_queue.session_id} has no jobs left to run.")
+        return
+    
+    # Run scrapers
+    try:
+        if async_mode:
+            manager.run_async(max_concurrency=concurrency)
+        else:
+            manager.start_workers()
+            manager.wait_completion()
+            manager.stop_workers()
+    except KeyboardInterrupt:
+        manager.stop_workers()
+        click.echo(f"Interrupted. Resume with: scrape run --resume {job_queue.session_id}")
+        return
+    
+    stats = manager.get_statistics()
+    logger.info(f"Scraping run completed. Results: {stats}")
+    click.echo(f"Scraping completed (session {job_queue.session_id}). See logs for details.")
+
 
+def _active_url_jobs(site: List[str], limit: int) -> List[dict]:
+    """Jobs for every active product URL, optionally of some sites only."""
     # Get URLs from database
     with db_manager.get_session() as session:
         query = session.query(ProductURL).filter(ProductURL.is_active == True)
@@ -58,19 +125,65 @@ def run(site: List[str], workers: int, use_multiprocessing: bool, limit: int):
                 'site_name': site_name,
                 'url': product_url.url
             })
+    return jobs
 
-    if not jobs:
-        logger.warning("No active URLs found in the database to scrape.")
-        return
 
-    # Add jobs to manager
-    manager.add_bulk_jobs(jobs)
+@scrape.command()
+@click.option('--workers', '-w', type=int, default=3, help='Number of concurrent workers in this process.')
+@click.option('--batch-size', '-b', type=int, help='Jobs leased from the queue at a time.')
+@click.option('--session', 'session_id', metavar='SESSION_ID', help='Only run jobs of this session.')
+@click.option('--use-multiprocessing', is_flag=True, help='Parse pages in a process pool (one process per core).')
+@click.option('--exit-when-idle', is_flag=True, help='Exit once no session has jobs left instead of waiting for more.')
+def worker(workers: int, batch_size: int, session_id: str, use_multiprocessing: bool, exit_when_idle: bool):
+    """Run a long-lived worker taking jobs from the shared queue."""
+    db_config = db_manager.db_config
+    if db_config.is_sqlite and db_config.sqlite_begin != 'IMMEDIATE':
+        logger.warning("Several workers sharing a SQLite database need database.sqlite_begin: IMMEDIATE")
     
-    # Run scrapers
-    manager.start_workers()
-    manager.wait_completion()
-    manager.stop_workers()
+    queue_worker = QueueWorker(max_workers=workers, batch_size=batch_size, session_id=session_id,
+                               use_multiprocessing=use_multiprocessing, exit_when_idle=exit_when_idle)
+    signal.signal(signal.SIGTERM, lambda signum, frame: queue_worker.stop())
+    try:
+        stats = queue_worker.run()
+    except KeyboardInterrupt:
+        queue_worker.stop()
+        stats = queue_worker.stats
+    click.echo(f"Worker stopped: {stats['jobs_completed']} jobs completed, "
+               f"{stats['jobs_failed']} failed, {stats['jobs_released']} returned to the queue.")
+
+
+@scrape.command()
+@click.option('--limit', '-l', type=int, default=10, help='Number of recent sessions to show.')
+def sessions(limit: int):
+    """List recent scraping sessions and the jobs each has left."""
+    with db_manager.get_session() as session:
+        rows = session.query(ScrapingSession).order_by(ScrapingSession.started_at.desc()).limit(limit).all()
+        if not rows:
+            click.echo("No scraping sessions recorded.")
+            return
+        for row in rows:
+            remaining = session.query(func.count(QueuedJob.id))\
+                .filter(QueuedJob.session_id == row.id, QueuedJob.status.in_(['pending', 'leased'])).scalar()
+            click.echo(f"{row.session_id}  {row.status:<11}  started {row.started_at:%Y-%m-%d %H:%M}  "
+                       f"stored {row.products_scraped}  failed {row.errors_count}  remaining {remaining}")
+
+
+@scrape.command()
+@click.option('--site', '-s', multiple=True, help='Only show URLs of these site(s).')
+@click.option('--limit', '-l', type=int, default=20, help='Number of URLs to show.')
+def schedule(site: List[str], limit: int):
+    """Show product URLs in refresh order with their change rates and due times."""
+    now = datetime.utcnow()
+    entries = RefreshScheduler().plan(sites=site, now=now)
+    if not entries:
+        click.echo("No active URLs found in the database.")
+        return
     
-    stats = manager.get_statistics()
-    logger.info(f"Scraping run completed. Results: {stats}")
-    click.echo(f"Scraping completed. See logs for details.") 
\ No newline at end of file
+    entries.sort(key=lambda entry: entry.overdue_ratio(now), reverse=True)
+    due = sum(entry.next_due_at <= now for entry in entries)
+    click.echo(f"{due} of {len(entries)} URLs are due for a refresh.")
+    for entry in entries[:limit]:
+        hours = entry.refresh_interval.total_seconds() / 3600
+        when = 'now' if entry.next_due_at <= now else f"{entry.next_due_at:%Y-%m-%d %H:%M}"
+        click.echo(f"{entry.site_name:<10} {entry.changes_per_day:6.2f} changes/day  every {hours:6.1f}h  "
+                   f"due {when:<16}  {entry.url}")
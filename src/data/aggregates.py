@@ -0,0 +1,249 @@
+"""
+Incrementally maintained price aggregates.
+Every path that inserts PriceHistory rows calls apply_price_rows in the same
+transaction, so the derived tables never drift from the history they summarize.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Any, Iterable, List, Tuple
+
+from sqlalchemy import and_, case, func, insert, or_
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .models import PriceHistory, LatestPrice, DailyPriceRollup
+from ..cli.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def apply_price_rows(session, rows: Iterable[Dict[str, Any]]) -> None:
+    """
+    Fold newly inserted price rows into the aggregate tables.
+    Each aggregate row is changed by a single upsert that adds to its sums and
+    keeps the newer of the stored and incoming prices in SQL, so concurrent
+    writers folding into the same row never lose each other's updates.
+
+    Args:
+        session: Session holding the transaction that inserted the rows
+        rows: Inserted rows with id, product_url_id, price, currency, availability and scraped_at
+    """
+    rows_by_url: Dict[int, List[Dict[str, Any]]] = {}
+    for row in rows:
+        rows_by_url.setdefault(row['product_url_id'], []).append(row)
+
+    if not rows_by_url:
+        return
+
+    latest_rows = []
+    for product_url_id, url_rows in rows_by_url.items():
+        # Ties on scraped_at go to the later insert
+        newest = max(url_rows, key=lambda row: (row['scraped_at'], row['id']))
+        prices = [Decimal(str(row['price'])) for row in url_rows if row['price'] is not None]
+        latest_rows.append({
+            'product_url_id': product_url_id,
+            'price_history_id': newest['id'],
+            'price': newest['price'],
+            'currency': newest.get('currency') or 'USD',
+            'availability': newest.get('availability'),
+            'scraped_at': newest['scraped_at'],
+            'price_sum': sum(prices, Decimal(0)),
+            'price_count': len(prices)
+        })
+
+    statement = _upsert(session, LatestPrice)
+    stored, incoming = LatestPrice.__table__.c, statement.excluded
+    newer = _is_newer(incoming.scraped_at, incoming.price_history_id, stored.scraped_at, stored.price_history_id)
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[stored.product_url_id],
+        set_={
+            **{column: case((newer, incoming[column]), else_=stored[column])
+               for column in ('price_history_id', 'price', 'currency', 'availability', 'scraped_at')},
+            'price_sum': stored.price_sum + incoming.price_sum,
+            'price_count': stored.price_count + incoming.price_count
+        }
+    ), latest_rows)
+
+    _apply_daily_rollups(session, rows_by_url)
+
+
+def _apply_daily_rollups(session, rows_by_url: Dict[int, List[Dict[str, Any]]]) -> None:
+    """Fold priced rows into their (product URL, day) rollups."""
+    rows_by_key: Dict[Tuple[int, date], List[Dict[str, Any]]] = {}
+    for product_url_id, url_rows in rows_by_url.items():
+        for row in url_rows:
+            if row['price'] is not None:
+                rows_by_key.setdefault((product_url_id, row['scraped_at'].date()), []).append(row)
+
+    if not rows_by_key:
+        return
+
+    rollup_rows = []
+    for (product_url_id, day), day_rows in rows_by_key.items():
+        prices = [Decimal(str(row['price'])) for row in day_rows]
+        last = max(day_rows, key=lambda row: (row['scraped_at'], row['id']))
+        rollup_rows.append({
+            'product_url_id': product_url_id,
+            'day': day,
+            'min_price': min(prices),
+            'max_price': max(prices),
+            'price_sum': sum(prices, Decimal(0)),
+            'price_count': len(prices),
+            'last_price': Decimal(str(last['price'])),
+            'last_scraped_at': last['scraped_at'],
+            'last_price_history_id': last['id']
+        })
+
+    statement = _upsert(session, DailyPriceRollup)
+    stored, incoming = DailyPriceRollup.__table__.c, statement.excluded
+    newer = _is_newer(incoming.last_scraped_at, incoming.last_price_history_id,
+                      stored.last_scraped_at, stored.last_price_history_id)
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[stored.product_url_id, stored.day],
+        set_={
+            'min_price': case((incoming.min_price < stored.min_price, incoming.min_price), else_=stored.min_price),
+            'max_price': case((incoming.max_price > stored.max_price, incoming.max_price), else_=stored.max_price),
+            'price_sum': stored.price_sum + incoming.price_sum,
+            'price_count': stored.price_count + incoming.price_count,
+            **{column: case((newer, incoming[column]), else_=stored[column])
+               for column in ('last_price', 'last_scraped_at', 'last_price_history_id')}
+        }
+    ), rollup_rows)
+
+
+def _upsert(session, model):
+    """INSERT ... ON CONFLICT statement for a model's table in the session's dialect (SQLite or PostgreSQL)."""
+    dialect = session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(model.__table__)
+    if dialect == 'sqlite':
+        return sqlite.insert(model.__table__)
+    raise NotImplementedError(f"Price aggregates need an upsert, which is not implemented for {dialect}")
+
+
+def _is_newer(scraped_at, price_history_id, stored_scraped_at, stored_price_history_id):
+    """SQL condition for a price being newer than the stored one; ties on scraped_at go to the later insert."""
+    return or_(scraped_at > stored_scraped_at,
+               and_(scraped_at == stored_scraped_at, price_history_id > stored_price_history_id))
+
+
+def _fold_into_rollup(rollup: DailyPriceRollup, row: Dict[str, Any]) -> None:
+    """Add one priced row to a daily rollup."""
+    price = Decimal(str(row['price']))
+
+    if rollup.price_count:
+        rollup.min_price = min(Decimal(rollup.min_price), price)
+        rollup.max_price = max(Decimal(rollup.max_price), price)
+        rollup.price_sum = Decimal(rollup.price_sum) + price
+        rollup.price_count += 1
+        if (row['scraped_at'], row['id']) < (rollup.last_scraped_at, rollup.last_price_history_id):
+            return
+    else:
+        rollup.min_price = rollup.max_price = rollup.price_sum = price
+        rollup.price_count = 1
+
+    rollup.last_price = price
+    rollup.last_scraped_at = row['scraped_at']
+    rollup.last_price_history_id = row['id']
+
+
+def apply_price_record(session, record: PriceHistory) -> None:
+    """
+    Fold a single flushed PriceHistory object into the aggregate tables.
+
+    Args:
+        session: Session the record was flushed in
+        record: Price record with its id and scraped_at assigned
+    """
+    apply_price_rows(session, [{
+        'id': record.id,
+        'product_url_id': record.product_url_id,
+        'price': record.price,
+        'currency': record.currency,
+        'availability': record.availability,
+        'scraped_at': record.scraped_at
+    }])
+
+
+def rebuild_price_aggregates(session) -> int:
+    """
+    Recompute the latest-price and daily rollup tables from the full price history.
+    Used to backfill existing databases and after bulk loads that bypass apply_price_rows.
+
+    Args:
+        session: Session to rebuild in
+
+    Returns:
+        int: Number of product URLs with aggregates
+    """
+    ranked = session.query(
+        PriceHistory.id,
+        PriceHistory.product_url_id,
+        PriceHistory.price,
+        PriceHistory.currency,
+        PriceHistory.availability,
+        PriceHistory.scraped_at,
+        func.row_number().over(
+            partition_by=PriceHistory.product_url_id,
+            order_by=(PriceHistory.scraped_at.desc(), PriceHistory.id.desc())
+        ).label('position')
+    ).subquery()
+
+    totals = {
+        product_url_id: (price_sum, price_count)
+        for product_url_id, price_sum, price_count in session.query(
+            PriceHistory.product_url_id,
+            func.sum(PriceHistory.price),
+            func.count(PriceHistory.price)
+        ).group_by(PriceHistory.product_url_id)
+    }
+
+    latest_rows = []
+    for row in session.query(ranked).filter(ranked.c.position == 1):
+        price_sum, price_count = totals.get(row.product_url_id, (0, 0))
+        latest_rows.append({
+            'product_url_id': row.product_url_id,
+            'price_history_id': row.id,
+            'price': row.price,
+            'currency': row.currency,
+            'availability': row.availability,
+            'scraped_at': row.scraped_at,
+            'price_sum': price_sum or 0,
+            'price_count': price_count
+        })
+
+    session.query(LatestPrice).delete(synchronize_session=False)
+    if latest_rows:
+        session.execute(insert(LatestPrice), latest_rows)
+
+    # Daily rollups are folded in Python from a single streamed pass over priced history
+    rollups: Dict[Tuple[int, date], DailyPriceRollup] = {}
+    history = session.query(
+        PriceHistory.id,
+        PriceHistory.product_url_id,
+        PriceHistory.price,
+        PriceHistory.scraped_at
+    ).filter(PriceHistory.price.isnot(None)).yield_per(10000)
+
+    for row in history:
+        key = (row.product_url_id, row.scraped_at.date())
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = rollups[key] = DailyPriceRollup(product_url_id=key[0], day=key[1])
+        _fold_into_rollup(rollup, row._mapping)
+
+    session.query(DailyPriceRollup).delete(synchronize_session=False)
+    session.add_all(rollups.values())
+
+    logger.info(f"Rebuilt price aggregates for {len(latest_rows)} product URLs")
+    return len(latest_rows)
+
+
+def aggregates_need_backfill(session) -> bool:
+    """Whether price history exists that the aggregate tables have never seen."""
+    if session.query(PriceHistory.id).first() is None:
+        return False
+    if session.query(LatestPrice.product_url_id).first() is None:
+        return True
+    has_priced_history = session.query(PriceHistory.id).filter(PriceHistory.price.isnot(None)).first() is not None
+    return has_priced_history and session.query(DailyPriceRollup.product_url_id).first() is None
@@ -0,0 +1,392 @@
+"""
+Write-behind batch writer for scraped results.
+Buffers scraped products and stores them in batched transactions with cached id lookups.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+
+from .database import db_manager, DatabaseManager
+from .models import Site, Product, ProductURL, PriceHistory
+from .aggregates import apply_price_rows
+from .fingerprints import FingerprintStore
+from .fetch_tiers import fetch_tier_store
+from ..scrapers.data_models import ProductData
+from ..cli.utils.config import config_manager
+from ..cli.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ProductIdCache:
+    """
+    In-memory cache of site, product and product URL ids.
+    Missing rows are created inside the caller's session; ids created in a
+    transaction only become visible to other callers once it commits.
+    """
+
+    def __init__(self, scraper_type: str = "concurrent"):
+        """
+        Initialize the id cache.
+
+        Args:
+            scraper_type: Scraper type recorded on newly created sites
+        """
+        self.scraper_type = scraper_type
+        self._committed: Dict[str, Dict[str, int]] = {'site': {}, 'product': {}, 'url': {}}
+        self._pending: Dict[str, Dict[str, int]] = {'site': {}, 'product': {}, 'url': {}}
+        self._created: Dict[str, int] = {'site': 0, 'product': 0, 'url': 0}
+        self._lock = threading.Lock()
+
+    def resolve_site(self, session, site_name: str) -> int:
+        """Get the id of a site by case-insensitive name, creating it if needed."""
+        key = site_name.lower()
+        site_id = self._lookup('site', key)
+        if site_id is not None:
+            return site_id
+
+        site = session.query(Site).filter(func.lower(Site.name) == key).first()
+        created = site is None
+        if created:
+            # Config is keyed by lower-case name, so 'Amazon' from the spiders gets its base URL and rate limit
+            site_config = config_manager.get_all_sites().get(key, {})
+            site = Site(
+                name=site_name,
+                base_url=site_config.get('base_url', f"https://www.{key}.com"),
+                scraper_type=self.scraper_type,
+                rate_limit=site_config.get('rate_limit', 2.0)
+            )
+            session.add(site)
+            session.flush()
+
+        return self._remember('site', key, site.id, created)
+
+    def resolve_product(self, session, product_data: ProductData) -> int:
+        """Get the id of a product by name, creating it if needed."""
+        key = product_data.title
+        product_id = self._lookup('product', key)
+        if product_id is not None:
+            return product_id
+
+        product = session.query(Product.id).filter(Product.name == key).first()
+        created = product is None
+        if created:
+            product = Product(
+                name=key,
+                category=product_data.metadata.get('category', 'electronics'),
+                brand=product_data.brand or 'None',
+                model=product_data.model or 'None'
+            )
+            session.add(product)
+            session.flush()
+
+        return self._remember('product', key, product.id, created)
+
+    def resolve_product_url(self, session, url: str, product_id: int, site_id: int) -> int:
+        """Get the id of a product URL, creating it or moving the product's URL on the site if needed."""
+        product_url_id = self._lookup('url', url)
+        if product_url_id is not None:
+            return product_url_id
+
+        product_url = session.query(ProductURL).filter(ProductURL.url == url).first()
+        if not product_url:
+            # A product has one URL per site (uq_product_site); a new URL replaces the stored one
+            product_url = session.query(ProductURL).filter(
+                ProductURL.product_id == product_id,
+                ProductURL.site_id == site_id
+            ).first()
+            if product_url:
+                logger.info(f"Product URL {product_url.id} moved from {product_url.url} to {url}")
+                self._forget('url', product_url.url)
+                product_url.url = url
+
+        created = product_url is None
+        if created:
+            product_url = ProductURL(
+                product_id=product_id,
+                site_id=site_id,
+                url=url,
+                selector_config='{}',
+                is_active=True
+            )
+            session.add(product_url)
+            session.flush()
+
+        return self._remember('url', url, product_url.id, created)
+
+    def commit(self) -> Dict[str, int]:
+        """
+        Publish ids resolved in the current transaction.
+
+        Returns:
+            Dict[str, int]: Sites, products and URLs the transaction created
+        """
+        with self._lock:
+            for kind, pending in self._pending.items():
+                self._committed[kind].update(pending)
+                pending.clear()
+            created, self._created = self._created, {kind: 0 for kind in self._created}
+            return created
+
+    def rollback(self) -> None:
+        """Forget ids resolved in a transaction that did not commit."""
+        with self._lock:
+            for pending in self._pending.values():
+                pending.clear()
+            self._created = {kind: 0 for kind in self._created}
+
+    def _lookup(self, kind: str, key: str) -> Optional[int]:
+        with self._lock:
+            value = self._committed[kind].get(key)
+            if value is None:
+                value = self._pending[kind].get(key)
+            return value
+
+    def _forget(self, kind: str, key: str) -> None:
+        with self._lock:
+            self._committed[kind].pop(key, None)
+            self._pending[kind].pop(key, None)
+
+    def _remember(self, kind: str, key: str, value: int, created: bool = False) -> int:
+        with self._lock:
+            self._pending[kind][key] = value
+            if created:
+                self._created[kind] += 1
+        return value
+
+
+class PriceHistoryBatchWriter:
+    """
+    Write-behind batcher for scraped product data.
+    Results are buffered and committed by a background thread every `batch_size`
+    rows or `flush_interval_ms` milliseconds, whichever comes first.
+    """
+
+    def __init__(self, batch_size: int = None, flush_interval_ms: int = None,
+                 db: DatabaseManager = None, scraper_type: str = "concurrent"):
+        """
+        Initialize the batch writer.
+
+        Args:
+            batch_size: Number of buffered results that triggers a flush
+            flush_interval_ms: Maximum time a result stays buffered
+            db: Database manager to write through (defaults to the global instance)
+            scraper_type: Scraper type recorded on newly created sites
+        """
+        self.batch_size = batch_size or config_manager.get_setting('database.batch_writer.batch_size', 200)
+        self.flush_interval = (flush_interval_ms or config_manager.get_setting(
+            'database.batch_writer.flush_interval_ms', 500)) / 1000.0
+        self.db = db or db_manager
+        self.id_cache = ProductIdCache(scraper_type=scraper_type)
+        self.fingerprints = FingerprintStore(self.db)
+        self.fetch_tiers = fetch_tier_store
+        # Durable queue whose jobs are acknowledged with their results (set by the manager)
+        self.job_queue = None
+
+        self._buffer: List[Tuple[ProductData, str, datetime]] = []
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'rows_written': 0,
+            'rows_failed': 0,
+            'batches_written': 0,
+            'pages_unchanged': 0,
+            'products_created': 0,
+            'urls_created': 0
+        }
+
+    def start(self) -> None:
+        """Start the background flush thread."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._run, name="PriceHistoryBatchWriter", daemon=True)
+        self._thread.start()
+        logger.info(f"Batch writer started: batch_size={self.batch_size}, "
+                    f"flush_interval={self.flush_interval * 1000:.0f}ms")
+
+    def stop(self) -> None:
+        """Stop the background thread and flush everything still buffered."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+
+    def add(self, product_data: ProductData, site_name: str) -> None:
+        """
+        Buffer a scraped product for the next batch.
+
+        Args:
+            product_data: Processed product data
+            site_name: Name of the site it was scraped from
+        """
+        with self._condition:
+            self._buffer.append((product_data, site_name, datetime.utcnow()))
+            if len(self._buffer) >= self.batch_size:
+                self._condition.notify_all()
+
+    def flush(self) -> int:
+        """
+        Write all buffered results now.
+
+        Returns:
+            int: Number of price rows written
+        """
+        with self._condition:
+            batch, self._buffer = self._buffer, []
+
+        if not batch:
+            return 0
+
+        return self.write_batch(batch)['rows_written']
+
+    def pending(self) -> int:
+        """Get the number of buffered results."""
+        with self._condition:
+            return len(self._buffer)
+
+    def _run(self) -> None:
+        """Background loop flushing on batch size or interval (runs in separate thread)."""
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.flush_interval
+                while self._running and len(self._buffer) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                if not self._running:
+                    return
+
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Batch writer flush failed: {e}")
+
+    def write_batch(self, batch: List[Tuple[ProductData, str, datetime]]) -> Dict[str, int]:
+        """
+        Store a batch in one transaction, falling back to per-row writes if it fails.
+        Safe to call from any thread; batches are written one at a time.
+
+        Args:
+            batch: (product_data, site_name, captured_at) tuples
+
+        Returns:
+            Dict[str, int]: Price rows written, results stored and failed, and
+                products and product URLs created
+        """
+        with self._write_lock:
+            return self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Tuple[ProductData, str, datetime]]) -> Dict[str, int]:
+        try:
+            result = self._store(batch)
+            result.update(items_stored=len(batch), items_failed=0)
+            self.stats['batches_written'] += 1
+            logger.debug(f"Stored batch of {len(batch)} results ({result['rows_written']} price rows)")
+            return result
+        except Exception as e:
+            logger.warning(f"Batch of {len(batch)} results failed ({e}), retrying row by row")
+
+        result = {'rows_written': 0, 'items_stored': 0, 'items_failed': 0,
+                  'products_created': 0, 'urls_created': 0}
+        for item in batch:
+            try:
+                for key, value in self._store([item]).items():
+                    result[key] += value
+                result['items_stored'] += 1
+            except Exception as e:
+                result['items_failed'] += 1
+                self.stats['rows_failed'] += 1
+                logger.error(f"Database storage failed for {item[0].url}: {e}")
+        return result
+
+    def _store(self, batch: List[Tuple[ProductData, str, datetime]]) -> Dict[str, int]:
+        """Resolve ids and bulk insert price rows for a batch in a single transaction."""
+        fingerprints = {}
+        try:
+            with self.db.get_session() as session:
+                rows = []
+                unchanged = []
+                job_ids = []
+                for product_data, site_name, captured_at in batch:
+                    # Kept on the item until commit, so a row-by-row retry still acknowledges it
+                    job_id = product_data.metadata.get('queue_job_id')
+                    if job_id is not None:
+                        job_ids.append(job_id)
+                    
+                    # Pages whose fingerprint matched were not parsed; only note that they were checked
+                    if product_data.metadata.get('content_unchanged'):
+                        unchanged.append((product_data.url, captured_at))
+                        continue
+                    
+                    site_id = self.id_cache.resolve_site(session, site_name)
+                    product_id = self.id_cache.resolve_product(session, product_data)
+                    product_url_id = self.id_cache.resolve_product_url(
+                        session, product_data.url, product_id, site_id)
+
+                    fingerprint = product_data.metadata.get('content_fingerprint')
+                    if fingerprint:
+                        self.fingerprints.record_changed(session, product_url_id, fingerprint, captured_at)
+                        fingerprints[product_data.url] = (product_url_id, fingerprint)
+
+                    fetch_tier = product_data.metadata.get('fetch_tier')
+                    if fetch_tier:
+                        self.fetch_tiers.record(session, product_url_id, fetch_tier, captured_at)
+                    
+                    if product_data.price is not None:
+                        rows.append({
+                            'product_url_id': product_url_id,
+                            'price': float(product_data.price),
+                            'currency': product_data.currency or 'USD',
+                            'availability': product_data.availability or 'unknown',
+                            'scraped_at': captured_at,
+                            'scraper_metadata': json.dumps({key: value for key, value in product_data.metadata.items()
+                                                            if key != 'queue_job_id'}, default=str)
+                        })
+
+                if rows:
+                    # executemany over the whole batch, returning ids for the aggregates
+                    ids = session.scalars(
+                        insert(PriceHistory).returning(PriceHistory.id, sort_by_parameter_order=True),
+                        rows
+                    ).all()
+                    for row, price_history_id in zip(rows, ids):
+                        row['id'] = price_history_id
+                    apply_price_rows(session, rows)
+                
+                if unchanged:
+                    self.fingerprints.touch_verified(session, unchanged)
+                
+                if job_ids and self.job_queue is not None:
+                    self.job_queue.ack(session, job_ids)
+        except Exception:
+            self.id_cache.rollback()
+            raise
+
+        created = self.id_cache.commit()
+        for product_data, _, _ in batch:
+            product_data.metadata.pop('queue_job_id', None)
+        for url, (product_url_id, fingerprint) in fingerprints.items():
+            self.fingerprints.remember(url, product_url_id, fingerprint)
+        self.stats['rows_written'] += len(rows)
+        self.stats['pages_unchanged'] += len(unchanged)
+        self.stats['products_created'] += created['product']
+        self.stats['urls_created'] += created['url']
+        return {'rows_written': len(rows), 'products_created': created['product'], 'urls_created': created['url']}
@@ -9,10 +9,12 @@ from contextlib import contextmanager
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+from ..cli.utils.config import config_manager
 from .models import (
-    DatabaseConfig, Product, Site, ProductURL, PriceHistory, 
+    DatabaseConfig, Product, Site, ProductURL, PriceHistory, LatestPrice,
     ScrapingSession, ScrapingError, Base
 )
+from .aggregates import apply_price_record, rebuild_price_aggregates, aggregates_need_backfill
 
 logger = logging.getLogger(__name__)
 
@@ -52,7 +54,13 @@ class DatabaseManager:
             os.makedirs("data", exist_ok=True)
             database_url = "sqlite:///data/price_monitor.db"
         
-        self.db_config = DatabaseConfig(database_url)
+        self.db_config = DatabaseConfig(
+            database_url,
+            sqlite_pragmas=config_manager.get_setting('database.sqlite_pragmas', {}),
+            pool_size=config_manager.get_setting('database.connection_pool_size'),
+            max_connections=config_manager.get_setting('database.max_connections'),
+            sqlite_begin=config_manager.get_setting('database.sqlite_begin')
+        )
         self.db_config.initialize()
         
         if create_tables:
@@ -68,6 +76,11 @@ class DatabaseManager:
         try:
             self.db_config.create_tables()
             logger.info("Database tables created successfully")
+
+            # Databases created before the aggregate tables existed need a one-time backfill
+            with self.get_session() as session:
+                if aggregates_need_backfill(session):
+                    rebuild_price_aggregates(session)
         except SQLAlchemyError as e:
             logger.error(f"Error creating tables: {e}")
             raise
@@ -263,6 +276,8 @@ class DatabaseManager:
             )
             session.add(price_record)
             session.flush()
+            apply_price_record(session, price_record)
+            session.flush()
             session.refresh(price_record)
             logger.debug(f"Added price record: {price_record}")
             session.expunge(price_record)  # Remove from session
@@ -279,10 +294,18 @@ class DatabaseManager:
     def get_latest_price(self, product_url_id: int) -> Optional[PriceHistory]:
         """Get the most recent price for a product URL."""
         with self.get_session() as session:
-            return session.query(PriceHistory)\
-                .filter(PriceHistory.product_url_id == product_url_id)\
-                .order_by(PriceHistory.scraped_at.desc())\
-                .first()
+            latest = session.get(LatestPrice, product_url_id)
+            if latest is None:
+                return None
+            price_record = session.get(PriceHistory, latest.price_history_id)
+            if price_record is not None:
+                session.expunge(price_record)  # Keep attributes loaded after commit
+            return price_record
+
+    def rebuild_price_aggregates(self) -> int:
+        """Recompute the latest-price and daily rollup aggregates from the full price history."""
+        with self.get_session() as session:
+            return rebuild_price_aggregates(session)
     
     # Scraping session operations
     def create_scraping_session(self, session_id: str, session_metadata: str = None) -> ScrapingSession:
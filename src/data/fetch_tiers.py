@@ -0,0 +1,167 @@
+"""
+Store of the fetch tier each product URL needs.
+Tiered scrapers try plain HTTP first and escalate to a browser only for pages
+whose data needs JavaScript; the outcome is kept per URL and generalised to
+URL patterns, so later runs start at the right tier. A page kept on the browser
+tier is probed with plain HTTP again once its tier is older than the recheck
+interval, so pages that stop needing JavaScript move back to the cheap tier.
+"""
+
+import re
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from .database import db_manager, DatabaseManager
+from .models import FetchTier, ProductURL
+from ..cli.utils.config import config_manager
+from ..cli.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STATIC = 'static'
+SELENIUM = 'selenium'
+
+# Path segments naming a route ('dp', 'itm', 'product'); anything else is an identifier or slug
+_ROUTE_SEGMENT = re.compile(r'^[a-z]+$')
+
+
+def url_pattern(url: str) -> str:
+    """
+    Reduce a product URL to the pattern shared by pages of the same kind.
+    Route words are kept and identifiers replaced, so
+    'https://www.amazon.com/Acme-Phone/dp/B0ACME0001?th=1' becomes 'www.amazon.com/*/dp/*'.
+    """
+    parsed = urlparse(url)
+    segments = [segment if _ROUTE_SEGMENT.match(segment) else '*'
+                for segment in parsed.path.strip('/').split('/') if segment]
+    return '/'.join([parsed.netloc.lower()] + segments)
+
+
+class FetchTierStore:
+    """
+    In-memory view of fetch_tiers keyed by URL, with tier counts per URL pattern.
+    observe() updates the view as soon as a tier is learned; rows are written by
+    the batch writer inside the transaction that stores the product.
+    """
+
+    def __init__(self, db: DatabaseManager = None, min_pattern_samples: int = None,
+                 selenium_recheck_hours: float = None):
+        """
+        Initialize the fetch tier store.
+
+        Args:
+            db: Database manager to read from (defaults to the global instance)
+            min_pattern_samples: URLs of a pattern that must be known before the
+                pattern decides the tier of unseen URLs
+            selenium_recheck_hours: Age of a Selenium tier after which the page is
+                tried with plain HTTP again
+        """
+        self.db = db or db_manager
+        self.min_pattern_samples = min_pattern_samples or config_manager.get_setting(
+            'scraping.fetch_tiers.min_pattern_samples', 3)
+        self.selenium_recheck = timedelta(hours=selenium_recheck_hours or config_manager.get_setting(
+            'scraping.fetch_tiers.selenium_recheck_hours', 168))
+        self._by_url: Optional[Dict[str, str]] = None
+        # When each URL on the Selenium tier was last found to need it
+        self._selenium_since: Dict[str, datetime] = {}
+        self._by_pattern: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def tier_for(self, url: str, now: datetime = None) -> Optional[str]:
+        """
+        Get the tier to start a page at.
+
+        Args:
+            url: Product page URL
+            now: Current time
+
+        Returns:
+            The URL's own tier, else the majority tier of its pattern once enough of
+            its URLs are known, else None (start static). A Selenium tier older than
+            the recheck interval also gives None, so the page is probed statically.
+        """
+        with self._lock:
+            tier = self._entries().get(url)
+            if tier == SELENIUM and self._due_for_recheck(url, now or datetime.utcnow()):
+                return None
+            if tier is not None:
+                return tier
+            counts = self._by_pattern.get(url_pattern(url))
+            if counts is None or sum(counts.values()) < self.min_pattern_samples:
+                return None
+            return SELENIUM if counts[SELENIUM] > counts[STATIC] else STATIC
+
+    def observe(self, url: str, tier: str, seen_at: datetime = None) -> None:
+        """Publish the tier a page was scraped at to later tier_for() calls."""
+        seen_at = seen_at or datetime.utcnow()
+        with self._lock:
+            entries = self._entries()
+            if tier == SELENIUM and (entries.get(url) != SELENIUM or self._due_for_recheck(url, seen_at)):
+                self._selenium_since[url] = seen_at
+            self._set(entries, url, tier)
+
+    def record(self, session, product_url_id: int, tier: str, seen_at: datetime) -> None:
+        """
+        Store the tier of a product URL.
+
+        Args:
+            session: Session of the transaction storing the product
+            product_url_id: ID of the product URL
+            tier: Tier that produced the product
+            seen_at: Time the page was scraped
+        """
+        row = session.get(FetchTier, product_url_id)
+        if row is None:
+            session.add(FetchTier(product_url_id=product_url_id, tier=tier, updated_at=seen_at))
+        elif row.tier != tier or (tier == SELENIUM and seen_at - row.updated_at >= self.selenium_recheck):
+            # A Selenium tier confirmed by a recheck starts a new interval
+            row.tier = tier
+            row.updated_at = seen_at
+
+    def get_stats(self) -> Dict[str, int]:
+        """Number of known URLs per tier."""
+        with self._lock:
+            return dict(Counter(self._entries().values()))
+
+    def _due_for_recheck(self, url: str, now: datetime) -> bool:
+        since = self._selenium_since.get(url)
+        return since is not None and now - since >= self.selenium_recheck
+
+    def _set(self, entries: Dict[str, str], url: str, tier: str) -> None:
+        if tier != SELENIUM:
+            self._selenium_since.pop(url, None)
+        previous = entries.get(url)
+        if previous == tier:
+            return
+        counts = self._by_pattern.setdefault(url_pattern(url), Counter())
+        if previous is not None:
+            counts[previous] -= 1
+        counts[tier] += 1
+        entries[url] = tier
+
+    def _entries(self) -> Dict[str, str]:
+        if self._by_url is None:
+            self._by_url = {}
+            try:
+                with self.db.get_session() as session:
+                    rows = session.query(ProductURL.url, FetchTier.tier, FetchTier.updated_at)\
+                        .join(FetchTier, FetchTier.product_url_id == ProductURL.id).all()
+            except (RuntimeError, SQLAlchemyError) as e:
+                # Without a database, tiers are only remembered for this run
+                logger.debug(f"Fetch tiers not loaded: {e}")
+                rows = []
+            for url, tier, updated_at in rows:
+                self._set(self._by_url, url, tier)
+                if tier == SELENIUM:
+                    self._selenium_since[url] = updated_at
+            logger.debug(f"Loaded {len(self._by_url)} fetch tiers")
+        return self._by_url
+
+
+# Shared by every tiered scraper and the batch writer in the process
+fetch_tier_store = FetchTierStore()
@@ -0,0 +1,110 @@
+"""
+Store of the last content fingerprint seen for each product URL.
+Lets scrapers recognise unchanged pages before parsing them.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .database import db_manager, DatabaseManager
+from .models import PageFingerprint, ProductURL
+from ..cli.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class FingerprintStore:
+    """
+    In-memory view of page_fingerprints keyed by URL, loaded once per store.
+    Writes happen inside the caller's transaction; call remember() once it commits.
+    """
+
+    def __init__(self, db: DatabaseManager = None):
+        """
+        Initialize the fingerprint store.
+
+        Args:
+            db: Database manager to read from (defaults to the global instance)
+        """
+        self.db = db or db_manager
+        self._by_url: Optional[Dict[str, Tuple[int, str]]] = None
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        Get the last recorded fingerprint of a page.
+
+        Args:
+            url: Product page URL
+
+        Returns:
+            The fingerprint, or None if the page has none recorded
+        """
+        entry = self._entries().get(url)
+        return entry[1] if entry else None
+
+    def record_changed(self, session, product_url_id: int, fingerprint: str, seen_at: datetime) -> None:
+        """
+        Record the fingerprint of a page whose content was parsed and stored.
+
+        Args:
+            session: Session of the transaction storing the price row
+            product_url_id: ID of the product URL
+            fingerprint: Fingerprint of the parsed page
+            seen_at: Time the page was scraped
+        """
+        row = session.get(PageFingerprint, product_url_id)
+        if row is None:
+            session.add(PageFingerprint(product_url_id=product_url_id, fingerprint=fingerprint,
+                                        last_changed_at=seen_at, last_verified_at=seen_at))
+            return
+
+        if row.fingerprint != fingerprint:
+            row.fingerprint = fingerprint
+            row.last_changed_at = seen_at
+        row.last_verified_at = max(row.last_verified_at, seen_at)
+
+    def touch_verified(self, session, verified: List[Tuple[str, datetime]]) -> int:
+        """
+        Mark unchanged pages as verified without storing a new price row.
+
+        Args:
+            session: Session to update in
+            verified: (url, seen_at) pairs of pages whose fingerprint matched
+
+        Returns:
+            int: Number of fingerprints touched
+        """
+        entries = self._entries()
+        latest_by_id: Dict[int, datetime] = {}
+        for url, seen_at in verified:
+            entry = entries.get(url)
+            if entry is None:
+                logger.warning(f"No fingerprint recorded for unchanged page {url}")
+                continue
+            latest_by_id[entry[0]] = max(seen_at, latest_by_id.get(entry[0], seen_at))
+
+        for product_url_id, seen_at in latest_by_id.items():
+            session.query(PageFingerprint)\
+                .filter(PageFingerprint.product_url_id == product_url_id)\
+                .filter(PageFingerprint.last_verified_at < seen_at)\
+                .update({PageFingerprint.last_verified_at: seen_at}, synchronize_session=False)
+
+        return len(latest_by_id)
+
+    def remember(self, url: str, product_url_id: int, fingerprint: str) -> None:
+        """Publish a committed fingerprint to later get() calls."""
+        entries = self._entries()
+        with self._lock:
+            entries[url] = (product_url_id, fingerprint)
+
+    def _entries(self) -> Dict[str, Tuple[int, str]]:
+        with self._lock:
+            if self._by_url is None:
+                with self.db.get_session() as session:
+                    rows = session.query(ProductURL.url, PageFingerprint.product_url_id, PageFingerprint.fingerprint)\
+                        .join(PageFingerprint, PageFingerprint.product_url_id == ProductURL.id).all()
+                self._by_url = {url: (product_url_id, fingerprint) for url, product_url_id, fingerprint in rows}
+                logger.debug(f"Loaded {len(self._by_url)} page fingerprints")
+            return self._by_url
@@ -0,0 +1,311 @@
+"""
+Durable job queue of a scraping session.
+Jobs are stored in queued_jobs before any page is fetched. A worker claims a
+batch by leasing it for a limited time, renews its leases while it runs, and a
+job is acknowledged in the same transaction that stores its result. An
+interrupted session therefore resumes with exactly the jobs that were never
+stored, and leases of a worker that died expire so another can take them.
+Several worker nodes may share a session's queue.
+"""
+
+import json
+import os
+import socket
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import and_, func, insert, or_, select, update
+
+from .database import db_manager, DatabaseManager
+from .models import QueuedJob, ScrapingSession
+from ..cli.utils.config import config_manager
+from ..cli.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+# Rows per INSERT when enqueueing, and upper bound of ids in one IN clause
+_CHUNK_SIZE = 500
+
+
+@dataclass
+class ClaimedJob:
+    """A job leased from the queue."""
+    id: int
+    site_name: str
+    url: str
+    priority: int
+    attempts: int
+
+
+class JobQueue:
+    """
+    Claim/lease/ack queue over the queued_jobs of one scraping session.
+    Every method runs its own transaction except ack(), which joins the
+    caller's so a job is only done once its result is committed.
+    """
+
+    def __init__(self, session_id: str, db: DatabaseManager = None, lease_seconds: int = None,
+                 owner: str = None):
+        """
+        Initialize the queue of an existing session.
+
+        Args:
+            session_id: UUID of the scraping session
+            db: Database manager to use (defaults to the global instance)
+            lease_seconds: How long a claimed job stays reserved without a heartbeat
+            owner: Name of this worker on leases (defaults to host, pid and a random suffix)
+
+        Raises:
+            ValueError: If the session does not exist
+        """
+        self.db = db or db_manager
+        self.session_id = session_id
+        self.lease_seconds = lease_seconds or config_manager.get_setting('scraping.job_queue.lease_seconds', 300)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        with self.db.get_session() as session:
+            row = session.query(ScrapingSession.id)\
+                .filter(ScrapingSession.session_id == session_id).first()
+            if row is None:
+                raise ValueError(f"Scraping session not found: {session_id}")
+            self._session_pk = row.id
+
+    @classmethod
+    def create(cls, session_metadata: Dict[str, Any] = None, db: DatabaseManager = None, **kwargs) -> 'JobQueue':
+        """
+        Start a new session with an empty queue.
+
+        Args:
+            session_metadata: Run configuration stored on the session (sites, limit, workers)
+            db: Database manager to use (defaults to the global instance)
+        """
+        db = db or db_manager
+        session_id = str(uuid.uuid4())
+        with db.get_session() as session:
+            session.add(ScrapingSession(session_id=session_id, status='running',
+                                        session_metadata=json.dumps(session_metadata or {})))
+        logger.info(f"Created scraping session {session_id}")
+        return cls(session_id, db=db, **kwargs)
+
+    @classmethod
+    def resume(cls, session_id: str, db: DatabaseManager = None, **kwargs) -> 'JobQueue':
+        """
+        Reopen an interrupted session.
+        Leases still held in it are released: resuming asserts that the run
+        holding them has stopped.
+
+        Raises:
+            ValueError: If the session does not exist
+        """
+        queue = cls(session_id, db=db, **kwargs)
+        with queue.db.get_session() as session:
+            released = session.query(QueuedJob)\
+                .filter(QueuedJob.session_id == queue._session_pk, QueuedJob.status == LEASED)\
+                .update({QueuedJob.status: PENDING, QueuedJob.lease_owner: None,
+                         QueuedJob.lease_expires_at: None}, synchronize_session=False)
+            session.query(ScrapingSession).filter(ScrapingSession.id == queue._session_pk)\
+                .update({ScrapingSession.status: 'running', ScrapingSession.completed_at: None},
+                        synchronize_session=False)
+        logger.info(f"Resuming scraping session {session_id} ({released} leases released)")
+        return queue
+
+    def enqueue(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add jobs to the session.
+
+        Args:
+            jobs: Dictionaries with 'site_name', 'url' and optional 'priority'
+
+        Returns:
+            int: Number of jobs added
+        """
+        rows = [{
+            'session_id': self._session_pk,
+            'site_name': job['site_name'],
+            'url': job['url'],
+            'priority': job.get('priority', 1),
+            'status': PENDING,
+            'attempts': 0,
+            'created_at': datetime.utcnow()
+        } for job in jobs]
+
+        with self.db.get_session() as session:
+            for start in range(0, len(rows), _CHUNK_SIZE):
+                session.execute(insert(QueuedJob), rows[start:start + _CHUNK_SIZE])
+        return len(rows)
+
+    @classmethod
+    def open_sessions(cls, db: DatabaseManager = None, now: datetime = None) -> List[str]:
+        """
+        Sessions with claimable jobs, oldest first.
+
+        Args:
+            db: Database manager to use (defaults to the global instance)
+            now: Time leases are checked against
+        """
+        db = db or db_manager
+        now = now or datetime.utcnow()
+        with db.get_session() as session:
+            rows = session.query(ScrapingSession.session_id)\
+                .filter(ScrapingSession.status != 'completed',
+                        ScrapingSession.queued_jobs.any(cls._claimable(now)))\
+                .order_by(ScrapingSession.started_at, ScrapingSession.id).all()
+        return [row.session_id for row in rows]
+
+    def claim(self, limit: int = _CHUNK_SIZE, now: datetime = None) -> List[ClaimedJob]:
+        """
+        Lease up to `limit` pending jobs (or jobs whose lease expired), most urgent first.
+        The lease is taken in one UPDATE whose subquery skips rows locked by
+        other workers (FOR UPDATE SKIP LOCKED on PostgreSQL; SQLite serializes
+        writers instead), and rows are re-checked as claimable when updated, so
+        concurrent claimers never receive the same job.
+
+        Returns:
+            The claimed jobs, empty when nothing is claimable
+        """
+        now = now or datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        limit = min(limit, _CHUNK_SIZE)
+
+        with self.db.get_session() as session:
+            candidates = select(QueuedJob.id)\
+                .where(QueuedJob.session_id == self._session_pk, self._claimable(now))\
+                .order_by(QueuedJob.priority, QueuedJob.id)\
+                .limit(limit)\
+                .with_for_update(skip_locked=True)
+            claimed = session.execute(
+                update(QueuedJob)
+                .where(QueuedJob.id.in_(candidates.scalar_subquery()), self._claimable(now))
+                .values(status=LEASED, lease_owner=self.owner, lease_expires_at=expires_at,
+                        attempts=QueuedJob.attempts + 1)
+                .returning(QueuedJob.id, QueuedJob.site_name, QueuedJob.url, QueuedJob.priority,
+                           QueuedJob.attempts)
+            ).all()
+            if claimed:
+                # A session another worker left interrupted is running again
+                session.query(ScrapingSession)\
+                    .filter(ScrapingSession.id == self._session_pk, ScrapingSession.status != 'running')\
+                    .update({ScrapingSession.status: 'running'}, synchronize_session=False)
+        return sorted((ClaimedJob(*row) for row in claimed), key=lambda job: (job.priority, job.id))
+
+    def heartbeat(self, now: datetime = None) -> int:
+        """
+        Extend every lease this worker holds.
+
+        Returns:
+            int: Number of leases renewed
+        """
+        now = now or datetime.utcnow()
+        with self.db.get_session() as session:
+            return session.query(QueuedJob)\
+                .filter(QueuedJob.lease_owner == self.owner, QueuedJob.status == LEASED)\
+                .update({QueuedJob.lease_expires_at: now + timedelta(seconds=self.lease_seconds)},
+                        synchronize_session=False)
+
+    def release(self) -> int:
+        """
+        Return every job this worker still holds to the queue, for a worker that stops early.
+
+        Returns:
+            int: Number of jobs released
+        """
+        with self.db.get_session() as session:
+            return session.query(QueuedJob)\
+                .filter(QueuedJob.lease_owner == self.owner, QueuedJob.status == LEASED)\
+                .update({QueuedJob.status: PENDING, QueuedJob.lease_owner: None,
+                         QueuedJob.lease_expires_at: None}, synchronize_session=False)
+
+    def ack(self, session, job_ids: List[int], now: datetime = None) -> None:
+        """
+        Mark jobs done inside the transaction that stores their results.
+
+        Args:
+            session: Session of the transaction storing the results
+            job_ids: IDs of the jobs whose results it stores
+            now: Completion time
+        """
+        now = now or datetime.utcnow()
+        for start in range(0, len(job_ids), _CHUNK_SIZE):
+            session.query(QueuedJob)\
+                .filter(QueuedJob.id.in_(job_ids[start:start + _CHUNK_SIZE]))\
+                .update({QueuedJob.status: DONE, QueuedJob.finished_at: now,
+                         QueuedJob.lease_owner: None, QueuedJob.lease_expires_at: None},
+                        synchronize_session=False)
+
+    def fail(self, job_id: int, error: str, now: datetime = None) -> None:
+        """Mark a job as failed for good."""
+        with self.db.get_session() as session:
+            session.query(QueuedJob).filter(QueuedJob.id == job_id)\
+                .update({QueuedJob.status: FAILED, QueuedJob.last_error: error,
+                         QueuedJob.finished_at: now or datetime.utcnow(),
+                         QueuedJob.lease_owner: None, QueuedJob.lease_expires_at: None},
+                        synchronize_session=False)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs in each status."""
+        with self.db.get_session() as session:
+            rows = session.query(QueuedJob.status, func.count(QueuedJob.id))\
+                .filter(QueuedJob.session_id == self._session_pk)\
+                .group_by(QueuedJob.status).all()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def checkpoint(self, stats: Dict[str, Any] = None) -> Dict[str, int]:
+        """
+        Store the session's progress on its scraping_sessions row.
+
+        Args:
+            stats: Extra run statistics kept under 'checkpoint' in the session metadata
+
+        Returns:
+            The job counts by status
+        """
+        counts = self.counts()
+        with self.db.get_session() as session:
+            row = session.get(ScrapingSession, self._session_pk)
+            metadata = json.loads(row.session_metadata or '{}')
+            metadata['checkpoint'] = dict(stats or {}, jobs=counts, owner=self.owner,
+                                          at=datetime.utcnow().isoformat())
+            row.products_scraped = counts[DONE]
+            row.errors_count = counts[FAILED]
+            row.session_metadata = json.dumps(metadata, default=str)
+        return counts
+
+    def finish(self, stats: Dict[str, Any] = None) -> str:
+        """
+        Write a final checkpoint and close the session, or this worker's part of it.
+
+        Returns:
+            'completed' if every job is done or failed, 'running' while other
+            workers hold live leases, else 'interrupted'
+        """
+        counts = self.checkpoint(stats)
+        if not counts[PENDING] and not counts[LEASED]:
+            status = 'completed'
+        else:
+            now = datetime.utcnow()
+            with self.db.get_session() as session:
+                others = session.query(func.count(QueuedJob.id))\
+                    .filter(QueuedJob.session_id == self._session_pk, QueuedJob.status == LEASED,
+                            QueuedJob.lease_owner != self.owner, QueuedJob.lease_expires_at >= now).scalar()
+            status = 'running' if others else 'interrupted'
+        with self.db.get_session() as session:
+            row = session.get(ScrapingSession, self._session_pk)
+            row.status = status
+            if status == 'completed':
+                row.completed_at = datetime.utcnow()
+        logger.info(f"Scraping session {self.session_id} {status}: {counts}")
+        return status
+
+    @staticmethod
+    def _claimable(now: datetime):
+        return or_(QueuedJob.status == PENDING,
+                   and_(QueuedJob.status == LEASED, QueuedJob.lease_expires_at < now))
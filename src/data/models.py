@@ -3,14 +3,16 @@ Database models for the E-Commerce Price Monitoring System.
 Implements the SQLAlchemy ORM models for products, sites, URLs, price history, and scraping sessions.
 """
 
+import re
 from datetime import datetime
+from typing import Dict, Any, Optional
 from sqlalchemy import (
-    Column, Integer, String, Text, DECIMAL, Boolean, DateTime, 
+    Column, Integer, String, Text, DECIMAL, Boolean, Date, DateTime, Float,
     ForeignKey, UniqueConstraint, Index
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 
 Base = declarative_base()
 
@@ -87,6 +89,10 @@ class ProductURL(Base):
     site = relationship("Site", back_populates="product_urls")
     price_history = relationship("PriceHistory", back_populates="product_url", cascade="all, delete-orphan")
     scraping_errors = relationship("ScrapingError", back_populates="product_url", cascade="all, delete-orphan")
+    latest_price = relationship("LatestPrice", back_populates="product_url", uselist=False, cascade="all, delete-orphan")
+    daily_rollups = relationship("DailyPriceRollup", back_populates="product_url", cascade="all, delete-orphan")
+    page_fingerprint = relationship("PageFingerprint", back_populates="product_url", uselist=False, cascade="all, delete-orphan")
+    fetch_tier = relationship("FetchTier", back_populates="product_url", uselist=False, cascade="all, delete-orphan")
     
     # Indexes and constraints
     __table_args__ = (
@@ -129,6 +135,100 @@ class PriceHistory(Base):
         return f"<PriceHistory(id={self.id}, price={self.price}, scraped_at={self.scraped_at})>"
 
 
+class LatestPrice(Base):
+    """
+    Latest price per product URL, maintained on every price insert.
+    Also keeps a running sum and count of prices so averages need no history scan.
+    """
+    __tablename__ = 'latest_prices'
+    
+    product_url_id = Column(Integer, ForeignKey('product_urls.id'), primary_key=True)
+    price_history_id = Column(Integer, ForeignKey('price_history.id'), nullable=False)
+    price = Column(DECIMAL(10, 2), nullable=True)
+    currency = Column(String(3), default='USD')
+    availability = Column(String(50), nullable=True)
+    scraped_at = Column(DateTime, nullable=False)
+    price_sum = Column(DECIMAL(16, 2), nullable=False, default=0)  # Sum of non-null prices
+    price_count = Column(Integer, nullable=False, default=0)  # Number of non-null prices
+    
+    # Relationships
+    product_url = relationship("ProductURL", back_populates="latest_price")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_latest_price_scraped_at', 'scraped_at'),
+    )
+    
+    def __repr__(self):
+        return f"<LatestPrice(product_url_id={self.product_url_id}, price={self.price}, scraped_at={self.scraped_at})>"
+
+
+class DailyPriceRollup(Base):
+    """
+    Daily price summary per product URL, maintained on every price insert.
+    Lets trend analysis scan one row per day instead of every scrape.
+    """
+    __tablename__ = 'daily_price_rollups'
+    
+    product_url_id = Column(Integer, ForeignKey('product_urls.id'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    min_price = Column(DECIMAL(10, 2), nullable=False)
+    max_price = Column(DECIMAL(10, 2), nullable=False)
+    price_sum = Column(DECIMAL(16, 2), nullable=False)
+    price_count = Column(Integer, nullable=False)
+    last_price = Column(DECIMAL(10, 2), nullable=False)
+    last_scraped_at = Column(DateTime, nullable=False)
+    last_price_history_id = Column(Integer, nullable=False)
+    
+    # Relationships
+    product_url = relationship("ProductURL", back_populates="daily_rollups")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_daily_rollup_day', 'day'),
+    )
+    
+    def __repr__(self):
+        return f"<DailyPriceRollup(product_url_id={self.product_url_id}, day={self.day}, count={self.price_count})>"
+
+
+class PageFingerprint(Base):
+    """
+    Last seen content fingerprint per product URL.
+    Unchanged pages only refresh last_verified_at instead of adding price history.
+    """
+    __tablename__ = 'page_fingerprints'
+    
+    product_url_id = Column(Integer, ForeignKey('product_urls.id'), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    last_changed_at = Column(DateTime, nullable=False)
+    last_verified_at = Column(DateTime, nullable=False)
+    
+    # Relationships
+    product_url = relationship("ProductURL", back_populates="page_fingerprint")
+    
+    def __repr__(self):
+        return f"<PageFingerprint(product_url_id={self.product_url_id}, fingerprint='{self.fingerprint[:12]}')>"
+
+
+class FetchTier(Base):
+    """
+    Fetch tier (static or selenium) that last produced complete data for a product URL.
+    Tiered scrapers go straight to this tier on later runs.
+    """
+    __tablename__ = 'fetch_tiers'
+    
+    product_url_id = Column(Integer, ForeignKey('product_urls.id'), primary_key=True)
+    tier = Column(String(20), nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    
+    # Relationships
+    product_url = relationship("ProductURL", back_populates="fetch_tier")
+    
+    def __repr__(self):
+        return f"<FetchTier(product_url_id={self.product_url_id}, tier='{self.tier}')>"
+
+
 class ScrapingSession(Base):
     """
     Scraping job tracking and monitoring table.
@@ -147,6 +247,7 @@ class ScrapingSession(Base):
     
     # Relationships
     scraping_errors = relationship("ScrapingError", back_populates="session", cascade="all, delete-orphan")
+    queued_jobs = relationship("QueuedJob", back_populates="session", cascade="all, delete-orphan")
     
     # Indexes
     __table_args__ = (
@@ -190,25 +291,153 @@ class ScrapingError(Base):
         return f"<ScrapingError(id={self.id}, error_type='{self.error_type}', resolved={self.resolved})>"
 
 
+class QueuedJob(Base):
+    """
+    Durable scraping job of a session.
+    Workers lease jobs for a limited time and acknowledge them once their result
+    is stored, so an interrupted session can be resumed with only the unfinished jobs.
+    """
+    __tablename__ = 'queued_jobs'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(Integer, ForeignKey('scraping_sessions.id'), nullable=False)
+    site_name = Column(String(100), nullable=False)
+    url = Column(Text, nullable=False)
+    priority = Column(Integer, nullable=False, default=1)
+    status = Column(String(20), nullable=False, default='pending')  # pending, leased, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    
+    # Relationships
+    session = relationship("ScrapingSession", back_populates="queued_jobs")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_queued_job_claim', 'session_id', 'status', 'priority', 'id'),
+        Index('idx_queued_job_lease_owner', 'lease_owner'),
+    )
+    
+    def __repr__(self):
+        return f"<QueuedJob(id={self.id}, status='{self.status}', url='{self.url[:50]}')>"
+
+
+class SiteRateBudget(Base):
+    """
+    Request timeline of a site shared by every worker node.
+    Each request reserves the next slot and moves next_slot_at on by the site's
+    interval, so all nodes together stay within one site's rate.
+    """
+    __tablename__ = 'site_rate_budgets'
+    
+    site_name = Column(String(100), primary_key=True)
+    next_slot_at = Column(Float, nullable=False)  # Unix time the next request may start
+    updated_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<SiteRateBudget(site_name='{self.site_name}', next_slot_at={self.next_slot_at})>"
+
+
 # Database configuration and utility functions
+# SQLite performance profile applied to every connection unless overridden
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',      # readers don't block the writer
+    'synchronous': 'NORMAL',    # fsync at checkpoints only; safe with WAL
+    'mmap_size': 268435456,     # 256 MB memory-mapped reads
+    'cache_size': -65536,       # 64 MB page cache (negative = KiB)
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,       # ms to wait on a locked database
+}
+
+_PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+_PRAGMA_VALUE = re.compile(r'^-?[A-Za-z0-9_]+$')
+
+
 class DatabaseConfig:
     """Database configuration and session management."""
     
-    def __init__(self, database_url: str = "sqlite:///data/price_monitor.db"):
+    def __init__(self, database_url: str = "sqlite:///data/price_monitor.db",
+                 sqlite_pragmas: Optional[Dict[str, Any]] = None,
+                 pool_size: Optional[int] = None, max_connections: Optional[int] = None,
+                 sqlite_begin: Optional[str] = None):
+        """
+        Args:
+            database_url: SQLAlchemy database URL
+            sqlite_pragmas: PRAGMA overrides for SQLite connections (None disables a default)
+            pool_size: Persistent connections kept by the pool (server databases)
+            max_connections: Upper bound on pooled plus overflow connections (server databases)
+            sqlite_begin: SQLite transaction mode, DEFERRED (default) or IMMEDIATE. IMMEDIATE
+                takes the write lock when a transaction starts, so transactions that read
+                before writing wait for other processes instead of failing with
+                'database is locked'
+        """
         self.database_url = database_url
+        self.sqlite_pragmas = dict(DEFAULT_SQLITE_PRAGMAS)
+        self.sqlite_pragmas.update(sqlite_pragmas or {})
+        self.sqlite_begin = (sqlite_begin or 'DEFERRED').upper()
+        if self.sqlite_begin not in ('DEFERRED', 'IMMEDIATE'):
+            raise ValueError(f"Invalid SQLite transaction mode: {sqlite_begin}")
+        self.pool_size = pool_size
+        self.max_connections = max_connections
         self.engine = None
         self.SessionLocal = None
     
+    @property
+    def is_sqlite(self) -> bool:
+        return self.database_url.startswith("sqlite")
+    
     def initialize(self):
         """Initialize database engine and session factory."""
-        self.engine = create_engine(
-            self.database_url,
-            echo=False,  # Set to True for SQL query logging
-            pool_pre_ping=True,
-            connect_args={"check_same_thread": False} if "sqlite" in self.database_url else {}
-        )
+        engine_options = {
+            'echo': False,  # Set to True for SQL query logging
+            'pool_pre_ping': True,
+        }
+        
+        if self.is_sqlite:
+            busy_timeout_ms = self.sqlite_pragmas.get('busy_timeout') or 5000
+            engine_options['connect_args'] = {
+                'check_same_thread': False,
+                'timeout': int(busy_timeout_ms) / 1000.0
+            }
+        else:
+            if self.pool_size:
+                engine_options['pool_size'] = self.pool_size
+                if self.max_connections:
+                    engine_options['max_overflow'] = max(self.max_connections - self.pool_size, 0)
+        
+        self.engine = create_engine(self.database_url, **engine_options)
+        
+        if self.is_sqlite:
+            event.listen(self.engine, "connect", self._apply_sqlite_pragmas)
+            if self.sqlite_begin == 'IMMEDIATE':
+                event.listen(self.engine, "begin", self._begin_immediate)
+        
         self.SessionLocal = sessionmaker(bind=self.engine)
     
+    def _apply_sqlite_pragmas(self, dbapi_connection, connection_record):
+        """Apply the SQLite performance profile to a new DBAPI connection."""
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in self.sqlite_pragmas.items():
+                if value is None:
+                    continue
+                value = str(value)
+                if not _PRAGMA_NAME.match(name) or not _PRAGMA_VALUE.match(value):
+                    raise ValueError(f"Invalid SQLite pragma: {name}={value}")
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+        if self.sqlite_begin == 'IMMEDIATE':
+            # Let SQLAlchemy's begin event issue BEGIN instead of the driver
+            dbapi_connection.isolation_level = None
+    
+    @staticmethod
+    def _begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+    
     def create_tables(self):
         """Create all database tables."""
         if self.engine is None:
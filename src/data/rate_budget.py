@@ -0,0 +1,113 @@
+"""
+Per-site request budgets shared by worker nodes through the database.
+The in-process rate limiter keeps each node within a site's rate; when several
+`scrape worker` nodes scrape the same site, their requests are additionally
+spaced on one timeline per site stored in site_rate_budgets. A reservation is a
+single UPDATE ... RETURNING, so concurrent nodes never get the same slot, and a
+throttled node pushes the timeline back for every node.
+"""
+
+import time
+from datetime import datetime
+
+from sqlalchemy import case, update
+from sqlalchemy.exc import IntegrityError
+
+from .database import db_manager, DatabaseManager
+from .models import SiteRateBudget
+from ..cli.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RateBudgetStore:
+    """
+    Site request timelines in the database.
+    Slots follow a generic cell rate algorithm: a site may run `burst` requests
+    ahead of its timeline after an idle period, then one per interval.
+    """
+
+    def __init__(self, db: DatabaseManager = None):
+        """
+        Initialize the budget store.
+
+        Args:
+            db: Database manager to use (defaults to the global instance)
+        """
+        self.db = db or db_manager
+        self._known_sites = set()
+
+    def reserve(self, site_name: str, interval: float, burst: int = 1, now: float = None) -> float:
+        """
+        Reserve the next request slot of a site.
+
+        Args:
+            site_name: Name of the site
+            interval: Seconds the request takes from the site's budget
+            burst: Requests that may start back to back after an idle period
+            now: Current Unix time
+
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        now = time.time() if now is None else now
+        floor = now - (max(1, burst) - 1) * interval
+        self._ensure(site_name)
+        with self.db.get_session() as session:
+            slot_end = session.execute(
+                update(SiteRateBudget)
+                .where(SiteRateBudget.site_name == site_name)
+                .values(next_slot_at=case((SiteRateBudget.next_slot_at > floor, SiteRateBudget.next_slot_at),
+                                          else_=floor) + interval,
+                        updated_at=datetime.utcnow())
+                .returning(SiteRateBudget.next_slot_at)
+            ).scalar_one()
+        return max(0.0, slot_end - interval - now)
+
+    def pause(self, site_name: str, until: float) -> None:
+        """Keep every node from starting requests to a site before a Unix time."""
+        self._ensure(site_name)
+        with self.db.get_session() as session:
+            session.execute(
+                update(SiteRateBudget)
+                .where(SiteRateBudget.site_name == site_name)
+                .values(next_slot_at=case((SiteRateBudget.next_slot_at > until, SiteRateBudget.next_slot_at),
+                                          else_=until),
+                        updated_at=datetime.utcnow())
+            )
+
+    def wait_time(self, site_name: str, interval: float, burst: int = 1, ahead: int = 0,
+                  now: float = None) -> float:
+        """
+        Seconds until a request to a site could start, without reserving a slot.
+
+        Args:
+            site_name: Name of the site
+            interval: Seconds each request takes from the site's budget
+            burst: Requests that may start back to back after an idle period
+            ahead: Requests already on their way to reserve() that go first
+            now: Current Unix time
+        """
+        now = time.time() if now is None else now
+        with self.db.get_session() as session:
+            next_slot_at = session.query(SiteRateBudget.next_slot_at)\
+                .filter(SiteRateBudget.site_name == site_name).scalar() or 0.0
+        slot = max(next_slot_at, now - (max(1, burst) - 1) * interval) + ahead * interval
+        return max(0.0, slot - now)
+
+    def _ensure(self, site_name: str) -> None:
+        """Create a site's row, idle since the epoch, on first use; another node may create it first."""
+        if site_name in self._known_sites:
+            return
+        try:
+            with self.db.get_session() as session:
+                if session.get(SiteRateBudget, site_name) is None:
+                    session.add(SiteRateBudget(site_name=site_name, next_slot_at=0.0,
+                                               updated_at=datetime.utcnow()))
+        except IntegrityError:
+            pass
+        self._known_sites.add(site_name)
+
+
+# Used by the rate limiter of worker nodes
+rate_budget_store = RateBudgetStore()
@@ -0,0 +1,209 @@
+"""
+Freshness- and volatility-driven refresh schedule of product URLs.
+Each URL's price changes are treated as a Poisson process whose rate is
+estimated from its price history. A URL is due once the chance that its
+stored price has gone stale reaches the staleness target. No URL waits
+longer than the freshness SLA, and no site is asked for more refreshes
+than its rate limit can serve. Volatile products are therefore refreshed
+often and static ones rarely, and a fixed request budget goes where
+prices move.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, case, func, or_, select
+
+from .database import db_manager, DatabaseManager
+from .models import LatestPrice, PageFingerprint, PriceHistory, ProductURL, Site
+from ..cli.utils.config import config_manager
+from ..cli.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class RefreshEntry:
+    """Refresh schedule of one product URL."""
+    product_url_id: int
+    site_name: str
+    url: str
+    last_scraped_at: Optional[datetime]  # None if never scraped
+    changes_per_day: float
+    refresh_interval: timedelta
+    next_due_at: datetime
+
+    def overdue_ratio(self, now: datetime) -> float:
+        """Refresh intervals elapsed since the URL became due (negative before that)."""
+        if self.last_scraped_at is None:
+            return math.inf
+        return (now - self.next_due_at) / self.refresh_interval
+
+
+class RefreshScheduler:
+    """
+    Computes refresh intervals and due times from price_history.
+    Settings live under 'monitoring.refresh'.
+    """
+
+    def __init__(self, db: DatabaseManager = None, freshness_sla_hours: float = None,
+                 min_interval_hours: float = None, staleness_target: float = None,
+                 lookback_days: int = None, site_budget_share: float = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            db: Database manager to read from (defaults to the global instance)
+            freshness_sla_hours: Longest any URL may go without a refresh
+            min_interval_hours: Shortest refresh interval, however volatile the price
+            staleness_target: Chance of a changed price at which a URL becomes due
+            lookback_days: Price history used to estimate change rates
+            site_budget_share: Part of a site's rate limit refreshes may use
+        """
+        self.db = db or db_manager
+        self.freshness_sla = timedelta(hours=freshness_sla_hours or config_manager.get_setting(
+            'monitoring.refresh.freshness_sla_hours', 24))
+        self.min_interval = timedelta(hours=min_interval_hours or config_manager.get_setting(
+            'monitoring.refresh.min_interval_hours', 1))
+        self.staleness_target = staleness_target or config_manager.get_setting(
+            'monitoring.refresh.staleness_target', 0.1)
+        self.lookback = timedelta(days=lookback_days or config_manager.get_setting(
+            'monitoring.refresh.lookback_days', 30))
+        self.site_budget_share = site_budget_share or config_manager.get_setting(
+            'monitoring.refresh.site_budget_share', 0.8)
+
+    def plan(self, sites: Iterable[str] = None, now: datetime = None) -> List[RefreshEntry]:
+        """
+        Schedule every active product URL.
+
+        Args:
+            sites: Only schedule URLs of these sites (case-insensitive)
+            now: Time the history window ends at
+
+        Returns:
+            Entries in no particular order
+        """
+        now = now or datetime.utcnow()
+        rows = self._load(sites, now)
+
+        entries = []
+        for row in rows:
+            last_scraped_at = max((at for at in (row.last_row_at, row.latest_at, row.verified_at)
+                                   if at is not None), default=None)
+            rate = self._change_rate(row.changes or 0, row.first_at, last_scraped_at)
+            entries.append(RefreshEntry(
+                product_url_id=row.id,
+                site_name=row.site_name.lower(),
+                url=row.url,
+                last_scraped_at=last_scraped_at,
+                changes_per_day=rate * 86400,
+                refresh_interval=self._interval(rate),
+                next_due_at=now
+            ))
+
+        for site_name, site_entries in self._by_site(entries).items():
+            self._fit_site_budget(site_name, site_entries)
+        for entry in entries:
+            if entry.last_scraped_at is not None:
+                entry.next_due_at = entry.last_scraped_at + entry.refresh_interval
+        return entries
+
+    def due(self, sites: Iterable[str] = None, limit: int = None, now: datetime = None) -> List[RefreshEntry]:
+        """
+        URLs due for a refresh, most overdue first.
+        Never-scraped URLs come first, then URLs by refresh intervals elapsed
+        since they became due, so a volatile price an hour late outranks a
+        static one an hour late.
+
+        Args:
+            sites: Only consider URLs of these sites (case-insensitive)
+            limit: Maximum URLs to return
+            now: Current time
+        """
+        now = now or datetime.utcnow()
+        entries = [entry for entry in self.plan(sites, now) if entry.next_due_at <= now]
+        entries.sort(key=lambda entry: entry.overdue_ratio(now), reverse=True)
+        return entries[:limit] if limit else entries
+
+    def _load(self, sites: Optional[Iterable[str]], now: datetime):
+        """Change counts in the lookback window and last scrape times of every active URL."""
+        window = PriceHistory.scraped_at >= now - self.lookback
+        order = (PriceHistory.scraped_at, PriceHistory.id)
+        lagged = select(
+            PriceHistory.product_url_id,
+            PriceHistory.scraped_at,
+            PriceHistory.price,
+            PriceHistory.availability,
+            func.lag(PriceHistory.id).over(partition_by=PriceHistory.product_url_id, order_by=order).label('prev_id'),
+            func.lag(PriceHistory.price).over(partition_by=PriceHistory.product_url_id, order_by=order).label('prev_price'),
+            func.lag(PriceHistory.availability).over(partition_by=PriceHistory.product_url_id,
+                                                     order_by=order).label('prev_availability')
+        ).where(window).subquery()
+
+        changed = and_(lagged.c.prev_id.isnot(None),
+                       or_(lagged.c.price.is_distinct_from(lagged.c.prev_price),
+                           lagged.c.availability.is_distinct_from(lagged.c.prev_availability)))
+        history = select(
+            lagged.c.product_url_id,
+            func.sum(case((changed, 1), else_=0)).label('changes'),
+            func.min(lagged.c.scraped_at).label('first_at'),
+            func.max(lagged.c.scraped_at).label('last_row_at')
+        ).group_by(lagged.c.product_url_id).subquery()
+
+        query = select(
+            ProductURL.id, ProductURL.url, Site.name.label('site_name'),
+            history.c.changes, history.c.first_at, history.c.last_row_at,
+            LatestPrice.scraped_at.label('latest_at'),
+            PageFingerprint.last_verified_at.label('verified_at')
+        ).join(Site, ProductURL.site_id == Site.id)\
+            .outerjoin(history, history.c.product_url_id == ProductURL.id)\
+            .outerjoin(LatestPrice, LatestPrice.product_url_id == ProductURL.id)\
+            .outerjoin(PageFingerprint, PageFingerprint.product_url_id == ProductURL.id)\
+            .where(ProductURL.is_active == True)
+        if sites:
+            query = query.where(func.lower(Site.name).in_([site.lower() for site in sites]))
+
+        with self.db.get_session() as session:
+            return session.execute(query).all()
+
+    def _change_rate(self, changes: int, first_at: Optional[datetime],
+                     last_at: Optional[datetime]) -> float:
+        """
+        Price changes per second. One change per freshness SLA is added as a
+        prior, so a URL with little history is not taken for static too early.
+        """
+        observed = (last_at - first_at).total_seconds() if first_at and last_at else 0.0
+        return (changes + 1) / (observed + self.freshness_sla.total_seconds())
+
+    def _interval(self, rate: float) -> timedelta:
+        """Time until the chance of a change reaches the staleness target, within the SLA."""
+        seconds = -math.log(1 - self.staleness_target) / rate
+        return min(self.freshness_sla, max(self.min_interval, timedelta(seconds=seconds)))
+
+    def _fit_site_budget(self, site_name: str, entries: List[RefreshEntry]) -> None:
+        """Stretch a site's intervals so its refreshes fit in its share of the site's rate limit."""
+        try:
+            rate_limit = config_manager.get_scraper_config(site_name).get('rate_limit', 2.0)
+        except ValueError:
+            rate_limit = config_manager.get_setting('scraping.default_delay', 2.0)
+        if not rate_limit or rate_limit <= 0:
+            return
+
+        # Share of the site's request capacity taken by refreshing every URL on time
+        utilization = sum(rate_limit / entry.refresh_interval.total_seconds() for entry in entries)
+        stretch = utilization / self.site_budget_share
+        if stretch <= 1:
+            return
+        logger.warning(f"{site_name}: {len(entries)} URLs need {stretch:.1f}x the site's refresh budget; "
+                       f"stretching refresh intervals past the freshness SLA")
+        for entry in entries:
+            entry.refresh_interval *= stretch
+
+    @staticmethod
+    def _by_site(entries: List[RefreshEntry]) -> Dict[str, List[RefreshEntry]]:
+        by_site: Dict[str, List[RefreshEntry]] = {}
+        for entry in entries:
+            by_site.setdefault(entry.site_name, []).append(entry)
+        return by_site
@@ -3,7 +3,7 @@ This package contains the scrapers for the E-Commerce Price Monitoring System.
 """
 
 from .base_scraper import AbstractScraper
-from .static_scraper import AmazonScraper, EbayScraper, ShopGeScraper
+from .static_scraper import AmazonScraper, EbayScraper, ShopGeScraper, ConfiguredScraper
 from .factory import (
     ScraperFactory,
     create_amazon_scraper,
@@ -19,6 +19,7 @@ __all__ = [
     'AmazonScraper',
     'EbayScraper',
     'ShopGeScraper',
+    'ConfiguredScraper',
     'create_amazon_scraper',
     'create_ebay_scraper',
     'create_all_scrapers',
@@ -0,0 +1,245 @@
+"""
+Product data read from the JSON APIs that JS-rendered pages call.
+A site's 'api_capture' section in scrapers.yaml lists URL patterns of the API
+responses carrying the product and how their JSON maps to ProductData. The
+Selenium scrapers pick matching responses out of the browser's performance log
+instead of waiting for the page to render, and remember each product's
+endpoint so later runs can call it over plain HTTP without a browser.
+"""
+
+import base64
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple
+
+from ..cli.utils.config import config_manager
+from ..cli.utils.logger import get_logger
+from .data_models import ProductData
+from .structured_data import parse_availability, parse_number
+
+logger = get_logger(__name__)
+
+# Fields an API payload must provide to stand in for the rendered page
+REQUIRED_FIELDS = ('title', 'price')
+
+_MISSING = object()
+
+
+def _resolve(payload: Any, path: str) -> Any:
+    """Follow a dot path such as 'data.offers.0.price' through dicts and lists."""
+    value = payload
+    for key in path.split('.'):
+        if isinstance(value, dict):
+            value = value.get(key, _MISSING)
+        elif isinstance(value, list) and key.lstrip('-').isdigit() and -len(value) <= int(key) < len(value):
+            value = value[int(key)]
+        else:
+            return None
+        if value is _MISSING:
+            return None
+    return value
+
+
+def _field_value(field: str, value: Any) -> Any:
+    """Convert a raw JSON value to the type of a ProductData field."""
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    if field in ('price', 'rating'):
+        return parse_number(value)
+    if field == 'reviews_count':
+        return parse_number(value, int)
+    if field == 'availability':
+        if isinstance(value, bool):
+            return 'in_stock' if value else 'out_of_stock'
+        return parse_availability(value)
+    value = str(value).strip()
+    return value or None
+
+
+class ApiCapture:
+    """
+    Compiled 'api_capture' configuration for one site.
+    Field paths are dot-separated keys and list indexes into the JSON payload;
+    field names are ProductData attributes, or 'metadata.<key>' for metadata entries.
+    """
+
+    def __init__(self, url_patterns: List[Pattern], fields: Dict[str, str]):
+        self.url_patterns = url_patterns
+        self.fields = fields
+
+    @classmethod
+    def from_config(cls, site_config: Dict[str, Any]) -> Optional['ApiCapture']:
+        """
+        Compile the capture settings of a site, or return None if it has none.
+
+        Raises:
+            ValueError: If patterns or required field paths are missing, or a regex is invalid
+        """
+        spec = site_config.get('api_capture')
+        if not spec:
+            return None
+
+        patterns = spec.get('url_patterns', [])
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        if not patterns:
+            raise ValueError("api_capture needs at least one entry in 'url_patterns'")
+        try:
+            compiled = [re.compile(pattern) for pattern in patterns]
+        except re.error as e:
+            raise ValueError(f"Invalid api_capture URL pattern: {e}")
+
+        fields = dict(spec.get('fields') or {})
+        missing = [field for field in REQUIRED_FIELDS if not fields.get(field)]
+        if missing:
+            raise ValueError(f"api_capture fields must map: {', '.join(missing)}")
+
+        return cls(compiled, fields)
+
+    def matches(self, url: str) -> bool:
+        """Whether a request URL is one of the site's product APIs."""
+        return any(pattern.search(url) for pattern in self.url_patterns)
+
+    def to_product(self, payload: Any, url: str) -> Optional[ProductData]:
+        """
+        Map an API payload to a product.
+
+        Args:
+            payload: Decoded JSON response
+            url: Product page URL the payload belongs to
+
+        Returns:
+            ProductData, or None if a required field is missing from the payload
+        """
+        values = {field: _field_value(field.split('.')[-1], _resolve(payload, path))
+                  for field, path in self.fields.items()}
+        if any(values.get(field) is None for field in REQUIRED_FIELDS):
+            return None
+
+        product_data = ProductData(url)
+        for field, value in values.items():
+            if value is None:
+                continue
+            if field.startswith('metadata.'):
+                product_data.metadata[field[len('metadata.'):]] = value
+            else:
+                setattr(product_data, field, value)
+        product_data.metadata['extraction'] = 'api'
+        return product_data
+
+    def finished_responses(self, log_entries: Iterable[Dict[str, Any]],
+                           pending: Dict[str, str]) -> Iterator[Tuple[str, str]]:
+        """
+        Follow matching API calls through Chrome performance log entries.
+
+        Args:
+            log_entries: Entries returned by driver.get_log('performance')
+            pending: Request ID to URL of matching calls still loading; updated in place
+                so a capture can be continued over several polls
+
+        Yields:
+            (request_id, endpoint) for every matching GET that finished with a JSON response
+        """
+        for entry in log_entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params') or {}
+            request_id = params.get('requestId')
+
+            if method == 'Network.requestWillBeSent':
+                request = params.get('request') or {}
+                # Only GET calls can be replayed without the page's request body
+                if request.get('method') == 'GET' and self.matches(request.get('url', '')):
+                    pending[request_id] = request['url']
+            elif method == 'Network.responseReceived' and request_id in pending:
+                response = params.get('response') or {}
+                if response.get('status', 0) >= 400 or 'json' not in response.get('mimeType', ''):
+                    pending.pop(request_id)
+            elif method == 'Network.loadingFailed':
+                pending.pop(request_id, None)
+            elif method == 'Network.loadingFinished' and request_id in pending:
+                yield request_id, pending.pop(request_id)
+
+
+def decode_response_body(response: Dict[str, Any]) -> str:
+    """Text of a Network.getResponseBody result."""
+    body = response.get('body', '')
+    if response.get('base64Encoded'):
+        body = base64.b64decode(body).decode('utf-8', errors='replace')
+    return body
+
+
+class EndpointStore:
+    """
+    Persistent map from product page URL to the API endpoint that serves its data.
+    Endpoints learned by the browser are reused by the static HTTP path, in this
+    and later runs. The file is rewritten atomically on every change.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            path: JSON file holding the endpoints (defaults to performance.api_endpoints_file)
+        """
+        self.path = Path(path or config_manager.get_setting(
+            'performance.api_endpoints_file', 'data/cache/api_endpoints.json'))
+        self._lock = threading.Lock()
+        self._endpoints: Optional[Dict[str, str]] = None
+
+    def get(self, url: str) -> Optional[str]:
+        """Return the recorded endpoint for a product page, if any."""
+        with self._lock:
+            return self._load().get(url)
+
+    def record(self, url: str, endpoint: str) -> None:
+        """Remember the endpoint serving a product page."""
+        with self._lock:
+            endpoints = self._load()
+            if endpoints.get(url) == endpoint:
+                return
+            endpoints[url] = endpoint
+            self._save(endpoints)
+        logger.debug(f"Recorded API endpoint for {url}: {endpoint}")
+
+    def forget(self, url: str) -> None:
+        """Drop an endpoint that stopped serving usable data."""
+        with self._lock:
+            endpoints = self._load()
+            if endpoints.pop(url, None) is None:
+                return
+            self._save(endpoints)
+        logger.debug(f"Forgot API endpoint for {url}")
+
+    def _load(self) -> Dict[str, str]:
+        if self._endpoints is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._endpoints = dict(json.load(f))
+            except FileNotFoundError:
+                self._endpoints = {}
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable API endpoint file {self.path}: {e}")
+                self._endpoints = {}
+        return self._endpoints
+
+    def _save(self, endpoints: Dict[str, str]) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(endpoints, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save API endpoints to {self.path}: {e}")
+
+
+# Shared by every scraper in the process
+endpoint_store = EndpointStore()
@@ -6,16 +6,30 @@ Provides the template method pattern for common scraping workflow.
 import time
 import json
 import random
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from urllib.parse import urljoin, urlparse
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+try:
+    import aiohttp
+except ImportError:  # Async fetch mode is optional
+    aiohttp = None
+
 from ..cli.utils.config import config_manager
 from ..cli.utils.logger import get_logger
 from .data_models import ProductData, ScrapingError
+from .http_cache import HttpCache, CacheEntry
+from .fingerprint import compute_fingerprint
+from .parsers import HtmlElement, parse_html, resolve_backend
+from .extraction import ExtractionPlan
+from .structured_data import extract_structured_data
+from .api_capture import ApiCapture, endpoint_store
+from .streaming import StreamSettings, StreamingBody, content_length, read_streamed, stream_stats
+from .rate_limiter import rate_limiter
 
 
 class AbstractScraper(ABC):
@@ -33,18 +47,33 @@ class AbstractScraper(ABC):
         self.selectors = self.config.get('selectors', {})
         self.headers = self.config.get('headers', {})
         self.rate_limit = self.config.get('rate_limit', 2.0)
+        self.fingerprint_markers = self.config.get('fingerprint_markers', [])
+        self.parser_backend = resolve_backend(self.config.get('parser'))
+        self.extraction_plan = ExtractionPlan.from_config(self.config)
+        self.use_structured_data = self.config.get('structured_data', True)
+        self.api_capture = ApiCapture.from_config(self.config)
+        self.endpoint_store = endpoint_store
+        self.streaming = StreamSettings.from_config(self.config)
+        # Set by the concurrent manager in process mode to parse pages in other processes
+        self.parse_pool = None
         
         # Initialize session with retry strategy
         self.session = self._create_session()
         
-        # Rate limiting
-        self.last_request_time = 0
+        # Per-site rate limiting shared with every other scraper, thread and worker process
+        self.rate_limiter = rate_limiter
         
         # Error handling configuration
         error_config = config_manager.get_error_handling_config()
         self.max_retries = error_config.get('max_retries', 3)
         self.retry_delays = error_config.get('retry_delays', [1, 2, 4])
         self.timeout = error_config.get('network_timeout', 30)
+        # Error the last failed scrape_product call reported, for the scraper pool
+        self.last_error = None
+        
+        # HTTP response cache with a per-site TTL override
+        self.http_cache = HttpCache()
+        self.cache_ttl = self.config.get('cache_ttl', config_manager.get_setting('performance.cache_duration', 3600))
         
         self.logger.info(f"Initialized {site_name} scraper")
     
@@ -65,10 +94,10 @@ class AbstractScraper(ABC):
         default_headers.update(self.headers)
         session.headers.update(default_headers)
         
-        # Configure retry strategy
+        # Configure retry strategy; 429/503 are left to the rate limiter, which backs off the site
         retry_strategy = Retry(
             total=3,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=[500, 502, 504],
             allowed_methods=["HEAD", "GET", "OPTIONS"],
             backoff_factor=1
         )
@@ -87,48 +116,203 @@ class AbstractScraper(ABC):
         return random.choice(user_agents)
     
     def _respect_rate_limit(self):
-        """Implement rate limiting between requests."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        if time_since_last_request < self.rate_limit:
-            sleep_time = self.rate_limit - time_since_last_request
-            self.logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        """Wait for a request slot to this site; the returned permit must be released."""
+        return self.rate_limiter.acquire(self.site_name, self.rate_limit)
     
     def fetch_page(self, url: str) -> Optional[str]:
         """
         Fetch page content with error handling and retries.
         Template method that can be overridden by subclasses.
         """
-        self._respect_rate_limit()
+        response = self._request_page(url, stream=self.streaming is not None)
+        return self._read_body(response) if response is not None else None
+    
+    def _request_page(self, url: str, headers: Dict[str, str] = None,
+                      stream: bool = False) -> Optional[requests.Response]:
+        """
+        Send a GET request with rate limiting and retries, returning the response.
+        Every attempt takes a rate-limit permit and reports its status back, so
+        429/503 answers slow the whole site down. With stream=True the body is
+        left unread for _read_body.
+        """
+        options = {'stream': True} if stream else {}
         
         for attempt in range(self.max_retries + 1):
+            permit = self._respect_rate_limit()
             try:
                 self.logger.debug(f"Fetching page: {url} (attempt {attempt + 1})")
                 
-                response = self.session.get(url, timeout=self.timeout)
-                response.raise_for_status()
+                response = self.session.get(url, timeout=self.timeout, headers=headers, **options)
+                self.rate_limiter.release(permit, response.status_code, response.headers.get('Retry-After'))
+                try:
+                    response.raise_for_status()
+                except requests.exceptions.HTTPError:
+                    response.close()
+                    raise
                 
                 self.logger.debug(f"Successfully fetched page: {url}")
-                return response.text
+                return response
                 
             except requests.exceptions.RequestException as e:
                 self.logger.warning(f"Request failed for {url}: {e}")
                 
-                if attempt < self.max_retries:
-                    delay = self.retry_delays[min(attempt, len(self.retry_delays) - 1)]
-                    self.logger.info(f"Retrying in {delay} seconds...")
-                    time.sleep(delay)
-                else:
+                if attempt >= self.max_retries:
                     raise ScrapingError(
                         f"Failed to fetch page after {self.max_retries + 1} attempts",
                         error_type="network",
                         url=url,
                         response_code=getattr(e.response, 'status_code', None) if hasattr(e, 'response') else None
                     )
+            finally:
+                # No-op once the response was reported; frees the slot when none arrived
+                self.rate_limiter.release(permit)
+            
+            delay = self.retry_delays[min(attempt, len(self.retry_delays) - 1)]
+            self.logger.info(f"Retrying in {delay} seconds...")
+            time.sleep(delay)
+        
+        return None
+    
+    def _read_body(self, response: requests.Response) -> str:
+        """
+        Return the text of a response.
+        Sites with 'streaming' enabled read the body in chunks and stop once every
+        stop target has been seen or the byte cap is hit, closing the connection.
+        """
+        if self.streaming is None:
+            return response.text
+        
+        body = StreamingBody(self.streaming, response.encoding)
+        try:
+            html_content = read_streamed(response.iter_content(self.streaming.chunk_size), body)
+            # Compressed bytes actually received, comparable with Content-Length
+            wire_bytes = response.raw.tell() if hasattr(response.raw, 'tell') else None
+        finally:
+            response.close()
+        
+        stream_stats.record(self.site_name, body, content_length(response.headers), wire_bytes)
+        if body.outcome != 'complete':
+            self.logger.debug(f"Stopped reading {response.url} after {body.bytes_read} bytes ({body.outcome})")
+        return html_content
+    
+    async def _read_body_async(self, response) -> str:
+        """Async counterpart of _read_body for aiohttp responses."""
+        body = StreamingBody(self.streaming, response.charset)
+        async for chunk in response.content.iter_chunked(self.streaming.chunk_size):
+            if body.feed(chunk):
+                # Drop the connection instead of draining the rest of the body
+                response.close()
+                break
+        html_content = body.text()
+        
+        # Decompressed byte counts can only be compared with an uncompressed Content-Length
+        compressed = response.headers.get('Content-Encoding', 'identity') != 'identity'
+        stream_stats.record(self.site_name, body, None if compressed else content_length(response.headers))
+        return html_content
+    
+    def _uses_http_cache(self) -> bool:
+        """Whether pages go through the requests fetch path that the HTTP cache wraps."""
+        return self.http_cache.enabled and type(self).fetch_page is AbstractScraper.fetch_page
+    
+    def _fetch_with_cache(self, url: str) -> Tuple[Optional[str], Optional[ProductData], Optional[Dict[str, str]]]:
+        """
+        Fetch a page through the HTTP cache.
+        Fresh entries are served without a request; stale entries are revalidated
+        with If-None-Match / If-Modified-Since, and a 304 reuses the cached parse.
+        
+        Returns:
+            (html_content, cached_product, response_headers). cached_product is set
+            when the page did not change; otherwise html_content must be parsed.
+        """
+        entry = self.http_cache.get(url)
+        if entry is not None and entry.product is None:
+            entry = None
+        
+        if entry is not None and entry.is_fresh(self.cache_ttl):
+            self.http_cache.record('hits')
+            return None, self._product_from_cache(entry, 'hit'), None
+        
+        response = self._request_page(url, entry.conditional_headers() if entry else None,
+                                      stream=self.streaming is not None)
+        if response is None:
+            return None, None, None
+        
+        if response.status_code == 304 and entry is not None:
+            if self.streaming is not None:
+                response.close()
+            self.http_cache.touch(entry, response.headers)
+            self.http_cache.record('revalidated')
+            return None, self._product_from_cache(entry, 'revalidated'), None
+        
+        self.http_cache.record('misses')
+        return self._read_body(response), None, response.headers
+    
+    def _product_from_cache(self, entry: CacheEntry, outcome: str) -> ProductData:
+        """
+        Rebuild the product parsed from a cached page.
+        The page is the one already parsed and stored, so the result keeps its
+        original scrape time and is marked unchanged: it verifies the stored
+        price instead of being stored again as a new observation.
+        """
+        product_data = ProductData.from_dict(entry.product)
+        product_data.metadata['http_cache'] = outcome
+        product_data.metadata['content_unchanged'] = True
+        self.logger.debug(f"HTTP cache {outcome} for {entry.url}")
+        return product_data
+    
+    async def fetch_page_async(self, url: str, http_session, rate_limiter=None) -> Optional[str]:
+        """
+        Fetch page content on an asyncio event loop.
+        Mirrors fetch_page, but awaits rate-limit permits and retry delays
+        instead of blocking a worker thread. Client errors other than 429 fail
+        at once instead of being retried.
+        
+        Args:
+            url: Page URL to fetch
+            http_session: Shared aiohttp.ClientSession with pooled connections
+            rate_limiter: Rate-limit service to use (defaults to the shared one)
+        """
+        if aiohttp is None:
+            raise ScrapingError("aiohttp is required for async fetch mode", "configuration", url)
+        
+        rate_limiter = rate_limiter or self.rate_limiter
+        headers = dict(self.session.headers)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        
+        for attempt in range(self.max_retries + 1):
+            permit = await rate_limiter.acquire_async(self.site_name, self.rate_limit)
+            try:
+                self.logger.debug(f"Async fetching page: {url} (attempt {attempt + 1})")
+                
+                async with http_session.get(url, headers=headers, timeout=timeout) as response:
+                    rate_limiter.release(permit, response.status, response.headers.get('Retry-After'))
+                    response.raise_for_status()
+                    if self.streaming is None:
+                        html_content = await response.text()
+                    else:
+                        html_content = await self._read_body_async(response)
+                
+                self.logger.debug(f"Successfully fetched page: {url}")
+                return html_content
+                
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.warning(f"Async request failed for {url}: {e}")
+                
+                # A missing or forbidden page stays that way; only throttling is worth retrying
+                status = getattr(e, 'status', None)
+                if (status is not None and 400 <= status < 500 and status != 429) or attempt >= self.max_retries:
+                    raise ScrapingError(
+                        f"Failed to fetch page after {attempt + 1} attempts",
+                        error_type="network",
+                        url=url,
+                        response_code=status
+                    )
+            finally:
+                rate_limiter.release(permit)
+            
+            delay = self.retry_delays[min(attempt, len(self.retry_delays) - 1)]
+            self.logger.info(f"Retrying in {delay} seconds...")
+            await asyncio.sleep(delay)
         
         return None
     
@@ -140,35 +324,183 @@ class AbstractScraper(ABC):
         """
         pass
     
+    # Fields structured data must provide for the DOM parse to be skipped
+    STRUCTURED_DATA_REQUIRED_FIELDS = ('title', 'price')
+    
+    def url_metadata(self, url: str) -> Dict[str, Any]:
+        """
+        Site-specific metadata derived from the URL alone.
+        Kept on products built from structured data, where parse_page does not run.
+        """
+        return {}
+    
+    def extract_product(self, html_content: str, url: str) -> Optional[ProductData]:
+        """
+        Build the product for a fetched page.
+        Schema.org JSON-LD/microdata is read from the raw HTML first; when it holds
+        every required field the DOM parse is skipped, otherwise parse_page runs and
+        structured values only fill the fields it left empty.
+        """
+        structured = extract_structured_data(html_content) if self.use_structured_data else {}
+        
+        if all(structured.get(field) is not None for field in self.STRUCTURED_DATA_REQUIRED_FIELDS):
+            product_data = ProductData(url)
+            for field, value in structured.items():
+                setattr(product_data, field, value)
+            product_data.metadata.update(self.url_metadata(url))
+            product_data.metadata['extraction'] = 'structured_data'
+            return product_data
+        
+        product_data = self.parse_page(html_content, url)
+        if product_data:
+            # currency always has a default, so only complete structured data sets it
+            for field, value in structured.items():
+                if field != 'currency' and getattr(product_data, field, None) is None:
+                    setattr(product_data, field, value)
+        return product_data
+    
+    def _extract(self, html_content: str, url: str) -> Optional[ProductData]:
+        """
+        Run extract_product here, or in the parse pool when one is attached.
+        Scrapers that override extract_product (to use state of this process) always run it here.
+        """
+        if self.parse_pool is not None and type(self).extract_product is AbstractScraper.extract_product:
+            return self.parse_pool.extract(self.site_name, html_content, url)
+        return self.extract_product(html_content, url)
+    
+    def parse_html(self, html_content: str) -> HtmlElement:
+        """Parse page content with the parser backend configured for this site."""
+        return parse_html(html_content, self.parser_backend)
+    
     def handle_error(self, error: Exception, url: str) -> None:
         """
         Handle scraping errors with appropriate logging and classification.
         Can be overridden by subclasses for site-specific error handling.
         """
+        self.last_error = error
         if isinstance(error, ScrapingError):
             self.logger.error(f"Scraping error for {url}: {error.error_type} - {str(error)}")
         else:
             self.logger.error(f"Unexpected error for {url}: {str(error)}")
     
-    def scrape_product(self, url: str) -> Optional[ProductData]:
+    def _api_product(self, url: str, endpoint: str, body: str,
+                     known_fingerprint: Optional[str]) -> Optional[ProductData]:
+        """
+        Build the product from a recorded API endpoint's response.
+        An endpoint whose response no longer maps to a product is forgotten.
+        """
+        try:
+            product_data = self.api_capture.to_product(json.loads(body), url)
+        except ValueError:
+            product_data = None
+        if product_data is None:
+            self.logger.info(f"API endpoint no longer serves product data, falling back to the page: {endpoint}")
+            self.endpoint_store.forget(url)
+            return None
+        
+        fingerprint = compute_fingerprint(body)
+        if fingerprint == known_fingerprint:
+            return self._unchanged_product(url, fingerprint)
+        product_data.metadata.update(self.url_metadata(url))
+        product_data.metadata.update({
+            'content_fingerprint': fingerprint,
+            'api_endpoint': endpoint
+        })
+        return product_data
+    
+    def _fetch_from_api(self, url: str, known_fingerprint: Optional[str] = None) -> Optional[ProductData]:
+        """
+        Call the API endpoint recorded for a product page instead of loading the page.
+        Returns None when no endpoint is known or the call fails.
+        """
+        endpoint = self.endpoint_store.get(url)
+        if endpoint is None:
+            return None
+        
+        try:
+            response = self._request_page(endpoint, {'Accept': 'application/json'})
+        except ScrapingError as e:
+            self.logger.warning(f"API endpoint failed for {url}, falling back to the page: {e}")
+            self.endpoint_store.forget(url)
+            return None
+        if response is None:
+            return None
+        return self._api_product(url, endpoint, response.text, known_fingerprint)
+    
+    async def _fetch_from_api_async(self, url: str, http_session, rate_limiter=None,
+                                    known_fingerprint: Optional[str] = None) -> Optional[ProductData]:
+        """Async counterpart of _fetch_from_api, always fetching over plain HTTP."""
+        endpoint = self.endpoint_store.get(url)
+        if endpoint is None:
+            return None
+        
+        try:
+            body = await AbstractScraper.fetch_page_async(self, endpoint, http_session, rate_limiter)
+        except ScrapingError as e:
+            self.logger.warning(f"API endpoint failed for {url}, falling back to the page: {e}")
+            self.endpoint_store.forget(url)
+            return None
+        if not body:
+            return None
+        return self._api_product(url, endpoint, body, known_fingerprint)
+    
+    def _unchanged_product(self, url: str, fingerprint: str) -> ProductData:
+        """Placeholder result for a page whose content fingerprint has not changed."""
+        product_data = ProductData(url)
+        product_data.metadata.update({
+            'content_unchanged': True,
+            'content_fingerprint': fingerprint
+        })
+        return product_data
+    
+    def scrape_product(self, url: str, known_fingerprint: Optional[str] = None) -> Optional[ProductData]:
         """
         Main scraping method implementing the template method pattern.
         This is the public interface that orchestrates the scraping process.
+        
+        Args:
+            url: Product page URL
+            known_fingerprint: Fingerprint stored for the page on its last change. When the
+                fetched page still matches it, parsing is skipped and the result is a
+                placeholder with metadata['content_unchanged'] set.
         """
         start_time = time.time()
+        self.last_error = None
         
         try:
             self.logger.info(f"Starting to scrape product: {url}")
             
-            # Step 1: Fetch page content
-            html_content = self.fetch_page(url)
-            if not html_content:
-                raise ScrapingError("Failed to fetch page content", "network", url)
+            # Step 1: Fetch page content (an unchanged cached page or a recorded
+            # API endpoint comes back already parsed)
+            response_headers = None
+            html_content = None
+            product_data = self._fetch_from_api(url, known_fingerprint) if self.api_capture else None
+            if product_data is None:
+                if self._uses_http_cache():
+                    html_content, product_data, response_headers = self._fetch_with_cache(url)
+                else:
+                    html_content = self.fetch_page(url)
             
-            # Step 2: Parse product data
-            product_data = self.parse_page(html_content, url)
-            if not product_data:
-                raise ScrapingError("Failed to parse product data", "parsing", url)
+            if product_data is None:
+                if not html_content:
+                    raise ScrapingError("Failed to fetch page content", "network", url)
+                
+                # Step 2: Parse product data unless the page content is unchanged
+                fingerprint = compute_fingerprint(html_content, self.fingerprint_markers)
+                if fingerprint == known_fingerprint:
+                    product_data = self._unchanged_product(url, fingerprint)
+                else:
+                    product_data = self._extract(html_content, url)
+                    if not product_data:
+                        raise ScrapingError("Failed to parse product data", "parsing", url)
+                    product_data.metadata['content_fingerprint'] = fingerprint
+                
+                # Step 3: Cache the page with its parse for later revalidation
+                if response_headers is not None:
+                    self.http_cache.put(url, html_content, response_headers,
+                                        None if product_data.metadata.get('content_unchanged') else product_data.to_dict())
+            elif known_fingerprint and product_data.metadata.get('content_fingerprint') == known_fingerprint:
+                product_data = self._unchanged_product(url, known_fingerprint)
 
             # Step 4: Add metadata
             elapsed_time = time.time() - start_time
@@ -179,9 +511,55 @@ class AbstractScraper(ABC):
                 'user_agent': self.session.headers.get('User-Agent', '')
             })
             
-            self.logger.info(
-                f"Successfully scraped raw data for: {product_data.title[:50] if product_data.title else 'N/A'}..."
-            )
+            if product_data.metadata.get('content_unchanged'):
+                self.logger.info(f"Page unchanged since last scrape: {url}")
+            else:
+                self.logger.info(
+                    f"Successfully scraped raw data for: {product_data.title[:50] if product_data.title else 'N/A'}..."
+                )
+            
+            return product_data
+            
+        except Exception as e:
+            self.handle_error(e, url)
+            return None
+    
+    async def scrape_product_async(self, url: str, http_session, rate_limiter=None,
+                                   known_fingerprint: Optional[str] = None) -> Optional[ProductData]:
+        """
+        Async counterpart of scrape_product used by the asyncio fetch engine.
+        Errors are handled the same way and reported as a None result.
+        """
+        start_time = time.time()
+        
+        try:
+            self.logger.info(f"Starting to scrape product (async): {url}")
+            
+            product_data = None
+            if self.api_capture is not None:
+                product_data = await self._fetch_from_api_async(url, http_session, rate_limiter, known_fingerprint)
+            if product_data is None:
+                html_content = await self.fetch_page_async(url, http_session, rate_limiter)
+                if not html_content:
+                    raise ScrapingError("Failed to fetch page content", "network", url)
+                
+                fingerprint = compute_fingerprint(html_content, self.fingerprint_markers)
+                if fingerprint == known_fingerprint:
+                    product_data = self._unchanged_product(url, fingerprint)
+                else:
+                    product_data = self.extract_product(html_content, url)
+                    if not product_data:
+                        raise ScrapingError("Failed to parse product data", "parsing", url)
+                    product_data.metadata['content_fingerprint'] = fingerprint
+            
+            elapsed_time = time.time() - start_time
+            product_data.metadata.update({
+                'scraper_class': self.__class__.__name__,
+                'site_name': self.site_name,
+                'scraping_time_seconds': elapsed_time,
+                'user_agent': self.session.headers.get('User-Agent', ''),
+                'fetch_mode': 'async'
+            })
             
             return product_data
             
@@ -216,12 +594,25 @@ class AbstractScraper(ABC):
             'site_name': self.site_name,
             'scraper_class': self.__class__.__name__,
             'rate_limit': self.rate_limit,
+            'current_interval': self.rate_limiter.current_interval(self.site_name, self.rate_limit),
             'max_retries': self.max_retries,
             'timeout': self.timeout,
-            'session_headers': dict(self.session.headers)
+            'session_headers': dict(self.session.headers),
+            'http_cache': dict(self.http_cache.stats),
+            'streaming': stream_stats.get_stats().get(self.site_name, {})
         }
     
+    def is_healthy(self) -> bool:
+        """Check whether the scraper can be reused for another job."""
+        return getattr(self, 'session', None) is not None
+    
+    def close(self) -> None:
+        """Release network resources held by the scraper."""
+        session = getattr(self, 'session', None)
+        if session is not None:
+            session.close()
+            self.session = None
+    
     def __del__(self):
         """Cleanup resources when scraper is destroyed."""
-        if hasattr(self, 'session'):
-            self.session.close()
\ No newline at end of file
+        self.close()
\ No newline at end of file
@@ -3,22 +3,30 @@ Concurrent scraping manager implementing threading and multiprocessing.
 Implements the concurrent scraping requirement (Project.md line 120).
 """
 
+import asyncio
 import threading
 import multiprocessing
 import queue
 import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any, Optional, Callable
 from dataclasses import dataclass
 from datetime import datetime
 
 from .base_scraper import AbstractScraper, ProductData, ScrapingError
-from .factory import ScraperFactory
+from .scraper_pool import ScraperPool
+from .driver_pool import driver_pool
+from .streaming import stream_stats
+from .rate_limiter import rate_limiter
+from .parse_pool import ParsePool
+from .job_scheduler import SiteReadyScheduler
 from ..cli.utils.config import config_manager
 from ..cli.utils.logger import get_logger
 from ..data.database import db_manager
-from ..data.processors import DataProcessor
+from ..data.processors import DataProcessor, DataValidationError
+from ..data.batch_writer import PriceHistoryBatchWriter
+from ..data.job_queue import JobQueue
 
 
 @dataclass
@@ -30,6 +38,7 @@ class ScrapingJob:
     priority: int = 1
     retries: int = 0
     created_at: datetime = None
+    queue_id: Optional[int] = None  # ID in the durable job queue, if the job came from one
     
     def __post_init__(self):
         if self.created_at is None:
@@ -53,13 +62,17 @@ class ConcurrentScrapingManager:
     Implements queue-based task management and intelligent scheduling.
     """
     
-    def __init__(self, max_workers: int = None, use_multiprocessing: bool = False):
+    def __init__(self, max_workers: int = None, use_multiprocessing: bool = False,
+                 job_queue: JobQueue = None):
         """
         Initialize concurrent scraping manager.
         
         Args:
             max_workers: Maximum number of concurrent workers
-            use_multiprocessing: Whether to use multiprocessing instead of threading
+            use_multiprocessing: Whether to parse pages in a process pool while
+                worker threads download them
+            job_queue: Durable queue of a scraping session; its jobs are loaded with
+                load_queued_jobs() and acknowledged as their results are stored
         """
         self.logger = get_logger(self.__class__.__name__)
         
@@ -68,12 +81,17 @@ class ConcurrentScrapingManager:
         self.use_multiprocessing = use_multiprocessing
         
         # Job management
-        self.job_queue = queue.PriorityQueue()
+        self.job_queue = SiteReadyScheduler(self._get_site_rate_limit)
         self.results_queue = queue.Queue()
         self.active_jobs: Dict[str, ScrapingJob] = {}
+        self.jobs_done = threading.Condition()
         
         # Session management
-        self.session_id = str(uuid.uuid4())[:8]
+        self.durable_queue = job_queue
+        self.session_id = job_queue.session_id if job_queue else str(uuid.uuid4())[:8]
+        self.checkpoint_interval = config_manager.get_setting('scraping.job_queue.checkpoint_interval', 30)
+        self._checkpoint_stop = threading.Event()
+        self._checkpoint_thread: Optional[threading.Thread] = None
         self.session_stats = {
             'started_at': datetime.utcnow(),
             'jobs_queued': 0,
@@ -85,20 +103,24 @@ class ConcurrentScrapingManager:
         
         # Threading/multiprocessing
         self.executor = None
+        self.parse_pool: Optional[ParsePool] = None
         self.workers_active = False
         self.shutdown_event = threading.Event()
         
-        # Rate limiting per site
-        self.site_last_request = {}
-        self.site_rate_limits = {}
+        # Scrapers are reused across jobs so sessions and browsers stay warm
+        self.scraper_pool = ScraperPool()
         
         self.logger.info(f"Concurrent manager initialized: {self.max_workers} workers, "
                         f"{'multiprocessing' if use_multiprocessing else 'threading'} mode")
         
         # Initialize data processor
         self.processor = DataProcessor()
+        
+        # Results are stored in batches by a write-behind writer
+        self.result_writer = PriceHistoryBatchWriter()
+        self.result_writer.job_queue = job_queue
     
-    def add_job(self, site_name: str, url: str, priority: int = 1) -> str:
+    def add_job(self, site_name: str, url: str, priority: int = 1, queue_id: int = None) -> str:
         """
         Add a scraping job to the queue.
         
@@ -106,6 +128,7 @@ class ConcurrentScrapingManager:
             site_name: Name of the e-commerce site
             url: Product URL to scrape
             priority: Job priority (lower = higher priority)
+            queue_id: ID of the job in the durable queue, if it was claimed from one
             
         Returns:
             str: Job ID
@@ -115,12 +138,13 @@ class ConcurrentScrapingManager:
             job_id=job_id,
             site_name=site_name,
             url=url,
-            priority=priority
+            priority=priority,
+            queue_id=queue_id
         )
         
-        # Add to queue with priority
-        self.job_queue.put((priority, time.time(), job))
+        # Add to the site's queue with priority
         self.active_jobs[job_id] = job
+        self.job_queue.put(job)
         self.session_stats['jobs_queued'] += 1
         
         self.logger.debug(f"Added job {job_id}: {site_name} - {url}")
@@ -148,6 +172,74 @@ class ConcurrentScrapingManager:
         self.logger.info(f"Added {len(jobs)} bulk jobs to queue")
         return job_ids
     
+    def load_queued_jobs(self, limit: int = None) -> int:
+        """
+        Claim claimable jobs of the durable queue and schedule them.
+        Jobs stay leased to this manager, with leases renewed at each checkpoint,
+        until their results are stored or they fail for good.
+        
+        Args:
+            limit: Maximum jobs to claim (all claimable jobs if None)
+        
+        Returns:
+            int: Number of jobs loaded
+        """
+        loaded = 0
+        while limit is None or loaded < limit:
+            claimed = self.durable_queue.claim(limit - loaded) if limit else self.durable_queue.claim()
+            if not claimed:
+                break
+            for job in claimed:
+                self.add_job(job.site_name, job.url, job.priority, queue_id=job.id)
+            loaded += len(claimed)
+        
+        if loaded:
+            self.logger.info(f"Loaded {loaded} jobs of session {self.session_id}")
+        return loaded
+    
+    def _start_checkpoints(self) -> None:
+        """Start renewing leases and checkpointing the session in the background."""
+        if self.durable_queue is None or self._checkpoint_thread is not None:
+            return
+        self._checkpoint_stop.clear()
+        self._checkpoint_thread = threading.Thread(target=self._checkpoint_loop, daemon=True)
+        self._checkpoint_thread.start()
+    
+    def _checkpoint_loop(self) -> None:
+        """Renew leases and store progress every checkpoint_interval seconds (runs in separate thread)."""
+        while not self._checkpoint_stop.wait(self.checkpoint_interval):
+            try:
+                self.durable_queue.heartbeat()
+                self.durable_queue.checkpoint(self._checkpoint_stats())
+            except Exception as e:
+                self.logger.error(f"Session checkpoint failed: {e}")
+    
+    def _checkpoint_stats(self) -> Dict[str, Any]:
+        return {
+            'jobs_completed': self.session_stats['jobs_completed'],
+            'jobs_failed': self.session_stats['jobs_failed'],
+            'elapsed_time': (datetime.utcnow() - self.session_stats['started_at']).total_seconds()
+        }
+    
+    def _finish_session(self) -> None:
+        """Stop checkpointing, return unstarted jobs and record whether the durable session completed."""
+        if self.durable_queue is None:
+            return
+        self._checkpoint_stop.set()
+        if self._checkpoint_thread is not None:
+            self._checkpoint_thread.join(timeout=5)
+            self._checkpoint_thread = None
+        try:
+            # Every started job has been stored or failed by now; hand back the
+            # unstarted ones first so they don't count as this run's unfinished work
+            self.session_stats['jobs_released'] = self.durable_queue.release()
+            status = self.durable_queue.finish(self._checkpoint_stats())
+            if status == 'interrupted':
+                self.logger.warning(f"Session {self.session_id} stopped early; "
+                                    f"continue it with: scrape run --resume {self.session_id}")
+        except Exception as e:
+            self.logger.error(f"Failed to close session {self.session_id}: {e}")
+    
     def start_workers(self) -> None:
         """Start the concurrent workers."""
         if self.workers_active:
@@ -156,13 +248,18 @@ class ConcurrentScrapingManager:
         
         self.workers_active = True
         self.shutdown_event.clear()
+        self.job_queue.open()
+        self.result_writer.start()
+        self._start_checkpoints()
         
-        # Initialize executor
+        # Initialize executor; in multiprocessing mode the threads only download and
+        # hand pages to a pool of parser processes
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
         if self.use_multiprocessing:
-            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
-            self.logger.info(f"Started {self.max_workers} multiprocessing workers")
+            self.parse_pool = ParsePool()
+            self.logger.info(f"Started {self.max_workers} downloading workers feeding "
+                             f"{self.parse_pool.max_workers} parser processes")
         else:
-            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
             self.logger.info(f"Started {self.max_workers} threading workers")
         
         # Start job dispatcher thread
@@ -185,53 +282,65 @@ class ConcurrentScrapingManager:
         try:
             # Signal workers to stop
             self.shutdown_event.set()
+            self.job_queue.close()
             
             # Shutdown executor without timeout parameter for compatibility
             self.executor.shutdown(wait=True)
             
             self.executor = None
+            if self.parse_pool is not None:
+                self.parse_pool.close()
+            self.scraper_pool.close_all()
+            driver_pool.close_all()
             self.logger.info("All workers stopped successfully")
             
         except Exception as e:
             self.logger.error(f"Error stopping workers: {e}")
             self.executor = None
+        
+        # Process results that arrived after the collector stopped, then
+        # write out everything still buffered
+        self.collector_thread.join(timeout=5)
+        while True:
+            try:
+                self._process_result(self.results_queue.get_nowait())
+            except queue.Empty:
+                break
+        self._flush_results()
+        self._finish_session()
     
     def _job_dispatcher(self) -> None:
-        """Dispatch jobs to workers (runs in separate thread)."""
-        futures = []
+        """
+        Dispatch jobs to workers (runs in separate thread).
+        Blocks until a worker is free and some site's next request is allowed,
+        so a rate-limited site never holds back jobs for other sites.
+        """
+        free_workers = threading.Semaphore(self.max_workers)
         
         while self.workers_active and not self.shutdown_event.is_set():
             try:
-                # Get job from queue with timeout
-                try:
-                    priority, timestamp, job = self.job_queue.get(timeout=1.0)
-                except queue.Empty:
-                    continue
+                free_workers.acquire()
                 
-                # Check rate limiting
-                if not self._check_rate_limit(job.site_name):
-                    # Re-queue job for later
-                    self.job_queue.put((priority, time.time(), job))
-                    time.sleep(0.1)
-                    continue
+                job = self.job_queue.get()
+                if job is None:
+                    # Scheduler closed during shutdown
+                    free_workers.release()
+                    break
                 
                 # Submit job to executor
                 future = self.executor.submit(self._worker_function, job)
-                futures.append(future)
-                
-                # Clean completed futures
-                futures = [f for f in futures if not f.done()]
-                
-                self.job_queue.task_done()
+                future.add_done_callback(lambda f: free_workers.release())
                 
             except Exception as e:
                 self.logger.error(f"Error in job dispatcher: {e}")
+                free_workers.release()
                 time.sleep(1.0)
     
     def _worker_function(self, job: ScrapingJob) -> ScrapingResult:
         """
         Worker function to process a single scraping job.
-        This function runs in worker thread/process.
+        This function runs in a worker thread; with a parse pool, the thread
+        waits on I/O while the page is parsed in another process.
         
         Args:
             job: Scraping job to process
@@ -243,37 +352,26 @@ class ConcurrentScrapingManager:
         worker_id = f"{threading.current_thread().name}-{job.job_id}"
         
         try:
-            # Create scraper for the site
-            scraper = ScraperFactory.create_scraper(job.site_name)
-            
-            # Perform scraping
-            product_data = scraper.scrape_product(job.url)
-            
-            processing_time = time.time() - start_time
+            # Lease a warm scraper for the site
+            pooled = self.scraper_pool.acquire(job.site_name)
+            pooled.scraper.parse_pool = self.parse_pool
+            product_data = None
+            error = None
             
-            if product_data:
-                # Process the raw data
-                processed_data = self.processor.process(product_data)
-                
-                result = ScrapingResult(
-                    job_id=job.job_id,
-                    success=True,
-                    product_data=processed_data,
-                    processing_time=processing_time,
-                    worker_id=worker_id
-                )
-            else:
-                result = ScrapingResult(
-                    job_id=job.job_id,
-                    success=False,
-                    error="No data extracted",
-                    processing_time=processing_time,
-                    worker_id=worker_id
-                )
+            try:
+                # Perform scraping
+                product_data = pooled.scraper.scrape_product(
+                    job.url, known_fingerprint=self.result_writer.fingerprints.get(job.url))
+                if product_data is None:
+                    error = pooled.scraper.last_error
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                # The pool recycles the scraper if the error points at its session
+                self.scraper_pool.release(pooled, error=error)
             
-            # Clean up scraper resources
-            if hasattr(scraper, 'driver') and scraper.driver:
-                scraper.driver.quit()
+            result = self._build_result(job, product_data, start_time, worker_id)
             
         except Exception as e:
             processing_time = time.time() - start_time
@@ -290,6 +388,102 @@ class ConcurrentScrapingManager:
         
         return result
     
+    def _build_result(self, job: ScrapingJob, product_data: Optional[ProductData],
+                      start_time: float, worker_id: str) -> ScrapingResult:
+        """
+        Process scraped data and wrap it in a ScrapingResult.
+        
+        Args:
+            job: Scraping job that produced the data
+            product_data: Raw scraped data, or None if nothing was extracted
+            start_time: Time the job started processing
+            worker_id: Identifier of the worker that ran the job
+            
+        Returns:
+            ScrapingResult: Result of scraping operation
+        """
+        if product_data:
+            # Pages parsed in the parse pool were processed there too
+            processed = product_data.metadata.pop('processed', False)
+            validation_error = product_data.metadata.pop('validation_error', None)
+            if validation_error is not None:
+                raise DataValidationError(validation_error)
+            
+            # Unchanged pages were not parsed, so there is nothing to process
+            if product_data.metadata.get('content_unchanged') or processed:
+                processed_data = product_data
+            else:
+                processed_data = self.processor.process(product_data)
+            
+            return ScrapingResult(
+                job_id=job.job_id,
+                success=True,
+                product_data=processed_data,
+                processing_time=time.time() - start_time,
+                worker_id=worker_id
+            )
+        
+        return ScrapingResult(
+            job_id=job.job_id,
+            success=False,
+            error="No data extracted",
+            processing_time=time.time() - start_time,
+            worker_id=worker_id
+        )
+    
+    def run_async(self, max_concurrency: int = None) -> None:
+        """
+        Process all queued jobs on a single asyncio event loop.
+        Requests share pooled keep-alive connections instead of occupying a thread each.
+        
+        Args:
+            max_concurrency: Maximum number of in-flight requests
+        """
+        from .async_engine import AsyncFetchEngine
+        
+        engine = AsyncFetchEngine(max_concurrency=max_concurrency)
+        self.logger.info(f"Running {len(self.active_jobs)} jobs in async mode")
+        
+        self.result_writer.start()
+        self._start_checkpoints()
+        try:
+            asyncio.run(self._run_async_jobs(engine))
+        finally:
+            self._flush_results()
+            self._finish_session()
+    
+    async def _run_async_jobs(self, engine) -> None:
+        """Drain the job queue through the async engine until no jobs (or retries) remain."""
+        async with engine:
+            while not self.shutdown_event.is_set():
+                # Retries are re-queued by _process_result and picked up on the next pass
+                jobs = self.job_queue.drain()
+                
+                if not jobs:
+                    break
+                
+                await asyncio.gather(*(self._async_worker(engine, job) for job in jobs))
+    
+    async def _async_worker(self, engine, job: ScrapingJob) -> None:
+        """Scrape a single job on the event loop and process its result."""
+        start_time = time.time()
+        worker_id = f"async-{job.job_id}"
+        
+        try:
+            product_data = await engine.scrape_product(
+                job.site_name, job.url, known_fingerprint=self.result_writer.fingerprints.get(job.url))
+            result = self._build_result(job, product_data, start_time, worker_id)
+        except Exception as e:
+            result = ScrapingResult(
+                job_id=job.job_id,
+                success=False,
+                error=str(e),
+                processing_time=time.time() - start_time,
+                worker_id=worker_id
+            )
+        
+        self._process_result(result)
+    
     def _results_collector(self) -> None:
         """Collect and process results from workers (runs in separate thread)."""
         while self.workers_active and not self.shutdown_event.is_set():
@@ -326,12 +520,12 @@ class ConcurrentScrapingManager:
         if result.success:
             self.session_stats['jobs_completed'] += 1
             
-            # Store to database if we have product data
+            # Buffer for the batch writer if we have product data; the writer
+            # acknowledges the durable job in the transaction storing it
             if result.product_data:
-                try:
-                    self._store_product_data(result.product_data, job.site_name)
-                except Exception as e:
-                    self.logger.error(f"Failed to store product data: {e}")
+                if job.queue_id is not None:
+                    result.product_data.metadata['queue_job_id'] = job.queue_id
+                self.result_writer.add(result.product_data, job.site_name)
             
             self.logger.info(f"Job {result.job_id} completed successfully "
                            f"({result.processing_time:.2f}s) - {result.worker_id}")
@@ -350,126 +544,46 @@ class ConcurrentScrapingManager:
             if should_retry:
                 job.retries += 1
                 # Re-queue with lower priority
-                self.job_queue.put((job.priority + 10, time.time(), job))
+                self.job_queue.put(job, priority=job.priority + 10)
                 self.logger.warning(f"Retrying job {result.job_id} (attempt {job.retries})")
                 return
             
             self.logger.error(f"Job {result.job_id} failed permanently: {result.error}")
+            if job.queue_id is not None:
+                self.durable_queue.fail(job.queue_id, result.error or "unknown error")
         
-        # Remove from active jobs
-        del self.active_jobs[result.job_id]
+        # Remove from active jobs and wake wait_completion()
+        with self.jobs_done:
+            del self.active_jobs[result.job_id]
+            self.jobs_done.notify_all()
     
-    def _check_rate_limit(self, site_name: str) -> bool:
+    def _get_site_rate_limit(self, site_name: str) -> float:
         """
-        Check if we can make a request to the given site based on rate limiting.
+        Get the delay before the next job of a site should be dispatched.
+        Asks the shared rate limiter when the site will have a permit free for a
+        job after the one just dispatched, so workers are not handed jobs they
+        can only wait on.
         
         Args:
             site_name: Name of the site
             
         Returns:
-            bool: True if request is allowed
+            float: Seconds until the site's next job
         """
-        current_time = time.time()
+        try:
+            interval = config_manager.get_scraper_config(site_name).get('rate_limit', 2.0)
+        except ValueError:
+            interval = 2.0
         
-        # Get rate limit for site
-        if site_name not in self.site_rate_limits:
-            try:
-                site_config = config_manager.get_scraper_config(site_name)
-                self.site_rate_limits[site_name] = site_config.get('rate_limit', 2.0)
-            except:
-                self.site_rate_limits[site_name] = 2.0
-        
-        rate_limit = self.site_rate_limits[site_name]
-        
-        # Check last request time
-        if site_name in self.site_last_request:
-            time_since_last = current_time - self.site_last_request[site_name]
-            if time_since_last < rate_limit:
-                return False
-        
-        # Update last request time
-        self.site_last_request[site_name] = current_time
-        return True
+        return rate_limiter.wait_time(site_name, interval, ahead=1)
     
-    def _store_product_data(self, product_data: ProductData, site_name: str) -> None:
-        """
-        Store product data to database.
-        
-        Args:
-            product_data: Product data to store
-            site_name: Name of the site
-        """
+    def _flush_results(self) -> None:
+        """Stop the batch writer and write out any buffered results."""
         try:
-            # Use fresh database manager with proper session management
-            from src.data.database import DatabaseManager
-            from src.data.models import Site, Product, ProductURL, PriceHistory
-            from sqlalchemy.exc import IntegrityError
-            from sqlalchemy import func
-            
-            db = DatabaseManager()
-            
-            with db.get_session() as session:
-                # Get or create site
-                site = session.query(Site).filter(func.lower(Site.name) == site_name.lower()).first()
-                if not site:
-                    site = Site(
-                        name=site_name,
-                        base_url=f"https://www.{site_name.lower()}.com",
-                        scraper_type="concurrent",
-                        rate_limit=self.site_rate_limits.get(site_name, 2.0)
-                    )
-                    session.add(site)
-                    session.flush()  # Get the ID
-                
-                # Create or find product
-                product = session.query(Product).filter(
-                    Product.name == product_data.title
-                ).first()
-                
-                if not product:
-                    product = Product(
-                        name=product_data.title,
-                        category=product_data.metadata.get('category', 'electronics'),
-                        brand=product_data.brand or 'None',
-                        model=product_data.model or 'None'
-                    )
-                    session.add(product)
-                    session.flush()  # Get the ID
-                
-                # Create or find product URL - check by URL directly
-                product_url = session.query(ProductURL).filter(
-                    ProductURL.url == product_data.url
-                ).first()
-                
-                if not product_url:
-                    product_url = ProductURL(
-                        product_id=product.id,
-                        site_id=site.id,
-                        url=product_data.url,
-                        selector_config='{}',
-                        is_active=True
-                    )
-                    session.add(product_url)
-                    session.flush()  # Get the ID
-                
-                # Add price record
-                if product_data.price is not None:
-                    price_history = PriceHistory(
-                        product_url_id=product_url.id,
-                        price=float(product_data.price),
-                        currency=product_data.currency or 'USD',
-                        availability=product_data.availability or 'unknown',
-                        scraper_metadata=str(product_data.metadata)
-                    )
-                    session.add(price_history)
-                
-                # Commit all changes
-                session.commit()
-                self.logger.debug(f"Successfully stored product data for: {product_data.title}")
-            
+            self.result_writer.stop()
+            self.logger.info(f"Result writer flushed: {self.result_writer.stats}")
         except Exception as e:
-            self.logger.error(f"Database storage failed: {e}")
-            # Don't re-raise to avoid breaking the scraping process
+            self.logger.error(f"Failed to flush buffered results: {e}")
     
     def wait_completion(self, timeout: Optional[float] = None) -> bool:
         """
@@ -481,15 +595,8 @@ class ConcurrentScrapingManager:
         Returns:
             bool: True if all jobs completed, False if timeout
         """
-        start_time = time.time()
-        
-        while self.active_jobs:
-            if timeout and (time.time() - start_time) > timeout:
-                return False
-            
-            time.sleep(0.1)
-        
-        return True
+        with self.jobs_done:
+            return self.jobs_done.wait_for(lambda: not self.active_jobs, timeout=timeout)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get current session statistics."""
@@ -500,6 +607,13 @@ class ConcurrentScrapingManager:
         stats['jobs_active'] = len(self.active_jobs)
         stats['queue_size'] = self.job_queue.qsize()
         stats['sites_processed'] = list(stats['sites_processed'])
+        stats['scraper_pool'] = self.scraper_pool.get_stats()
+        stats['driver_pool'] = driver_pool.get_stats()
+        stats['streaming'] = stream_stats.get_stats()
+        stats['rate_limiter'] = rate_limiter.get_stats()
+        if self.parse_pool is not None:
+            stats['parse_pool'] = self.parse_pool.get_stats()
+        stats['result_writer'] = dict(self.result_writer.stats)
         
         if stats['jobs_completed'] > 0:
             stats['avg_processing_time'] = stats['total_processing_time'] / stats['jobs_completed']
@@ -44,6 +44,16 @@ class ProductData:
             'metadata': self.metadata
         }
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ProductData':
+        """Create product data from a dictionary produced by to_dict()."""
+        product = cls(data['url'])
+        for key, value in data.items():
+            if key != 'url' and hasattr(product, key):
+                setattr(product, key, value)
+        product.metadata = dict(data.get('metadata') or {})
+        return product
+    
     def is_valid(self) -> bool:
         """Check if product data meets minimum validation requirements."""
         return bool(self.title and len(self.title.strip()) >= 5)
@@ -0,0 +1,194 @@
+"""
+Pool of long-lived Selenium browsers shared by all dynamic scrapers.
+Drivers are started once, lent to one fetch at a time and recycled after a
+configurable number of pages or when the browser crashes.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from ..cli.utils.config import config_manager
+from ..cli.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def create_chrome_driver() -> webdriver.Chrome:
+    """
+    Start a headless Chrome configured from the 'selenium' settings.
+    Images, fonts and stylesheets matching 'selenium.blocked_resources' are
+    never downloaded, and page loads return at DOMContentLoaded by default.
+    The performance log is recorded when any site captures API responses.
+    """
+    settings = config_manager.get_setting('selenium', {}) or {}
+
+    options = Options()
+    if settings.get('headless', True):
+        options.add_argument("--headless=new")
+    if settings.get('window_size'):
+        options.add_argument(f"--window-size={settings['window_size']}")
+    for argument in settings.get('chrome_options', ["--no-sandbox", "--disable-gpu"]):
+        options.add_argument(argument)
+    options.page_load_strategy = settings.get('page_load_strategy', 'eager')
+    if any(site.get('api_capture') for site in config_manager.get_all_sites().values()):
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    blocked = settings.get('blocked_resources', [])
+    if blocked:
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(settings.get('page_load_timeout', 30))
+
+    if blocked:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(blocked)})
+
+    return driver
+
+
+@dataclass
+class PooledDriver:
+    """Data class wrapping a browser with its pool bookkeeping."""
+    driver: Any
+    pages_loaded: int = 0
+    created_at: float = field(default_factory=time.time)
+
+
+class DriverPool:
+    """
+    Bounded pool of warm browsers.
+    At most max_drivers browsers exist at once; callers block in acquire()
+    until one is free, so browser memory stays bounded however many worker
+    threads fetch dynamic pages.
+    """
+
+    def __init__(self, max_drivers: int = None, max_pages_per_driver: int = None,
+                 driver_factory: Callable[[], Any] = None):
+        """
+        Initialize the driver pool.
+
+        Args:
+            max_drivers: Maximum browsers alive at once
+            max_pages_per_driver: Pages a browser may load before it is restarted
+            driver_factory: Callable starting a new browser (defaults to headless Chrome)
+        """
+        self.max_drivers = max_drivers or config_manager.get_setting('selenium.driver_pool.max_drivers', 3)
+        self.max_pages_per_driver = max_pages_per_driver or config_manager.get_setting(
+            'selenium.driver_pool.max_pages_per_driver', 200)
+        self.driver_factory = driver_factory or create_chrome_driver
+
+        self._slots = threading.BoundedSemaphore(self.max_drivers)
+        self._idle: List[PooledDriver] = []
+        self._lock = threading.Lock()
+        self.stats = {
+            'started': 0,
+            'reused': 0,
+            'recycled': 0,
+            'crashed': 0
+        }
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledDriver:
+        """
+        Take a browser out of the pool, starting one if none is idle.
+
+        Args:
+            timeout: Seconds to wait for a free browser (None waits indefinitely)
+
+        Returns:
+            PooledDriver: Browser leased to the caller until release()
+
+        Raises:
+            TimeoutError: If no browser became free in time
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser available within {timeout} seconds")
+
+        with self._lock:
+            pooled = self._idle.pop() if self._idle else None
+            if pooled is not None:
+                self.stats['reused'] += 1
+        if pooled is not None:
+            return pooled
+
+        try:
+            driver = self.driver_factory()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.stats['started'] += 1
+        logger.debug("Started pooled browser")
+        return PooledDriver(driver=driver)
+
+    def release(self, pooled: PooledDriver, crashed: bool = False) -> None:
+        """
+        Return a browser to the pool, or quit it if it crashed or is worn out.
+
+        Args:
+            pooled: Browser previously returned by acquire()
+            crashed: Whether the browser failed during the fetch
+        """
+        pooled.pages_loaded += 1
+        try:
+            if crashed or pooled.pages_loaded >= self.max_pages_per_driver:
+                with self._lock:
+                    self.stats['crashed' if crashed else 'recycled'] += 1
+                reason = "crash" if crashed else f"{pooled.pages_loaded} pages"
+                logger.debug(f"Restarting pooled browser after {reason}")
+                self._quit(pooled)
+                return
+
+            with self._lock:
+                self._idle.append(pooled)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """
+        Context manager lending a driver for one page.
+        Exceptions raised inside the block mark the browser as crashed.
+        """
+        pooled = self.acquire(timeout)
+        try:
+            yield pooled.driver
+        except Exception:
+            self.release(pooled, crashed=True)
+            raise
+        self.release(pooled)
+
+    def close_all(self) -> None:
+        """Quit every idle browser held by the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for pooled in idle:
+            self._quit(pooled)
+
+        if idle:
+            logger.info(f"Closed {len(idle)} pooled browsers")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['idle'] = len(self._idle)
+        return stats
+
+    def _quit(self, pooled: PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting pooled browser: {e}")
+
+
+# Shared by every Selenium scraper in the process
+driver_pool = DriverPool()
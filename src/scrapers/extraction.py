@@ -0,0 +1,155 @@
+"""
+Declarative extraction plans for the static scrapers.
+A plan is compiled once per scraper from the 'extraction' section of a site in
+scrapers.yaml: every field's fallback selectors are resolved together in a single
+document pass and post-processed with precompiled regexes.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from .data_models import ProductData
+from .parsers import HtmlElement, SelectorGroup
+
+FIELD_TYPES = {
+    'text': str,
+    'float': float,
+    'int': int
+}
+
+
+@dataclass
+class FieldRule:
+    """How one field is read from its matched elements."""
+    name: str
+    candidates: Tuple[Tuple[int, Tuple[str, ...]], ...]
+    remove: Optional[Pattern] = None
+    pattern: Optional[Pattern] = None
+    decimal: Optional[str] = None
+    cast: type = str
+
+    def extract(self, matches: List[Optional[HtmlElement]]) -> Any:
+        """
+        Return the value from the first candidate selector that yields one.
+        A candidate is skipped when it matched nothing, lacks the attribute, does
+        not match the pattern or cannot be converted to the field type.
+        """
+        for index, attributes in self.candidates:
+            element = matches[index]
+            if element is None:
+                continue
+
+            if attributes:
+                value = next((element.get(name) for name in attributes if element.get(name)), None)
+                if value is None:
+                    continue
+            else:
+                value = element.get_text().strip()
+
+            if self.remove is not None:
+                value = self.remove.sub('', value)
+
+            if self.pattern is not None:
+                match = self.pattern.search(value)
+                if not match:
+                    continue
+                value = (match.group(1) if self.pattern.groups else match.group()).strip()
+
+            if self.decimal and self.cast is not str:
+                value = value.replace(self.decimal, '.')
+
+            try:
+                return self.cast(value)
+            except ValueError:
+                continue
+
+        return None
+
+
+class ExtractionPlan:
+    """
+    Compiled extraction plan for one site.
+    Field names are ProductData attributes, or 'metadata.<key>' for metadata entries.
+    A selector entry may also be a mapping with its own 'attribute', for fallbacks that
+    read a value from different places (e.g. a meta tag's content, then visible text).
+    """
+
+    def __init__(self, rules: List[FieldRule], selectors: List[str]):
+        self.rules = rules
+        self.group = SelectorGroup(selectors)
+
+    @classmethod
+    def from_config(cls, site_config: Dict[str, Any]) -> 'ExtractionPlan':
+        """
+        Compile a plan from a site configuration.
+        Sites without an 'extraction' section read the text of each entry in
+        'selectors' that names a ProductData attribute.
+
+        Raises:
+            ValueError: If a field has no selectors, an unknown type or an invalid regex
+        """
+        fields = site_config.get('extraction')
+        site_selectors = site_config.get('selectors', {})
+        if fields is None:
+            product_fields = ProductData('').to_dict()
+            fields = {name: {} for name in site_selectors if name in product_fields and name != 'url'}
+
+        rules = []
+        selectors: List[str] = []
+        for name, spec in fields.items():
+            spec = spec or {}
+            candidates = spec.get('selectors', site_selectors.get(name))
+            if isinstance(candidates, str):
+                candidates = [candidates]
+            candidates = [selector for selector in candidates or [] if selector]
+            if not candidates:
+                raise ValueError(f"No selectors configured for extraction field: {name}")
+
+            field_type = spec.get('type', 'text')
+            if field_type not in FIELD_TYPES:
+                raise ValueError(f"Unknown type for extraction field {name}: {field_type}. "
+                                 f"Available: {', '.join(FIELD_TYPES)}")
+
+            indexes = []
+            for candidate in candidates:
+                selector, attributes = candidate, spec.get('attribute', ())
+                if isinstance(candidate, dict):
+                    selector, attributes = candidate.get('selector'), candidate.get('attribute', ())
+                    if not selector:
+                        raise ValueError(f"Selector entry without 'selector' for extraction field: {name}")
+                if isinstance(attributes, str):
+                    attributes = (attributes,)
+                if selector not in selectors:
+                    selectors.append(selector)
+                indexes.append((selectors.index(selector), tuple(attributes)))
+
+            try:
+                rules.append(FieldRule(
+                    name=name,
+                    candidates=tuple(indexes),
+                    remove=re.compile(spec['remove']) if spec.get('remove') else None,
+                    pattern=re.compile(spec['pattern']) if spec.get('pattern') else None,
+                    decimal=spec.get('decimal'),
+                    cast=FIELD_TYPES[field_type]
+                ))
+            except re.error as e:
+                raise ValueError(f"Invalid regex for extraction field {name}: {e}")
+
+        return cls(rules, selectors)
+
+    def extract(self, document: HtmlElement) -> Dict[str, Any]:
+        """Evaluate every field against a parsed document, returning values by field name."""
+        matches = document.select_group(self.group)
+        return {rule.name: rule.extract(matches) for rule in self.rules}
+
+    def apply(self, document: HtmlElement, product_data: ProductData) -> ProductData:
+        """Set the extracted fields on a product; fields that found nothing are left untouched."""
+        for name, value in self.extract(document).items():
+            if value is None:
+                continue
+            if name.startswith('metadata.'):
+                product_data.metadata[name[len('metadata.'):]] = value
+            else:
+                setattr(product_data, name, value)
+        return product_data
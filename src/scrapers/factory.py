@@ -4,8 +4,9 @@ Scraper factory for creating scraper instances.
 
 from typing import Dict, Type
 from .base_scraper import AbstractScraper
-from .static_scraper import AmazonScraper, EbayScraper, ShopGeScraper
+from .static_scraper import AmazonScraper, EbayScraper, ShopGeScraper, ConfiguredScraper
 from .selenium_scraper import AmazonSeleniumScraper, EbaySeleniumScraper, ShopGeSeleniumScraper
+from .tiered_scraper import AmazonTieredScraper, EbayTieredScraper, ShopGeTieredScraper
 from ..cli.utils.config import config_manager
 from ..cli.utils.logger import get_logger
 
@@ -38,6 +39,12 @@ class ScraperFactory:
         cls._scrapers['ebay_selenium'] = EbaySeleniumScraper
         cls._scrapers['shopge_selenium'] = ShopGeSeleniumScraper
         cls._scrapers['shop.ge_selenium'] = ShopGeSeleniumScraper
+
+        # Register tiered scrapers (static first, Selenium for pages that need it)
+        cls._scrapers['amazon_tiered'] = AmazonTieredScraper
+        cls._scrapers['ebay_tiered'] = EbayTieredScraper
+        cls._scrapers['shopge_tiered'] = ShopGeTieredScraper
+        cls._scrapers['shop.ge_tiered'] = ShopGeTieredScraper
         
         cls._initialized = True
         logger.info(f"ScraperFactory initialized with {len(cls._scrapers)} scrapers")
@@ -87,6 +94,8 @@ class ScraperFactory:
         scraper_key = site_name
         if requires_selenium or scraper_type == 'selenium':
             scraper_key = f"{site_name}_selenium"
+        elif scraper_type == 'tiered':
+            scraper_key = f"{site_name}_tiered"
         elif scraper_type == 'static':
             # For static scrapers, use the site name directly
             pass
@@ -95,6 +104,11 @@ class ScraperFactory:
         if scraper_key not in cls._scrapers and site_name in cls._scrapers:
             scraper_key = site_name
         
+        # Sites without a registered class can be scraped from their extraction plan alone
+        if scraper_key not in cls._scrapers and scraper_type in ('static', 'tiered') and 'extraction' in site_config:
+            logger.info(f"Creating scraper: {site_name} -> ConfiguredScraper")
+            return ConfiguredScraper(site_name)
+        
         if scraper_key not in cls._scrapers:
             available_scrapers = list(cls._scrapers.keys())
             raise ValueError(
@@ -0,0 +1,48 @@
+"""
+Content fingerprints for scraped pages.
+A fingerprint hashes the page regions a parser reads, so a page whose price
+region is unchanged can skip parsing and storage entirely.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import List, Optional
+
+# Markup that changes between requests without changing the product. JSON script
+# blocks (JSON-LD, embedded state) are kept: structured data is read from them.
+_NOISE = re.compile(r'<script\b(?![^>]*\btype\s*=\s*["\']?application/(?:ld\+)?json)[^>]*>.*?</script>'
+                    r'|<style\b[^>]*>.*?</style>|<!--.*?-->',
+                    re.IGNORECASE | re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+_BETWEEN_TAGS = re.compile(r'>\s+<')
+
+
+@lru_cache(maxsize=128)
+def _compile_marker(pattern: str) -> re.Pattern:
+    return re.compile(pattern, re.DOTALL)
+
+
+def compute_fingerprint(html_content: str, markers: Optional[List[str]] = None) -> str:
+    """
+    Fingerprint the parts of a page that determine the scraped product.
+
+    Args:
+        html_content: Raw page HTML
+        markers: Regular expressions selecting the page fragments the parser depends on.
+            When none are given or none match, the whole body is used with scripts
+            other than JSON data, styles, comments and whitespace runs removed.
+
+    Returns:
+        str: Hex digest identifying the page content
+    """
+    fragments = []
+    for pattern in markers or []:
+        fragments.extend(match.group(0) for match in _compile_marker(pattern).finditer(html_content))
+
+    if fragments:
+        material = '\x1f'.join(fragments)
+    else:
+        material = _WHITESPACE.sub(' ', _BETWEEN_TAGS.sub('><', _NOISE.sub('', html_content))).strip()
+
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
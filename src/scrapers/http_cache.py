@@ -0,0 +1,173 @@
+"""
+On-disk HTTP response cache for the requests-based scrapers.
+Stores page bodies with their validators (ETag / Last-Modified) and the product
+parsed from them, so fresh hits and 304 revalidations skip both download and parse.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from ..cli.utils.config import config_manager
+from ..cli.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """Data class for one cached page."""
+    url: str
+    body: str
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    product: Optional[Dict[str, Any]] = None
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Whether the entry can be served without contacting the site."""
+        return time.time() - self.fetched_at < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers that revalidate this entry."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    File-backed response cache keyed by URL.
+    Each entry is one JSON file written atomically, so several scrapers
+    (threads or processes) can share the same cache directory.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, enabled: Optional[bool] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            enabled: Whether caching is enabled (defaults to performance.cache_enabled)
+        """
+        self.enabled = config_manager.get_setting('performance.cache_enabled', False) if enabled is None else enabled
+        self.cache_dir = Path(cache_dir or config_manager.get_setting(
+            'performance.cache_directory', 'data/cache/http'))
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'revalidated': 0,
+            'misses': 0,
+            'stores': 0
+        }
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        Load the cached entry for a URL.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            The cached entry, or None if missing or unreadable
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = CacheEntry(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Discarding unreadable cache entry for {url}: {e}")
+            self._remove(path)
+            return None
+
+        # Guard against hash collisions
+        return entry if entry.url == url else None
+
+    def put(self, url: str, body: str, headers: Dict[str, str],
+            product: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Store a downloaded page.
+
+        Args:
+            url: Page URL
+            body: Response body
+            headers: Response headers (validators and Cache-Control are read from them)
+            product: Product parsed from the body; None keeps the product of the previous entry
+        """
+        if not self.enabled or 'no-store' in headers.get('Cache-Control', '').lower():
+            return
+
+        if product is None:
+            previous = self.get(url)
+            product = previous.product if previous is not None else None
+
+        entry = CacheEntry(
+            url=url,
+            body=body,
+            fetched_at=time.time(),
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified'),
+            product=product
+        )
+        self._write(entry)
+        self.record('stores')
+
+    def touch(self, entry: CacheEntry, headers: Dict[str, str]) -> None:
+        """
+        Mark an entry as fresh again after a 304 Not Modified response.
+
+        Args:
+            entry: Entry that was revalidated
+            headers: Headers of the 304 response, which may carry updated validators
+        """
+        entry.fetched_at = time.time()
+        entry.etag = headers.get('ETag', entry.etag)
+        entry.last_modified = headers.get('Last-Modified', entry.last_modified)
+        self._write(entry)
+
+    def record(self, outcome: str) -> None:
+        """Count a cache outcome (hits, revalidated, misses, stores)."""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _write(self, entry: CacheEntry) -> None:
+        path = self._path(entry.url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(asdict(entry), f, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry for {entry.url}: {e}")
+            self._remove(tmp_path)
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,149 @@
+"""
+Per-site ready-time job scheduler for the concurrent scraping manager.
+Replaces polling and re-queueing with a heap of site ready times and condition-variable wakeups.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+class SiteReadyScheduler:
+    """
+    Thread-safe job scheduler keyed by site.
+    Each site has its own queue ordered by (priority, insertion order), and a heap of
+    (next_allowed_time, site) decides which site may dispatch next. A blocked site
+    never holds back jobs for other sites, and waiting consumers sleep until the
+    earliest ready time or a new job arrives.
+
+    Jobs only need `site_name` and `priority` attributes.
+    """
+
+    def __init__(self, rate_limit_for: Callable[[str], float]):
+        """
+        Initialize the scheduler.
+
+        Args:
+            rate_limit_for: Callable returning the minimum seconds between jobs for a site
+        """
+        self._rate_limit_for = rate_limit_for
+        self._condition = threading.Condition()
+        self._counter = itertools.count()
+
+        self._site_queues: Dict[str, List[Tuple[int, int, Any]]] = {}
+        self._ready_heap: List[Tuple[float, int, str]] = []
+        self._scheduled_sites: Set[str] = set()
+        self._next_allowed: Dict[str, float] = {}
+
+        self._size = 0
+        self._closed = False
+
+    def put(self, job: Any, priority: Optional[int] = None) -> None:
+        """
+        Add a job to its site's queue.
+
+        Args:
+            job: Job to schedule
+            priority: Priority override (lower = higher priority), defaults to job.priority
+        """
+        if priority is None:
+            priority = job.priority
+
+        with self._condition:
+            site_queue = self._site_queues.setdefault(job.site_name, [])
+            heapq.heappush(site_queue, (priority, next(self._counter), job))
+            self._size += 1
+
+            if job.site_name not in self._scheduled_sites:
+                self._schedule_site(job.site_name)
+                self._condition.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Wait for the next job whose site is allowed to make a request.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait until a job or close()
+
+        Returns:
+            The next job, or None on timeout or when the scheduler is closed
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        with self._condition:
+            while not self._closed:
+                now = time.monotonic()
+                wait_time = None
+
+                if self._ready_heap:
+                    ready_at, _, site_name = self._ready_heap[0]
+                    if ready_at <= now:
+                        heapq.heappop(self._ready_heap)
+                        return self._pop_site_job(site_name, now)
+                    wait_time = ready_at - now
+
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return None
+                    wait_time = remaining if wait_time is None else min(wait_time, remaining)
+
+                self._condition.wait(wait_time)
+
+            return None
+
+    def drain(self) -> List[Any]:
+        """
+        Remove and return all queued jobs, ignoring site ready times.
+        Used by callers that enforce rate limits themselves (e.g. the async engine).
+        """
+        with self._condition:
+            jobs = []
+            for site_queue in self._site_queues.values():
+                while site_queue:
+                    jobs.append(heapq.heappop(site_queue)[2])
+
+            self._site_queues.clear()
+            self._ready_heap.clear()
+            self._scheduled_sites.clear()
+            self._size = 0
+            return jobs
+
+    def close(self) -> None:
+        """Wake all waiting consumers and make get() return None."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def open(self) -> None:
+        """Re-open a closed scheduler so consumers can wait for jobs again."""
+        with self._condition:
+            self._closed = False
+
+    def qsize(self) -> int:
+        """Get the number of queued jobs."""
+        with self._condition:
+            return self._size
+
+    def _schedule_site(self, site_name: str) -> None:
+        """Push a site onto the ready heap at its next allowed time (caller holds the lock)."""
+        ready_at = self._next_allowed.get(site_name, 0.0)
+        heapq.heappush(self._ready_heap, (ready_at, next(self._counter), site_name))
+        self._scheduled_sites.add(site_name)
+
+    def _pop_site_job(self, site_name: str, now: float) -> Any:
+        """Take the next job for a ready site and reschedule the site (caller holds the lock)."""
+        site_queue = self._site_queues[site_name]
+        _, _, job = heapq.heappop(site_queue)
+        self._size -= 1
+
+        self._next_allowed[site_name] = now + self._rate_limit_for(site_name)
+
+        if site_queue:
+            self._schedule_site(site_name)
+        else:
+            self._scheduled_sites.discard(site_name)
+
+        return job
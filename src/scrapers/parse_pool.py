@@ -0,0 +1,132 @@
+"""
+Process pool for the CPU-bound half of a scrape.
+In process mode the concurrent manager's worker threads only download pages;
+parse_page and DataProcessor.process run in a pool of processes sized to the
+CPU, so parsing scales past the GIL. The threads and the pool are joined by a
+bounded number of pending parses: when every slot is taken, downloading
+threads wait instead of piling up pages in memory.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from ..cli.utils.config import config_manager
+from ..cli.utils.logger import get_logger
+from .data_models import ProductData
+
+# Scrapers and processor of the current pool process, created on first use
+_worker_scrapers: Dict[str, Any] = {}
+_worker_processor = None
+
+
+def parse_in_worker(site_name: str, html_content: str, url: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Parse and process one page inside a pool process.
+
+    Returns:
+        (product dict, validation error). The product is None when the page
+        could not be parsed; a product failing validation comes back with the error.
+    """
+    global _worker_processor
+    from .factory import ScraperFactory
+    from ..data.processors import DataProcessor, DataValidationError
+
+    scraper = _worker_scrapers.get(site_name)
+    if scraper is None:
+        scraper = _worker_scrapers[site_name] = ScraperFactory.create_scraper(site_name)
+    if _worker_processor is None:
+        _worker_processor = DataProcessor()
+
+    product_data = scraper.extract_product(html_content, url)
+    if product_data is None:
+        return None, None
+    try:
+        return _worker_processor.process(product_data).to_dict(), None
+    except DataValidationError as e:
+        return product_data.to_dict(), str(e)
+
+
+class ParsePool:
+    """
+    Pool of parser processes shared by the manager's downloading threads.
+    extract() blocks while max_pending pages are already waiting for or being
+    parsed, which is the backpressure between the two stages.
+    """
+
+    def __init__(self, max_workers: int = None, max_pending: int = None):
+        """
+        Initialize the parse pool.
+
+        Args:
+            max_workers: Parser processes (defaults to performance.cpu_cores, then the CPU count)
+            max_pending: Pages that may be queued for or in parsing at once
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.max_workers = max_workers or config_manager.get_setting('performance.cpu_cores') or os.cpu_count() or 1
+        self.max_pending = (max_pending or config_manager.get_setting('performance.parse_pool.max_pending')
+                            or self.max_workers * 2)
+
+        # Pool processes are started while downloading threads run, which fork() does not survive safely
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self.stats = {
+            'parsed': 0,
+            'failed': 0,
+            'invalid': 0,
+            'parse_seconds': 0.0,
+            'backpressure_seconds': 0.0
+        }
+        self.logger.info(f"Parse pool started: {self.max_workers} processes, {self.max_pending} pending pages")
+
+    def extract(self, site_name: str, html_content: str, url: str) -> Optional[ProductData]:
+        """
+        Parse and process a page in the pool, waiting for a free slot first.
+
+        Returns:
+            The processed product with metadata['processed'] set, or None if the
+            page could not be parsed. A product failing validation carries the
+            error in metadata['validation_error'].
+        """
+        waited = time.time()
+        self._slots.acquire()
+        started = time.time()
+        try:
+            product_dict, validation_error = self._executor.submit(
+                parse_in_worker, site_name, html_content, url).result()
+        finally:
+            self._slots.release()
+
+        with self._lock:
+            self.stats['backpressure_seconds'] += started - waited
+            self.stats['parse_seconds'] += time.time() - started
+            if product_dict is None:
+                self.stats['failed'] += 1
+            else:
+                self.stats['parsed'] += 1
+                self.stats['invalid'] += validation_error is not None
+
+        if product_dict is None:
+            return None
+        product_data = ProductData.from_dict(product_dict)
+        product_data.metadata['processed'] = True
+        if validation_error is not None:
+            product_data.metadata['validation_error'] = validation_error
+        return product_data
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size and parse totals."""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['processes'] = self.max_workers
+        stats['max_pending'] = self.max_pending
+        return stats
+
+    def close(self) -> None:
+        """Stop the parser processes."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,360 @@
+"""
+HTML parser backends for the static scrapers.
+Every backend exposes the same small element API (select_one, select, get_text,
+get, find_next), so parse_page implementations work unchanged whichever backend
+a site is configured with in scrapers.yaml.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup
+
+from ..cli.utils.logger import get_logger
+
+try:
+    import lxml.html
+    from lxml import etree
+    from lxml.cssselect import CSSSelector
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from cssselect import parse as parse_css
+    from cssselect.parser import Attrib, Class, Element, Hash
+    CSSSELECT_AVAILABLE = True
+except ImportError:
+    CSSSELECT_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+
+class HtmlElement(ABC):
+    """Common element API shared by all parser backends."""
+
+    def select_one(self, selector: str) -> Optional['HtmlElement']:
+        """Return the first descendant matching a CSS selector, or None."""
+        matches = self.select(selector)
+        return matches[0] if matches else None
+
+    @abstractmethod
+    def select(self, selector: str) -> List['HtmlElement']:
+        """Return all descendants matching a CSS selector in document order."""
+        pass
+
+    @abstractmethod
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        """
+        Return the text of the element, ignoring scripts, styles and comments.
+
+        Args:
+            separator: String placed between text fragments
+            strip: Strip each fragment and drop empty ones (BeautifulSoup semantics)
+        """
+        pass
+
+    @abstractmethod
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Return an attribute value."""
+        pass
+
+    @abstractmethod
+    def find_next(self, tag: str) -> Optional['HtmlElement']:
+        """Return the first element with the given tag name after this one in document order."""
+        pass
+
+    def select_group(self, group: 'SelectorGroup') -> List[Optional['HtmlElement']]:
+        """Return the first match of each selector in a group (select_one per selector)."""
+        return [self.select_one(selector) for selector in group.selectors]
+
+    @staticmethod
+    def _join(fragments, separator: str, strip: bool) -> str:
+        if strip:
+            fragments = [fragment.strip() for fragment in fragments]
+            fragments = [fragment for fragment in fragments if fragment]
+        return separator.join(fragments)
+
+
+class SoupElement(HtmlElement):
+    """Element backed by a BeautifulSoup tag (html.parser backend)."""
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def select(self, selector: str) -> List[HtmlElement]:
+        if not selector:
+            return []
+        return [SoupElement(tag) for tag in self.tag.select(selector)]
+
+    def select_one(self, selector: str) -> Optional[HtmlElement]:
+        if not selector:
+            return None
+        tag = self.tag.select_one(selector)
+        return SoupElement(tag) if tag is not None else None
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        return self.tag.get_text(separator, strip=strip)
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.tag.get(name, default)
+        # BeautifulSoup returns multi-valued attributes such as class as lists
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def find_next(self, tag: str) -> Optional[HtmlElement]:
+        found = self.tag.find_next(tag)
+        return SoupElement(found) if found is not None else None
+
+    def select_group(self, group: 'SelectorGroup') -> List[Optional[HtmlElement]]:
+        first = [self.select_one(group.selectors[index]) if index in group.complex else None
+                 for index in range(len(group.selectors))]
+        # Like select(), only descendants are candidates, never the tag itself
+        nodes = ((tag, tag.name, tag.attrs) for tag in self.tag.find_all(True)) if group.simple else ()
+        for index, tag in group.first_matches(nodes).items():
+            first[index] = SoupElement(tag)
+        return first
+
+
+if LXML_AVAILABLE:
+    # Text nodes excluding script and style content, matching BeautifulSoup's get_text()
+    _TEXT_NODES = etree.XPath('.//text()[not(parent::script or parent::style or parent::template)]')
+
+    @lru_cache(maxsize=256)
+    def _css(selector: str) -> 'CSSSelector':
+        return CSSSelector(selector, translator='html')
+
+
+class LxmlElement(HtmlElement):
+    """Element backed by an lxml tree with cssselect-compiled selectors."""
+
+    def __init__(self, element):
+        self.element = element
+
+    def select(self, selector: str) -> List[HtmlElement]:
+        if not selector:
+            return []
+        return [LxmlElement(element) for element in _css(selector)(self.element)]
+
+    def select_one(self, selector: str) -> Optional[HtmlElement]:
+        if not selector:
+            return None
+        matches = _css(selector)(self.element)
+        return LxmlElement(matches[0]) if matches else None
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        return self._join([str(text) for text in _TEXT_NODES(self.element)], separator, strip)
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.element.get(name, default)
+
+    def find_next(self, tag: str) -> Optional[HtmlElement]:
+        found = self.element.xpath(f'following::{tag}[1]')
+        return LxmlElement(found[0]) if found else None
+
+    def select_group(self, group: 'SelectorGroup') -> List[Optional[HtmlElement]]:
+        first = [self.select_one(group.selectors[index]) if index in group.complex else None
+                 for index in range(len(group.selectors))]
+        nodes = ((element, element.tag, element.attrib)
+                 for element in self.element.iter(etree.Element)) if group.simple else ()
+        for index, element in group.first_matches(nodes).items():
+            first[index] = LxmlElement(element)
+        return first
+
+
+@dataclass
+class _SimpleSelector:
+    """A compound selector of tag, id, classes and attribute tests, checked without XPath."""
+    tag: Optional[str] = None
+    id: Optional[str] = None
+    classes: Tuple[str, ...] = ()
+    attributes: Tuple[Tuple[str, Optional[str]], ...] = ()
+
+    def matches(self, tag: str, element_id: Optional[str], class_names: Sequence[str], attrib) -> bool:
+        if self.tag is not None and tag != self.tag:
+            return False
+        if self.id is not None and element_id != self.id:
+            return False
+        for class_name in self.classes:
+            if class_name not in class_names:
+                return False
+        for name, value in self.attributes:
+            actual = attrib.get(name)
+            if isinstance(actual, list):
+                actual = ' '.join(actual)
+            if actual is None or (value is not None and actual != value):
+                return False
+        return True
+
+
+def _simplify(tree) -> Optional[_SimpleSelector]:
+    """Decompose a parsed compound selector, or return None if it needs full XPath evaluation."""
+    simple = _SimpleSelector()
+    classes, attributes = [], []
+    while not isinstance(tree, Element):
+        if isinstance(tree, Hash) and simple.id is None:
+            simple.id = tree.id
+        elif isinstance(tree, Class):
+            classes.append(tree.class_name)
+        elif (isinstance(tree, Attrib) and tree.namespace is None and getattr(tree, 'flag', None) is None
+              and tree.operator in ('exists', '=')):
+            attributes.append((tree.attrib.lower(), tree.value.value if tree.operator == '=' else None))
+        else:
+            return None
+        tree = tree.selector
+    if tree.namespace is not None:
+        return None
+    simple.tag = tree.element.lower() if tree.element and tree.element != '*' else None
+    simple.classes = tuple(classes)
+    simple.attributes = tuple(attributes)
+    return simple
+
+
+def simple_selectors(selector: str) -> Optional[List[_SimpleSelector]]:
+    """
+    Decompose a CSS selector (or comma-separated group) into simple compound selectors.
+
+    Returns:
+        One _SimpleSelector per alternative, or None if any alternative needs full
+        XPath evaluation or cssselect is not installed
+    """
+    if not CSSSELECT_AVAILABLE:
+        return None
+    alternatives = [_simplify(parsed.parsed_tree) if parsed.pseudo_element is None else None
+                    for parsed in parse_css(selector)]
+    return alternatives if all(alternatives) else None
+
+
+class SelectorGroup:
+    """
+    A fixed set of CSS selectors resolved together against one document.
+    Selectors made of tag, id, class and attribute tests are answered in a single
+    walk over the tree through id/class/tag/attribute indexes; selectors with
+    combinators or pseudo-classes fall back to select_one.
+    """
+
+    def __init__(self, selectors: Sequence[str]):
+        self.selectors = tuple(selectors)
+        self.simple: Dict[int, List[_SimpleSelector]] = {}
+        self.complex: List[int] = []
+        # Alternatives bucketed by the cheapest key an element must carry to match them
+        self.by_id: Dict[str, list] = {}
+        self.by_class: Dict[str, list] = {}
+        self.by_tag: Dict[str, list] = {}
+        self.by_attribute: Dict[str, list] = {}
+        self.unkeyed: list = []
+        for index, selector in enumerate(self.selectors):
+            alternatives = simple_selectors(selector)
+            if alternatives is None:
+                self.complex.append(index)
+                continue
+
+            self.simple[index] = alternatives
+            for alternative in alternatives:
+                entry = (index, alternative)
+                if alternative.id is not None:
+                    self.by_id.setdefault(alternative.id, []).append(entry)
+                elif alternative.classes:
+                    self.by_class.setdefault(alternative.classes[0], []).append(entry)
+                elif alternative.tag is not None:
+                    self.by_tag.setdefault(alternative.tag, []).append(entry)
+                elif alternative.attributes:
+                    self.by_attribute.setdefault(alternative.attributes[0][0], []).append(entry)
+                else:
+                    self.unkeyed.append(entry)
+
+    def first_matches(self, nodes) -> Dict[int, object]:
+        """
+        Find the first node each simple selector accepts, in one pass.
+
+        Args:
+            nodes: (node, tag name, attribute mapping) tuples in document order
+
+        Returns:
+            dict: Matched node by selector index; unmatched selectors are absent
+        """
+        first = {}
+        pending = set(self.simple)
+        by_id, by_class, by_tag, by_attribute = self.by_id, self.by_class, self.by_tag, self.by_attribute
+        for node, tag, attrib in nodes:
+            element_id = attrib.get('id')
+            class_names = attrib.get('class') or ()
+            if isinstance(class_names, str):
+                class_names = class_names.split()
+            entries = []
+            if element_id is not None and element_id in by_id:
+                entries.extend(by_id[element_id])
+            for class_name in class_names:
+                if class_name in by_class:
+                    entries.extend(by_class[class_name])
+            if tag in by_tag:
+                entries.extend(by_tag[tag])
+            if by_attribute:
+                for name in attrib:
+                    if name in by_attribute:
+                        entries.extend(by_attribute[name])
+            entries.extend(self.unkeyed)
+
+            for index, alternative in entries:
+                if index in pending and alternative.matches(tag, element_id, class_names, attrib):
+                    first[index] = node
+                    pending.discard(index)
+                    if not pending:
+                        return first
+        return first
+
+
+def _parse_soup(html_content: str) -> HtmlElement:
+    return SoupElement(BeautifulSoup(html_content, 'html.parser'))
+
+
+def _parse_lxml(html_content: str) -> HtmlElement:
+    if not html_content or not html_content.strip():
+        return LxmlElement(lxml.html.document_fromstring('<html></html>'))
+    try:
+        return LxmlElement(lxml.html.document_fromstring(html_content))
+    except ValueError:
+        # Unicode input carrying an XML encoding declaration must be passed as bytes
+        return LxmlElement(lxml.html.document_fromstring(html_content.encode('utf-8')))
+
+
+PARSER_BACKENDS = {
+    'html.parser': _parse_soup,
+    'lxml': _parse_lxml
+}
+
+DEFAULT_BACKEND = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+
+def resolve_backend(name: Optional[str]) -> str:
+    """
+    Validate a configured backend name, falling back to BeautifulSoup if lxml is missing.
+
+    Args:
+        name: Backend name from scrapers.yaml, or None for the default
+
+    Returns:
+        str: Usable backend name
+    """
+    name = name or DEFAULT_BACKEND
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name}. Available: {', '.join(PARSER_BACKENDS)}")
+    if name == 'lxml' and not LXML_AVAILABLE:
+        logger.warning("lxml/cssselect not installed, falling back to html.parser. Install with: pip install lxml cssselect")
+        return 'html.parser'
+    return name
+
+
+def parse_html(html_content: str, backend: Optional[str] = None) -> HtmlElement:
+    """
+    Parse a page into a document element.
+
+    Args:
+        html_content: Raw page HTML
+        backend: Parser backend name ('lxml' or 'html.parser')
+
+    Returns:
+        HtmlElement: Root element of the parsed document
+    """
+    return PARSER_BACKENDS[resolve_backend(backend)](html_content)
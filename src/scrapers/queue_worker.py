@@ -0,0 +1,132 @@
+"""
+Long-lived worker node for multi-machine scraping.
+Any number of `scrape worker` processes, on one machine or many, share the
+durable job queue in one database. Each worker leases small batches from the
+oldest open session, tops its manager up whenever it runs low, and renews its
+leases through the manager's checkpoints; leases of a worker that dies expire
+and are taken over by the others. Requests to a site are spaced on a timeline
+in the database, so a site's rate budget holds across all nodes.
+"""
+
+import os
+import socket
+import threading
+import uuid
+from typing import Any, Dict, Optional
+
+from ..cli.utils.config import config_manager
+from ..cli.utils.logger import get_logger
+from ..data.job_queue import JobQueue
+from ..data.rate_budget import rate_budget_store
+from .concurrent_manager import ConcurrentScrapingManager
+from .rate_limiter import rate_limiter
+
+
+class QueueWorker:
+    """
+    Worker pulling jobs from the shared queue until stopped or, with
+    exit_when_idle, until no session has claimable jobs left.
+    """
+
+    def __init__(self, max_workers: int = 3, batch_size: int = None, session_id: str = None,
+                 use_multiprocessing: bool = False, exit_when_idle: bool = False,
+                 poll_interval: float = None, global_rate_budget: bool = None):
+        """
+        Initialize the worker.
+
+        Args:
+            max_workers: Concurrent scraping threads
+            batch_size: Jobs leased at a time; the worker leases more once fewer are left
+            session_id: Only serve this session (defaults to every open session, oldest first)
+            use_multiprocessing: Parse pages in a process pool
+            exit_when_idle: Stop once nothing is claimable instead of polling for new sessions
+            poll_interval: Seconds between checks for new work
+            global_rate_budget: Space requests on the shared per-site timelines
+                (defaults to scraping.job_queue.global_rate_budget)
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.max_workers = max_workers
+        self.batch_size = batch_size or config_manager.get_setting('scraping.job_queue.batch_size', 20)
+        self.session_id = session_id
+        self.use_multiprocessing = use_multiprocessing
+        self.exit_when_idle = exit_when_idle
+        self.poll_interval = poll_interval or config_manager.get_setting('scraping.job_queue.poll_interval', 5.0)
+        if global_rate_budget is None:
+            global_rate_budget = config_manager.get_setting('scraping.job_queue.global_rate_budget', True)
+        self.global_rate_budget = global_rate_budget
+
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stop = threading.Event()
+        self.stats = {
+            'sessions_served': 0,
+            'jobs_claimed': 0,
+            'jobs_completed': 0,
+            'jobs_failed': 0,
+            'jobs_released': 0
+        }
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Serve sessions until stopped.
+
+        Returns:
+            The worker's totals
+        """
+        if self.global_rate_budget:
+            rate_limiter.use_global_budget(rate_budget_store)
+        self.logger.info(f"Worker {self.owner} started with {self.max_workers} threads, "
+                         f"batches of {self.batch_size}")
+        try:
+            while not self._stop.is_set():
+                queue = self._next_queue()
+                if queue is None:
+                    if self.exit_when_idle:
+                        break
+                    self._stop.wait(self.poll_interval)
+                    continue
+                self._serve(queue)
+        finally:
+            if self.global_rate_budget:
+                rate_limiter.use_global_budget(None)
+        self.logger.info(f"Worker {self.owner} stopped: {self.stats}")
+        return dict(self.stats)
+
+    def stop(self) -> None:
+        """Ask the worker to finish its jobs in progress, return the rest and exit."""
+        self._stop.set()
+
+    def _next_queue(self) -> Optional[JobQueue]:
+        """Queue of the oldest session with claimable jobs, if any."""
+        if self.session_id:
+            sessions = [self.session_id] if self.session_id in JobQueue.open_sessions() else []
+        else:
+            sessions = JobQueue.open_sessions()
+        if not sessions:
+            return None
+        return JobQueue(sessions[0], owner=self.owner)
+
+    def _serve(self, queue: JobQueue) -> None:
+        """Run a session's jobs in batches until none are claimable and all claimed ones are done."""
+        self.logger.info(f"Serving session {queue.session_id}")
+        manager = ConcurrentScrapingManager(max_workers=self.max_workers,
+                                            use_multiprocessing=self.use_multiprocessing,
+                                            job_queue=queue)
+        manager.start_workers()
+        try:
+            while not self._stop.is_set():
+                if len(manager.active_jobs) < self.batch_size:
+                    claimed = manager.load_queued_jobs(self.batch_size)
+                    self.stats['jobs_claimed'] += claimed
+                    if not claimed and not manager.active_jobs:
+                        break
+                manager.wait_completion(timeout=min(1.0, self.poll_interval))
+        except KeyboardInterrupt:
+            self.stop()
+        finally:
+            # Jobs claimed but not started go back to the other workers
+            manager.stop_workers()
+            stats = manager.get_statistics()
+            self.stats['jobs_released'] += stats.get('jobs_released', 0)
+            self.stats['sessions_served'] += 1
+            self.stats['jobs_completed'] += stats['jobs_completed']
+            self.stats['jobs_failed'] += stats['jobs_failed']
@@ -0,0 +1,316 @@
+"""
+Per-site rate limiting shared by every fetch path.
+Each site has a token bucket (its interval and a burst allowance), a cap on
+requests in flight, and an interval adjusted AIMD-style: 429/503 responses and
+slow responses multiply it, successful responses shrink it additively back
+towards the configured floor. State is kept per process under one lock, so
+every thread and the async engine see the same budget. Worker processes and
+nodes add a global budget (use_global_budget), which spaces requests on a
+per-site timeline in the database in place of the local token bucket.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..cli.utils.config import config_manager
+from ..cli.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Fields of a site's state
+_FIELDS = ('interval', 'tokens', 'updated', 'in_flight', 'blocked_until', 'requests', 'throttled', 'slow')
+_INTERVAL, _TOKENS, _UPDATED, _IN_FLIGHT, _BLOCKED_UNTIL, _REQUESTS, _THROTTLED, _SLOW = range(len(_FIELDS))
+
+# Poll interval while a site is at its concurrency cap
+_CAP_POLL = 0.02
+
+THROTTLE_STATUSES = (429, 503)
+
+
+@dataclass
+class SiteLimits:
+    """Rate limits of one site."""
+    interval: float  # starting seconds between requests
+    burst: int = 1  # requests that may go out back to back after an idle period
+    max_concurrency: int = 4
+    min_interval: float = None  # floor the interval recovers to (defaults to the starting interval)
+    max_interval: float = 60.0
+    backoff_factor: float = 2.0  # interval multiplier on 429/503
+    latency_target: Optional[float] = 10.0  # seconds; slower responses back off
+    latency_backoff: float = 1.25
+    increase_step: float = 0.05  # requests per second added to the rate per success
+
+    def __post_init__(self):
+        if self.min_interval is None:
+            self.min_interval = self.interval
+        self.burst = max(1, int(self.burst))
+        self.max_concurrency = max(1, int(self.max_concurrency))
+
+    @classmethod
+    def for_site(cls, site_name: str, interval: float) -> 'SiteLimits':
+        """
+        Limits of a site: 'scraping.rate_limiter' defaults overridden by the
+        site's own 'rate_limiter' section.
+
+        Args:
+            site_name: Name of the site
+            interval: Starting interval (the site's rate_limit)
+        """
+        spec = dict(config_manager.get_setting('scraping.rate_limiter', {}) or {})
+        try:
+            spec.update(config_manager.get_scraper_config(site_name).get('rate_limiter') or {})
+        except ValueError:
+            pass
+        known = set(cls.__dataclass_fields__) - {'interval'}
+        return cls(interval=interval, **{key: value for key, value in spec.items() if key in known})
+
+
+@dataclass
+class RatePermit:
+    """A granted request slot; hand it back to release() with the response outcome."""
+    site_name: str
+    started_at: float
+    limited: bool = True
+    released: bool = False
+
+
+def _retry_after(value: Any) -> Optional[float]:
+    """Seconds from a Retry-After header given in seconds (HTTP dates are ignored)."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitService:
+    """
+    Token buckets, concurrency caps and AIMD intervals keyed by site.
+    acquire() blocks until the site has a token and a free concurrency slot;
+    release() returns the slot and adjusts the interval from the response.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sites: Dict[str, List[float]] = {}
+        self._limits: Dict[str, SiteLimits] = {}
+        self.budget = None
+
+    def use_global_budget(self, budget) -> None:
+        """
+        Space requests on a timeline shared with other nodes.
+
+        Args:
+            budget: Store with reserve(), pause() and wait_time() per site
+                (a RateBudgetStore), or None to go back to local token buckets
+        """
+        self.budget = budget
+
+    def acquire(self, site_name: str, interval: float) -> RatePermit:
+        """
+        Wait for a request slot to a site.
+
+        Args:
+            site_name: Name of the site
+            interval: The site's configured seconds between requests; 0 disables limiting
+
+        Returns:
+            Permit to release once the response (or failure) is known
+        """
+        while True:
+            permit, wait = self._try_acquire(site_name, interval)
+            if permit is not None:
+                break
+            logger.debug(f"Rate limiting {site_name}: waiting {wait:.2f}s")
+            time.sleep(wait)
+
+        wait = self._reserve_global(permit)
+        if wait > 0:
+            time.sleep(wait)
+            permit.started_at = time.time()
+        return permit
+
+    async def acquire_async(self, site_name: str, interval: float) -> RatePermit:
+        """Counterpart of acquire() that waits on the event loop."""
+        while True:
+            permit, wait = self._try_acquire(site_name, interval)
+            if permit is not None:
+                break
+            await asyncio.sleep(wait)
+
+        if self.budget is not None and permit.limited:
+            wait = await asyncio.to_thread(self._reserve_global, permit)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                permit.started_at = time.time()
+        return permit
+
+    def wait_time(self, site_name: str, interval: float, ahead: int = 0) -> float:
+        """
+        Seconds until a request to a site could be sent, without taking a slot.
+
+        Args:
+            site_name: Name of the site
+            interval: The site's configured seconds between requests
+            ahead: Requests already on their way to acquire() that go first
+        """
+        if interval <= 0:
+            return 0.0
+        with self._lock:
+            state, limits, now = self._refill(site_name, interval)
+            if state[_BLOCKED_UNTIL] > now:
+                return state[_BLOCKED_UNTIL] - now
+            current = state[_INTERVAL]
+            missing = 1 + ahead - state[_TOKENS]
+        if self.budget is None:
+            return max(0.0, missing * current)
+        try:
+            return self.budget.wait_time(site_name, current, limits.burst, ahead=ahead)
+        except Exception as e:
+            logger.warning(f"Global rate budget unavailable for {site_name}: {e}")
+            return current
+
+    async def ready_async(self, site_name: str, interval: float) -> None:
+        """Wait on the event loop until a request to a site could be sent."""
+        while True:
+            wait = self.wait_time(site_name, interval)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, permit: RatePermit, status_code: Optional[int] = None,
+                retry_after: Any = None) -> None:
+        """
+        Return a request slot and adapt the site's interval.
+        Releasing a permit again is a no-op, so callers may report the response
+        as soon as it arrives and still release unconditionally in a finally.
+
+        Args:
+            permit: Permit from acquire()
+            status_code: HTTP status of the response, None if no response arrived
+            retry_after: Retry-After header of the response, if any
+        """
+        if not permit.limited or permit.released:
+            return
+        permit.released = True
+        paused_until = None
+        with self._lock:
+            state, limits, now = self._refill(permit.site_name, limits_only=True)
+            state[_IN_FLIGHT] = max(0.0, state[_IN_FLIGHT] - 1)
+            interval = state[_INTERVAL]
+
+            if status_code in THROTTLE_STATUSES:
+                interval = min(limits.max_interval, interval * limits.backoff_factor)
+                pause = max(interval, _retry_after(retry_after) or 0.0)
+                state[_TOKENS] = 0.0
+                state[_BLOCKED_UNTIL] = max(state[_BLOCKED_UNTIL], now + pause)
+                state[_THROTTLED] += 1
+                paused_until = now + pause
+                logger.warning(f"{permit.site_name} answered {status_code}; "
+                               f"interval now {interval:.2f}s, pausing {pause:.2f}s")
+            elif limits.latency_target and now - permit.started_at > limits.latency_target:
+                interval = min(limits.max_interval, interval * limits.latency_backoff)
+                state[_SLOW] += 1
+            elif status_code is not None and status_code < 400:
+                interval = max(limits.min_interval, 1.0 / (1.0 / interval + limits.increase_step))
+            state[_INTERVAL] = interval
+
+        # Throttling seen by one node pauses the site for all of them
+        if paused_until is not None and self.budget is not None:
+            try:
+                self.budget.pause(permit.site_name, paused_until)
+            except Exception as e:
+                logger.warning(f"Could not pause {permit.site_name} globally: {e}")
+
+    @contextmanager
+    def lease(self, site_name: str, interval: float) -> Iterator[RatePermit]:
+        """Hold a request slot for the duration of a block, for fetches without an HTTP status."""
+        permit = self.acquire(site_name, interval)
+        try:
+            yield permit
+        finally:
+            self.release(permit)
+
+    def current_interval(self, site_name: str, interval: float) -> float:
+        """Current seconds between requests to a site after AIMD adjustment."""
+        if interval <= 0:
+            return 0.0
+        with self._lock:
+            state, _, _ = self._refill(site_name, interval)
+            return state[_INTERVAL]
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """State of every site seen, by site name."""
+        with self._lock:
+            return {name: {
+                'interval': round(state[_INTERVAL], 3),
+                'tokens': round(state[_TOKENS], 3),
+                'in_flight': int(state[_IN_FLIGHT]),
+                'requests': int(state[_REQUESTS]),
+                'throttled': int(state[_THROTTLED]),
+                'slow': int(state[_SLOW])
+            } for name, state in self._sites.items()}
+
+    def _try_acquire(self, site_name: str, interval: float) -> Tuple[Optional[RatePermit], float]:
+        """Take a slot if one is free, else return how long to wait before trying again."""
+        if interval <= 0:
+            return RatePermit(site_name, time.time(), limited=False), 0.0
+        with self._lock:
+            state, limits, now = self._refill(site_name, interval)
+            if state[_BLOCKED_UNTIL] > now:
+                return None, state[_BLOCKED_UNTIL] - now
+            if state[_IN_FLIGHT] >= limits.max_concurrency:
+                return None, _CAP_POLL
+            # With a global budget the shared timeline takes the place of the local bucket
+            if self.budget is None:
+                if state[_TOKENS] < 1:
+                    return None, (1 - state[_TOKENS]) * state[_INTERVAL]
+                state[_TOKENS] -= 1
+            state[_IN_FLIGHT] += 1
+            state[_REQUESTS] += 1
+        return RatePermit(site_name, now), 0.0
+
+    def _reserve_global(self, permit: RatePermit) -> float:
+        """Reserve the permit's slot on the global timeline; returns seconds to wait for it."""
+        if self.budget is None or not permit.limited:
+            return 0.0
+        with self._lock:
+            state, limits, _ = self._refill(permit.site_name, limits_only=True)
+            interval = state[_INTERVAL]
+        try:
+            return self.budget.reserve(permit.site_name, interval, limits.burst)
+        except Exception as e:
+            # Without the shared timeline, fall back to this node's own spacing
+            logger.warning(f"Global rate budget unavailable for {permit.site_name}: {e}")
+            return interval
+
+    def _refill(self, site_name: str, interval: float = None,
+                limits_only: bool = False) -> Tuple[List[float], SiteLimits, float]:
+        """
+        Locate a site's state, creating it on first use, and add the tokens
+        earned since the last update (caller holds the lock).
+        """
+        limits = self._limits.get(site_name)
+        if limits is None:
+            limits = self._limits[site_name] = SiteLimits.for_site(site_name, interval or 0.0)
+        state = self._sites.get(site_name)
+        if state is None:
+            state = self._sites[site_name] = [0.0] * len(_FIELDS)
+        now = time.time()
+
+        if state[_INTERVAL] <= 0:
+            state[_INTERVAL] = limits.interval
+            state[_TOKENS] = limits.burst
+            state[_UPDATED] = now
+        elif not limits_only:
+            earned = (now - state[_UPDATED]) / state[_INTERVAL]
+            state[_TOKENS] = min(limits.burst, state[_TOKENS] + earned)
+            state[_UPDATED] = now
+        return state, limits, now
+
+
+# Shared by every scraper, engine and scheduler in the process
+rate_limiter = RateLimitService()
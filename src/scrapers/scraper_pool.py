@@ -0,0 +1,157 @@
+"""
+Scraper instance pool for the concurrent scraping manager.
+Keeps scrapers (and their keep-alive sessions or browsers) alive across jobs.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional
+
+from .base_scraper import AbstractScraper
+from .data_models import ScrapingError
+from .factory import ScraperFactory
+from ..cli.utils.config import config_manager
+from ..cli.utils.logger import get_logger
+
+
+@dataclass
+class PooledScraper:
+    """Data class wrapping a scraper instance with its pool bookkeeping."""
+    site_name: str
+    scraper: AbstractScraper
+    jobs_handled: int = 0
+    created_at: float = field(default_factory=time.time)
+
+
+class ScraperPool:
+    """
+    Per-site pool of reusable scraper instances.
+    Scrapers are created lazily, health-checked before reuse and recycled
+    after a configurable number of jobs or after an error that points at the
+    scraper itself rather than the page it was scraping.
+    """
+
+    def __init__(self, max_jobs_per_scraper: int = None, max_idle_per_site: int = None):
+        """
+        Initialize the scraper pool.
+
+        Args:
+            max_jobs_per_scraper: Jobs a scraper may handle before it is recycled
+            max_idle_per_site: Maximum idle scrapers kept per site
+        """
+        self.logger = get_logger(self.__class__.__name__)
+
+        self.max_jobs_per_scraper = max_jobs_per_scraper or config_manager.get_setting(
+            'scraping.scraper_pool.max_jobs_per_scraper', 100)
+        self.max_idle_per_site = max_idle_per_site or config_manager.get_setting(
+            'scraping.scraper_pool.max_idle_per_site', 5)
+
+        self._idle: Dict[str, List[PooledScraper]] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'created': 0,
+            'reused': 0,
+            'recycled': 0,
+            'health_check_failures': 0
+        }
+
+    def acquire(self, site_name: str) -> PooledScraper:
+        """
+        Take a scraper for a site out of the pool, creating one if none is idle.
+
+        Args:
+            site_name: Name of the e-commerce site
+
+        Returns:
+            PooledScraper: Scraper leased to the caller until release()
+        """
+        while True:
+            with self._lock:
+                idle = self._idle.get(site_name)
+                pooled = idle.pop() if idle else None
+
+            if pooled is None:
+                break
+
+            if pooled.scraper.is_healthy():
+                with self._lock:
+                    self.stats['reused'] += 1
+                return pooled
+
+            with self._lock:
+                self.stats['health_check_failures'] += 1
+            self.logger.warning(f"Discarding unhealthy {site_name} scraper after {pooled.jobs_handled} jobs")
+            self._close(pooled)
+
+        scraper = ScraperFactory.create_scraper(site_name)
+        with self._lock:
+            self.stats['created'] += 1
+        return PooledScraper(site_name=site_name, scraper=scraper)
+
+    def release(self, pooled: PooledScraper, error: Optional[Exception] = None) -> None:
+        """
+        Return a scraper to the pool, or recycle it if it is worn out or broken.
+
+        Args:
+            pooled: Scraper previously returned by acquire()
+            error: Error the job run on this scraper failed with, if any
+        """
+        pooled.jobs_handled += 1
+        broken = self.breaks_scraper(error)
+
+        if broken or pooled.jobs_handled >= self.max_jobs_per_scraper:
+            reason = f"error: {error}" if broken else f"{pooled.jobs_handled} jobs"
+            self.logger.debug(f"Recycling {pooled.site_name} scraper after {reason}")
+            with self._lock:
+                self.stats['recycled'] += 1
+            self._close(pooled)
+            return
+
+        with self._lock:
+            idle = self._idle.setdefault(pooled.site_name, [])
+            if len(idle) < self.max_idle_per_site:
+                idle.append(pooled)
+                return
+
+        self._close(pooled)
+
+    @staticmethod
+    def breaks_scraper(error: Optional[Exception]) -> bool:
+        """
+        Whether a job error suggests the scraper's session or browser is broken.
+        HTTP error statuses (404s, blocks) and pages that didn't parse are about
+        the page, so the scraper stays pooled; connection failures without a
+        response, browser failures and unexpected exceptions recycle it.
+        """
+        if error is None:
+            return False
+        if isinstance(error, ScrapingError):
+            return error.error_type in ('network', 'selenium') and error.response_code is None
+        return True
+
+    def close_all(self) -> None:
+        """Close every idle scraper held by the pool."""
+        with self._lock:
+            pooled_scrapers = [pooled for idle in self._idle.values() for pooled in idle]
+            self._idle.clear()
+
+        for pooled in pooled_scrapers:
+            self._close(pooled)
+
+        if pooled_scrapers:
+            self.logger.info(f"Closed {len(pooled_scrapers)} pooled scrapers")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['idle'] = {site: len(idle) for site, idle in self._idle.items()}
+        return stats
+
+    def _close(self, pooled: PooledScraper) -> None:
+        """Release the resources of a scraper that leaves the pool."""
+        try:
+            pooled.scraper.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing {pooled.site_name} scraper: {e}")
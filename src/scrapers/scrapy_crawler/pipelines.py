@@ -4,16 +4,23 @@ Handles data validation, database storage, and statistics collection.
 """
 
 import sys
+import json
 import logging
 from datetime import datetime
 from typing import Dict, Any
 from itemadapter import ItemAdapter
+from twisted.internet import task
+from twisted.internet.defer import DeferredList
+from twisted.internet.threads import deferToThread
 
 # Add src to path for imports
 sys.path.insert(0, 'src')
 
 from src.data.database import db_manager
 from src.data.models import Product, Site, ProductURL, PriceHistory
+from src.data.aggregates import apply_price_record
+from src.data.batch_writer import PriceHistoryBatchWriter
+from src.scrapers.data_models import ProductData
 from src.cli.utils.logger import get_logger
 
 
@@ -234,6 +241,8 @@ class DatabasePipeline:
                         scraper_metadata=self._build_metadata(adapter)
                     )
                     session.add(price_record)
+                    session.flush()
+                    apply_price_record(session, price_record)
                     self.stats['prices_recorded'] += 1
                 
                 session.commit()
@@ -277,6 +286,118 @@ class DatabasePipeline:
         self.logger.info(f"  Prices recorded: {self.stats['prices_recorded']}")
 
 
+class BufferedDatabasePipeline(DatabasePipeline):
+    """
+    Buffered variant of DatabasePipeline.
+    Accumulates items and writes them in bulk in a reactor thread-pool thread,
+    so parsing and downloading continue while the database is busy.
+    Rows are resolved like the concurrent scraper's: products are matched by
+    name alone rather than by name and brand, so a title maps to one product
+    whichever scraper saw it first, and a product found at a new URL on a
+    site moves its stored URL.
+    """
+    
+    def __init__(self, batch_size: int = None, flush_interval_ms: int = None):
+        super().__init__()
+        self.writer = PriceHistoryBatchWriter(
+            batch_size=batch_size,
+            flush_interval_ms=flush_interval_ms,
+            db=db_manager,
+            scraper_type="scrapy"
+        )
+        self.buffer = []
+        self.pending_writes = set()
+        self.flush_loop = None
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        """Read optional batch settings from the Scrapy settings."""
+        return cls(
+            batch_size=crawler.settings.getint('DATABASE_BATCH_SIZE') or None,
+            flush_interval_ms=crawler.settings.getint('DATABASE_FLUSH_INTERVAL_MS') or None
+        )
+    
+    def open_spider(self, spider):
+        """Initialize the database and start the periodic flush."""
+        super().open_spider(spider)
+        
+        # Flush partial batches so items never wait longer than the flush interval
+        self.flush_loop = task.LoopingCall(self._flush)
+        self.flush_loop.start(self.writer.flush_interval, now=False)
+    
+    def process_item(self, item, spider):
+        """
+        Buffer item data for the next bulk write.
+        
+        Args:
+            item: Validated scraped item
+            spider: Spider instance
+            
+        Returns:
+            item: Processed item
+        """
+        adapter = ItemAdapter(item)
+        self.buffer.append((self._to_product_data(adapter), adapter['site_name'], datetime.utcnow()))
+        
+        if len(self.buffer) >= self.writer.batch_size:
+            self._flush()
+        
+        return item
+    
+    def _to_product_data(self, adapter: ItemAdapter) -> ProductData:
+        """Convert an item into the ProductData structure used by the batch writer."""
+        product_data = ProductData(adapter['url'])
+        product_data.title = adapter['title']
+        product_data.brand = adapter.get('brand') or None
+        product_data.model = adapter.get('model') or None
+        product_data.price = adapter.get('price')
+        product_data.currency = adapter.get('currency', 'USD')
+        product_data.availability = adapter.get('availability', 'unknown')
+        product_data.metadata = json.loads(self._build_metadata(adapter))
+        product_data.metadata['category'] = adapter.get('category', 'electronics')
+        return product_data
+    
+    def _flush(self):
+        """Hand the buffered items to a thread for a bulk write."""
+        if not self.buffer:
+            return None
+        
+        batch, self.buffer = self.buffer, []
+        deferred = deferToThread(self.writer.write_batch, batch)
+        self.pending_writes.add(deferred)
+        
+        deferred.addCallbacks(self._on_batch_written, self._on_batch_failed,
+                              callbackArgs=(len(batch),), errbackArgs=(len(batch),))
+        deferred.addBoth(self._forget_write, deferred)
+        return deferred
+    
+    def _on_batch_written(self, result: Dict[str, int], batch_size: int):
+        for key in ('items_stored', 'items_failed', 'products_created', 'urls_created'):
+            self.stats[key] += result[key]
+        self.stats['prices_recorded'] += result['rows_written']
+        self.logger.debug(f"Stored {result['items_stored']} of {batch_size} items "
+                          f"({result['rows_written']} prices)")
+    
+    def _on_batch_failed(self, failure, batch_size: int):
+        self.stats['items_failed'] += batch_size
+        self.logger.error(f"Failed to store batch of {batch_size} items: {failure.getErrorMessage()}")
+    
+    def _forget_write(self, result, deferred):
+        self.pending_writes.discard(deferred)
+        return result
+    
+    def close_spider(self, spider):
+        """Flush remaining items and wait for in-flight writes before logging statistics."""
+        if self.flush_loop is not None and self.flush_loop.running:
+            self.flush_loop.stop()
+        
+        self._flush()
+        
+        done = DeferredList(list(self.pending_writes))
+        done.addBoth(lambda _: super(BufferedDatabasePipeline, self).close_spider(spider))
+        return done
+
+
 class StatisticsPipeline:
     """
     Pipeline for collecting scraping statistics and performance metrics.
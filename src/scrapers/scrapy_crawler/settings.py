@@ -35,10 +35,14 @@ HTTPCACHE_IGNORE_HTTP_CODES = [503, 504, 505, 500, 400, 403, 404]
 # Configure pipelines
 ITEM_PIPELINES = {
     'src.scrapers.scrapy_crawler.pipelines.ValidationPipeline': 300,
-    'src.scrapers.scrapy_crawler.pipelines.DatabasePipeline': 400,
+    'src.scrapers.scrapy_crawler.pipelines.BufferedDatabasePipeline': 400,
     'src.scrapers.scrapy_crawler.pipelines.StatisticsPipeline': 500,
 }
 
+# Bulk database writes (defaults come from database.batch_writer in settings.yaml)
+# DATABASE_BATCH_SIZE = 200
+# DATABASE_FLUSH_INTERVAL_MS = 500
+
 # Configure middlewares
 DOWNLOADER_MIDDLEWARES = {
     'src.scrapers.scrapy_crawler.middlewares.RotateUserAgentMiddleware': 400,
@@ -1,13 +1,19 @@
 """
 Dynamic scrapers using Selenium for JS-rendered pages.
 """
+import asyncio
+import json
+import threading
 import time
-from typing import Optional
+from typing import Dict, List, Optional
 from .base_scraper import AbstractScraper, ScrapingError
+from .data_models import ProductData
+from .api_capture import decode_response_body
 from .static_scraper import AmazonScraper, EbayScraper, ShopGeScraper
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import WebDriverException
+from .driver_pool import driver_pool
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 from ..cli.utils.config import config_manager
 from ..cli.utils.logger import get_logger
 
@@ -15,30 +21,112 @@ class BaseSeleniumScraper(AbstractScraper):
     def __init__(self, site_name: str):
         super().__init__(site_name)
         self.logger = get_logger(f"{self.__class__.__name__}")
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        self.driver = webdriver.Chrome(options=options)
+        self.driver_pool = driver_pool
+        self.wait_timeout = config_manager.get_setting('selenium.wait_timeout', 10)
+        self.wait_selectors = self._get_wait_selectors()
+        # Products read from captured API responses, waiting for extract_product
+        self._captured: Dict[str, ProductData] = {}
+        self._captured_lock = threading.Lock()
 
+    def _get_wait_selectors(self) -> List[str]:
+        """
+        CSS selectors whose presence means the product has rendered.
+        Uses the site's 'wait_for' list, defaulting to its title and price selectors.
+        """
+        wait_for = self.config.get('wait_for')
+        if wait_for is None:
+            wait_for = [self.selectors[name] for name in ('title', 'price') if self.selectors.get(name)]
+        wait_for = [wait_for] if isinstance(wait_for, str) else list(wait_for)
+        # :contains() is a cssselect/soupsieve extension that browsers reject
+        return [selector for selector in wait_for if ':contains(' not in selector]
+
+    def _page_rendered(self, driver) -> bool:
+        return all(driver.find_elements(By.CSS_SELECTOR, selector) for selector in self.wait_selectors)
+
+    def _capture_api_response(self, driver, url: str) -> Optional[str]:
+        """
+        Wait for a configured API response in the browser's performance log.
+        The first one that maps to a product is kept for extract_product and its
+        endpoint recorded for the static HTTP path.
+        
+        Returns:
+            The response body, or None if no usable response arrived in time
+        """
+        pending: Dict[str, str] = {}
+        deadline = time.time() + self.wait_timeout
+        while True:
+            finished = list(self.api_capture.finished_responses(driver.get_log('performance'), pending))
+            for request_id, endpoint in finished:
+                try:
+                    body = decode_response_body(
+                        driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id}))
+                    product_data = self.api_capture.to_product(json.loads(body), url)
+                except (WebDriverException, ValueError) as e:
+                    self.logger.debug(f"Skipping API response {endpoint}: {e}")
+                    continue
+                if product_data is None:
+                    continue
+                
+                product_data.metadata.update(self.url_metadata(url))
+                product_data.metadata['api_endpoint'] = endpoint
+                with self._captured_lock:
+                    self._captured[url] = product_data
+                self.endpoint_store.record(url, endpoint)
+                return body
+            
+            if time.time() >= deadline:
+                return None
+            time.sleep(0.1)
+    
     def fetch_page(self, url: str) -> Optional[str]:
-        """Fetch page using Selenium and return rendered HTML."""
-        self._respect_rate_limit()
+        """
+        Fetch page on a pooled browser and return the HTML once the product has rendered.
+        Waits until every wait selector is present instead of sleeping a fixed delay;
+        on timeout the page is returned as it is and parsing decides what is missing.
+        
+        Sites with 'api_capture' return the body of the matching API response as soon
+        as it arrives instead, so the page never has to finish rendering; the page is
+        only waited for when no such response shows up.
+        """
+        with self._captured_lock:
+            self._captured.pop(url, None)
         try:
-            self.logger.debug(f"Selenium fetching page: {url}")
-            self.driver.get(url)
-            delay = config_manager.get_setting('scraping.selenium_delay', 2)
-            time.sleep(delay)
-            return self.driver.page_source
+            with self.driver_pool.lease() as driver:
+                self.logger.debug(f"Selenium fetching page: {url}")
+                if self.api_capture is not None:
+                    # Drop entries left over from the browser's previous page
+                    driver.get_log('performance')
+                # The rate-limit slot covers loading the document, not waiting for it to render
+                with self.rate_limiter.lease(self.site_name, self.rate_limit):
+                    driver.get(url)
+                if self.api_capture is not None:
+                    body = self._capture_api_response(driver, url)
+                    if body is not None:
+                        return body
+                    self.logger.debug(f"No API response captured, reading the rendered page: {url}")
+                if self.wait_selectors:
+                    try:
+                        WebDriverWait(driver, self.wait_timeout).until(self._page_rendered)
+                    except TimeoutException:
+                        self.logger.debug(f"Selectors did not appear within {self.wait_timeout}s: {url}")
+                return driver.page_source
         except WebDriverException as e:
             raise ScrapingError(f"Selenium failed to fetch {url}: {e}", "selenium", url)
 
-    def __del__(self):
-        if hasattr(self, 'driver'):
-            try:
-                self.driver.quit()
-            except Exception:
-                pass
+    def extract_product(self, html_content: str, url: str) -> Optional[ProductData]:
+        """Return the product captured from the site's API, or parse the rendered page."""
+        with self._captured_lock:
+            product_data = self._captured.pop(url, None)
+        if product_data is not None:
+            return product_data
+        return super().extract_product(html_content, url)
+    
+    async def fetch_page_async(self, url: str, http_session, rate_limiter=None) -> Optional[str]:
+        """
+        Run the blocking browser fetch in a thread so the event loop keeps serving other requests.
+        Concurrent fetches are bounded by the shared driver pool.
+        """
+        return await asyncio.to_thread(self.fetch_page, url)
 
 class AmazonSeleniumScraper(AmazonScraper, BaseSeleniumScraper):
     def __init__(self):
@@ -53,4 +141,4 @@ class EbaySeleniumScraper(EbayScraper, BaseSeleniumScraper):
 class ShopGeSeleniumScraper(ShopGeScraper, BaseSeleniumScraper):
     def __init__(self):
         ShopGeScraper.__init__(self)
-        BaseSeleniumScraper.__init__(self, 'shopge')
\ No newline at end of file
+        BaseSeleniumScraper.__init__(self, 'shopge')
@@ -1,17 +1,18 @@
 """
-Static scrapers for e-commerce sites using BeautifulSoup.
-Implements concrete scrapers for Amazon and eBay.
+Static scrapers for e-commerce sites.
+Implements concrete scrapers for Amazon and eBay on the configured HTML parser backend,
+plus a generic scraper for sites described entirely by an extraction plan in scrapers.yaml.
 """
 
 import re
-from typing import Optional
-from bs4 import BeautifulSoup
+from typing import Any, Dict, Optional
 from .base_scraper import AbstractScraper, ProductData, ScrapingError
+from .parsers import HtmlElement
 
 
 class AmazonScraper(AbstractScraper):
     """
-    Amazon scraper using BeautifulSoup for static content.
+    Amazon scraper for static content.
     Handles Amazon's product page structure and data extraction.
     """
     
@@ -21,43 +22,11 @@ class AmazonScraper(AbstractScraper):
     def parse_page(self, html_content: str, url: str) -> ProductData:
         """Parse Amazon product page and extract product information."""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.parse_html(html_content)
             product_data = ProductData(url)
             
-            # Extract title
-            title_element = soup.select_one(self.selectors['title'])
-            if title_element:
-                product_data.title = title_element.get_text().strip()
-            
-            # Extract price
-            product_data.price = self._extract_amazon_price(soup)
-            
-            # Extract availability
-            availability_element = soup.select_one(self.selectors['availability'])
-            if availability_element:
-                product_data.availability = availability_element.get_text().strip()
-            
-            # Extract brand
-            brand_element = soup.select_one(self.selectors.get('brand', ''))
-            if brand_element:
-                brand_text = brand_element.get_text().strip()
-                # Extract brand from "by Brand Name" format
-                brand_match = re.search(r'by\s+(.+)', brand_text)
-                if brand_match:
-                    product_data.brand = brand_match.group(1).strip()
-            
-            # Extract image URL
-            image_element = soup.select_one(self.selectors.get('image', ''))
-            if image_element:
-                product_data.image_url = image_element.get('src') or image_element.get('data-src')
-            
-            # Extract rating
-            rating_element = soup.select_one(self.selectors.get('rating', ''))
-            if rating_element:
-                rating_text = rating_element.get('alt', '')
-                rating_match = re.search(r'(\d+\.?\d*)\s*out of', rating_text)
-                if rating_match:
-                    product_data.rating = float(rating_match.group(1))
+            # Extract title, price, availability, brand, image and rating in one pass
+            self.extraction_plan.apply(soup, product_data)
             
             # Add Amazon-specific metadata
             product_data.metadata.update({
@@ -71,35 +40,16 @@ class AmazonScraper(AbstractScraper):
         except Exception as e:
             raise ScrapingError(f"Failed to parse Amazon page: {str(e)}", "parsing", url)
     
-    def _extract_amazon_price(self, soup: BeautifulSoup) -> Optional[float]:
-        """Extract price from Amazon page with multiple fallback selectors."""
-        price_selectors = [
-            '.a-price-whole',
-            '.a-price .a-offscreen',
-            '#priceblock_dealprice',
-            '#priceblock_ourprice',
-            '.a-price-range'
-        ]
-        
-        for selector in price_selectors:
-            price_element = soup.select_one(selector)
-            if price_element:
-                price_text = price_element.get_text().strip()
-                price_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
-                if price_match:
-                    try:
-                        return float(price_match.group().replace(',', ''))
-                    except ValueError:
-                        continue
-        
-        return None
+    def url_metadata(self, url: str) -> Dict[str, Any]:
+        """Amazon metadata available from the URL."""
+        return {'asin': self._extract_asin(url)}
     
     def _extract_asin(self, url: str) -> Optional[str]:
         """Extract ASIN from Amazon URL."""
         asin_match = re.search(r'/dp/([A-Z0-9]{10})', url)
         return asin_match.group(1) if asin_match else None
     
-    def _extract_department(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_department(self, soup: HtmlElement) -> Optional[str]:
         """Extract product department/category."""
         breadcrumb = soup.select_one('#wayfinding-breadcrumbs_feature_div')
         if breadcrumb:
@@ -108,7 +58,7 @@ class AmazonScraper(AbstractScraper):
                 return links[1].get_text().strip()
         return None
     
-    def _check_prime_eligibility(self, soup: BeautifulSoup) -> bool:
+    def _check_prime_eligibility(self, soup: HtmlElement) -> bool:
         """Check if product is Prime eligible."""
         prime_element = soup.select_one('[aria-label*="Prime"]')
         return prime_element is not None
@@ -116,7 +66,7 @@ class AmazonScraper(AbstractScraper):
 
 class EbayScraper(AbstractScraper):
     """
-    eBay scraper using BeautifulSoup for static content.
+    eBay scraper for static content.
     Handles eBay's product page structure and data extraction.
     """
     
@@ -126,36 +76,11 @@ class EbayScraper(AbstractScraper):
     def parse_page(self, html_content: str, url: str) -> ProductData:
         """Parse eBay product page and extract product information."""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.parse_html(html_content)
             product_data = ProductData(url)
             
-            # Extract title
-            title_element = soup.select_one(self.selectors['title'])
-            if title_element:
-                product_data.title = title_element.get_text().strip()
-            
-            # Extract price
-            product_data.price = self._extract_ebay_price(soup)
-            
-            # Extract condition
-            condition_element = soup.select_one(self.selectors.get('condition', ''))
-            if condition_element:
-                product_data.availability = condition_element.get_text().strip()
-            
-            # Extract seller information
-            seller_element = soup.select_one(self.selectors.get('seller', ''))
-            if seller_element:
-                product_data.metadata['seller'] = seller_element.get_text().strip()
-            
-            # Extract image URL
-            image_element = soup.select_one(self.selectors.get('image', ''))
-            if image_element:
-                product_data.image_url = image_element.get('src') or image_element.get('data-src')
-            
-            # Extract shipping information
-            shipping_element = soup.select_one(self.selectors.get('shipping', ''))
-            if shipping_element:
-                product_data.metadata['shipping'] = shipping_element.get_text().strip()
+            # Extract title, price, condition, seller, image and shipping in one pass
+            self.extraction_plan.apply(soup, product_data)
             
             # Add eBay-specific metadata
             product_data.metadata.update({
@@ -169,36 +94,16 @@ class EbayScraper(AbstractScraper):
         except Exception as e:
             raise ScrapingError(f"Failed to parse eBay page: {str(e)}", "parsing", url)
     
-    def _extract_ebay_price(self, soup: BeautifulSoup) -> Optional[float]:
-        """Extract price from eBay page with multiple fallback selectors."""
-        price_selectors = [
-            '.x-price-primary',
-            '.u-flL.notranslate',
-            '.notranslate',
-            '#x-price-primary'
-        ]
-        
-        for selector in price_selectors:
-            price_element = soup.select_one(selector)
-            if price_element:
-                price_text = price_element.get_text().strip()
-                # Remove currency symbols and extract numeric value
-                price_text = re.sub(r'[^\d.,]', '', price_text)
-                price_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
-                if price_match:
-                    try:
-                        return float(price_match.group().replace(',', ''))
-                    except ValueError:
-                        continue
-        
-        return None
+    def url_metadata(self, url: str) -> Dict[str, Any]:
+        """eBay metadata available from the URL."""
+        return {'item_number': self._extract_item_number(url)}
     
     def _extract_item_number(self, url: str) -> Optional[str]:
         """Extract item number from eBay URL."""
         item_match = re.search(r'/itm/(\d+)', url)
         return item_match.group(1) if item_match else None
     
-    def _extract_listing_type(self, soup: BeautifulSoup) -> str:
+    def _extract_listing_type(self, soup: HtmlElement) -> str:
         """Determine if it's an auction or buy-it-now listing."""
         if soup.select_one('[data-testid="x-btn-primary"]'):
             return "buy_it_now"
@@ -206,7 +111,7 @@ class EbayScraper(AbstractScraper):
             return "auction"
         return "unknown"
     
-    def _extract_time_left(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_time_left(self, soup: HtmlElement) -> Optional[str]:
         """Extract auction time left if applicable."""
         time_element = soup.select_one('.timeMs')
         return time_element.get_text().strip() if time_element else None
@@ -215,61 +120,95 @@ class EbayScraper(AbstractScraper):
 class ShopGeScraper(AbstractScraper):
     """Static scraper for https://www.shop.ge product pages (Georgian)."""
 
+    # Availability phrases, Georgian and schema.org, in the order they are checked
+    AVAILABILITY_MARKERS = [
+        ('მარაგშია', 'in_stock'),                 # "in stock"
+        ('არ არის მარაგში', 'out_of_stock'),      # "not in stock"
+        ('არ არის ხელმისაწვდომი', 'out_of_stock'),  # "not available"
+        ('instock', 'in_stock'),
+        ('outofstock', 'out_of_stock'),
+        ('limitedavailability', 'limited')
+    ]
+
     def __init__(self):
         super().__init__('shopge')
 
     def parse_page(self, html_content: str, url: str) -> ProductData:
-        """Parse shop.ge product page and extract key fields."""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        product = ProductData(url)
+        """
+        Parse shop.ge product page and extract key fields.
+        Title, price, availability and brand come from their product nodes in one pass;
+        the whole page text is only scanned when those nodes are missing.
+        """
+        soup = self.parse_html(html_content)
+        product = self.extraction_plan.apply(soup, ProductData(url))
+
+        page_text = None
+        if product.price is None:
+            page_text = soup.get_text()
+            product.price = self._scan_text_price(page_text)
+        if product.price is not None:
+            product.currency = '₾'
+
+        if product.availability is None and page_text is None:
+            page_text = soup.get_text()
+        product.availability = self._availability_status(product.availability or page_text)
+
+        # Brand – spec table cell labelled "მწარმოებელი" ("manufacturer"), value in the next td
+        if product.brand is None:
+            label = next((cell for cell in soup.select('td, th')
+                          if 'მწარმოებელი' in cell.get_text()), None)
+            if label:
+                next_td = label.find_next('td')
+                if next_td:
+                    product.brand = next_td.get_text(strip=True)
 
-        # Title
-        h1 = soup.find('h1')
-        if h1:
-            product.title = h1.get_text(strip=True)
+        return product
+
+    def _availability_status(self, text: str) -> str:
+        """Map an availability node (or the page text) to a normalized status."""
+        text = text.lower()
+        for marker, status in self.AVAILABILITY_MARKERS:
+            if marker in text:
+                return status
+        return 'unknown'
 
-        # Price - look for Georgian Lari (₾) prices, skip cart/header prices (0 ₾)
-        page_text = soup.get_text()
+    def _scan_text_price(self, page_text: str) -> Optional[float]:
+        """Fallback: take the last non-zero Georgian Lari (₾) amount in the page text."""
         price_patterns = [
             r'(\d+\.?\d*)\s*₾',  # Direct price like "35.00 ₾"
             r'(\d+[.,]\d+)\s*₾',  # Price with comma/decimal like "35,00 ₾"
         ]
-        
+
         for pattern in price_patterns:
-            # Find all matches and filter out zero prices
-            all_matches = re.findall(pattern, page_text)
             valid_prices = []
-            
-            for match in all_matches:
+            for match in re.findall(pattern, page_text):
                 try:
                     price_value = float(match.replace(',', '.'))
                     if price_value > 0:  # Skip cart prices and zero values
                         valid_prices.append(price_value)
                 except ValueError:
                     continue
-            
+
             if valid_prices:
                 # Take the last valid price (usually the actual product price)
-                product.price = valid_prices[-1]
-                product.currency = '₾'
-                break
+                return valid_prices[-1]
 
-        # Availability sign – word "მარაგშია" means "in stock"
-        page_text = soup.get_text().lower()
-        if 'მარაგშია' in page_text:
-            product.availability = 'in_stock'
-        elif 'არ არის მარაგში' in page_text or 'არ არის ხელმისაწვდომი' in page_text:
-            product.availability = 'out_of_stock'
-        else:
-            product.availability = 'unknown'
+        return None
 
-        # Brand – table row where first td text is "მწარმოებელი"
-        brand_cell = soup.find(string=lambda t: t and 'მწარმოებელი' in t)
-        if brand_cell and brand_cell.parent:
-            next_td = brand_cell.parent.find_next('td')
-            if next_td:
-                product.brand = next_td.get_text(strip=True)
-
-        return product
 
+class ConfiguredScraper(AbstractScraper):
+    """
+    Static scraper for sites defined only in scrapers.yaml.
+    All fields come from the site's extraction plan, so adding a site needs no code.
+    """
 
+    def parse_page(self, html_content: str, url: str) -> ProductData:
+        """Parse a product page with the site's extraction plan."""
+        try:
+            product_data = ProductData(url)
+            currency = self.config.get('currency')
+            if currency:
+                product_data.currency = currency
+            return self.extraction_plan.apply(self.parse_html(html_content), product_data)
+        except Exception as e:
+            raise ScrapingError(f"Failed to parse {self.site_name} page: {str(e)}", "parsing", url)
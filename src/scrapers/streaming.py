@@ -0,0 +1,194 @@
+"""
+Streamed page downloads that stop early.
+The body is read in chunks and decoded incrementally; reading stops once every
+configured target (regex marker or simple CSS selector) has been seen, or at a
+byte cap, and the connection is closed without downloading the rest.
+"""
+
+import codecs
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Pattern
+
+from .parsers import simple_selectors
+
+# Text re-scanned before each new chunk, so targets split across chunks are still found
+_LOOKBEHIND = 8192
+
+
+def _selector_pattern(selector: str) -> Pattern:
+    """
+    Regex matching the opening tag of an element a simple selector accepts.
+
+    Raises:
+        ValueError: If the selector has combinators or pseudo-classes
+    """
+    alternatives = simple_selectors(selector)
+    if alternatives is None:
+        raise ValueError(f"Streaming stop selector must be a simple tag/id/class/attribute selector: {selector}")
+
+    patterns = []
+    for simple in alternatives:
+        tests = []
+        if simple.id is not None:
+            tests.append(rf'''(?=[^>]*(?<![\w-])id\s*=\s*["']?{re.escape(simple.id)}(?=["'\s/>]))''')
+        for class_name in simple.classes:
+            tests.append(rf'''(?=[^>]*(?<![\w-])class\s*=\s*["']?[^"'>]*(?<![\w-]){re.escape(class_name)}(?![\w-]))''')
+        for name, value in simple.attributes:
+            value_test = rf'''\s*=\s*["']?{re.escape(value)}(?=["'\s/>])''' if value is not None else r'(?=[\s=/>])'
+            tests.append(rf'(?=[^>]*(?<![\w-]){re.escape(name)}{value_test})')
+        tag = re.escape(simple.tag) + r'\b' if simple.tag else r'[a-z][\w-]*'
+        patterns.append(f"<{tag}{''.join(tests)}[^>]*>")
+    return re.compile('|'.join(patterns), re.IGNORECASE)
+
+
+@dataclass
+class StreamSettings:
+    """Streaming configuration of one site."""
+    targets: List[Pattern] = field(default_factory=list)
+    max_bytes: int = 5_000_000
+    chunk_size: int = 16384
+    # Characters still read after the last target, so the element's content is complete
+    stop_margin: int = 2048
+
+    @classmethod
+    def from_config(cls, site_config: Dict[str, Any]) -> Optional['StreamSettings']:
+        """
+        Compile the 'streaming' section of a site, or return None if streaming is off.
+
+        Raises:
+            ValueError: If a stop marker is not a valid regex or a stop selector is not simple
+        """
+        spec = site_config.get('streaming') or {}
+        if not spec.get('enabled', False):
+            return None
+
+        try:
+            targets = [re.compile(marker, re.DOTALL) for marker in spec.get('stop_markers', [])]
+        except re.error as e:
+            raise ValueError(f"Invalid streaming stop marker: {e}")
+        targets.extend(_selector_pattern(selector) for selector in spec.get('stop_selectors', []))
+
+        return cls(
+            targets=targets,
+            max_bytes=spec.get('max_bytes', cls.max_bytes),
+            chunk_size=spec.get('chunk_size', cls.chunk_size),
+            stop_margin=spec.get('stop_margin', cls.stop_margin)
+        )
+
+
+class StreamingBody:
+    """
+    Incrementally decoded page body with target detection.
+    feed() returns True once reading can stop: every target has been seen and
+    stop_margin more characters were read, or the byte cap is reached.
+    """
+
+    def __init__(self, settings: StreamSettings, encoding: Optional[str] = None):
+        try:
+            decoder_class = codecs.getincrementaldecoder(encoding or 'utf-8')
+        except LookupError:
+            decoder_class = codecs.getincrementaldecoder('utf-8')
+        self._decoder = decoder_class(errors='replace')
+        self.settings = settings
+        self.pending = list(settings.targets)
+        self.bytes_read = 0
+        self.outcome = 'complete'
+        self._text: List[str] = []
+        self._length = 0
+        self._ready_at = 0
+        self._tail = ''
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add a downloaded chunk; returns True when the rest of the body is not needed."""
+        self.bytes_read += len(chunk)
+        text = self._decoder.decode(chunk)
+        self._text.append(text)
+        window_start = self._length - len(self._tail)
+        self._length += len(text)
+
+        if self.pending:
+            window = self._tail + text
+            still_pending = []
+            for target in self.pending:
+                match = target.search(window)
+                if match is None:
+                    still_pending.append(target)
+                else:
+                    self._ready_at = max(self._ready_at, window_start + match.end() + self.settings.stop_margin)
+            self.pending = still_pending
+            self._tail = window[-_LOOKBEHIND:]
+
+        if self.settings.targets and not self.pending and self._length >= self._ready_at:
+            self.outcome = 'stopped'
+            return True
+
+        if self.bytes_read >= self.settings.max_bytes:
+            self.outcome = 'capped'
+            return True
+        return False
+
+    def text(self) -> str:
+        """Body decoded so far."""
+        return ''.join(self._text) + self._decoder.decode(b'', final=True)
+
+
+def content_length(headers) -> Optional[int]:
+    """Content-Length of a response, or None if missing or invalid."""
+    value = headers.get('Content-Length')
+    return int(value) if value is not None and str(value).isdigit() else None
+
+
+def read_streamed(chunks: Iterable[bytes], body: StreamingBody) -> str:
+    """Feed chunks until the body says to stop, returning the text read."""
+    for chunk in chunks:
+        if chunk and body.feed(chunk):
+            break
+    return body.text()
+
+
+class StreamStats:
+    """Per-site totals of streamed downloads, shared by all scrapers in the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_site: Dict[str, Dict[str, int]] = {}
+
+    def record(self, site_name: str, body: StreamingBody, total_bytes: Optional[int],
+               wire_bytes: Optional[int] = None) -> None:
+        """
+        Record one streamed page.
+
+        Args:
+            site_name: Site the page belongs to
+            body: Finished streaming body
+            total_bytes: Content-Length of the response, if known
+            wire_bytes: Bytes received from the network (defaults to the bytes read)
+        """
+        wire_bytes = body.bytes_read if wire_bytes is None else wire_bytes
+        with self._lock:
+            stats = self._by_site.setdefault(site_name, {
+                'pages': 0,
+                'stopped_early': 0,
+                'capped': 0,
+                'bytes_read': 0,
+                'bytes_saved': 0
+            })
+            stats['pages'] += 1
+            stats['bytes_read'] += wire_bytes
+            if body.outcome == 'stopped':
+                stats['stopped_early'] += 1
+            elif body.outcome == 'capped':
+                stats['capped'] += 1
+            if body.outcome != 'complete' and total_bytes:
+                stats['bytes_saved'] += max(0, total_bytes - wire_bytes)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Totals by site name."""
+        with self._lock:
+            return {site: dict(stats) for site, stats in self._by_site.items()}
+
+
+# Shared by every scraper in the process
+stream_stats = StreamStats()
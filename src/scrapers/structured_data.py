@@ -0,0 +1,203 @@
+"""
+Structured product data embedded in pages.
+Reads schema.org Product/Offer data from JSON-LD blocks and microdata
+content attributes with a regex scan of the raw HTML, so a page that carries
+complete structured data never has to be parsed into a DOM.
+"""
+
+import html
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional
+
+_JSON_LD = re.compile(
+    r'<script\b[^>]*\btype\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+_ITEMPROP_TAG = re.compile(r'<[a-z][^>]*?(?<![\w-])itemprop\s*=\s*["\']?([\w ]+)["\']?[^>]*>', re.IGNORECASE)
+_ATTRIBUTE = r'(?<![\w-]){name}\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))'
+_CONTENT = re.compile(_ATTRIBUTE.format(name='content'), re.IGNORECASE)
+_HREF = re.compile(_ATTRIBUTE.format(name='href'), re.IGNORECASE)
+_NUMBER = re.compile(r'\d+(?:[.,]\d+)*')
+
+# schema.org ItemAvailability values mapped to the statuses used in validation
+AVAILABILITY_STATUSES = {
+    'instock': 'in_stock',
+    'instoreonly': 'in_stock',
+    'onlineonly': 'in_stock',
+    'limitedavailability': 'limited',
+    'outofstock': 'out_of_stock',
+    'soldout': 'out_of_stock',
+    'discontinued': 'out_of_stock'
+}
+
+# Microdata properties that identify the page's product unambiguously.
+# Names and brands are left to the DOM parse, because 'name' also appears in
+# breadcrumbs, reviews and seller blocks.
+MICRODATA_FIELDS = {
+    'price': 'price',
+    'lowPrice': 'price',
+    'priceCurrency': 'currency',
+    'availability': 'availability',
+    'ratingValue': 'rating',
+    'reviewCount': 'reviews_count',
+    'ratingCount': 'reviews_count'
+}
+
+
+def parse_number(value: Any, cast=float) -> Optional[float]:
+    """Convert a schema.org number (possibly a formatted string) to float or int."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return cast(value)
+    match = _NUMBER.search(str(value))
+    if not match:
+        return None
+    number = match.group()
+    if ',' in number and '.' in number:
+        if number.rfind(',') > number.rfind('.'):
+            number = number.replace('.', '').replace(',', '.')  # "1.299,00"
+        else:
+            number = number.replace(',', '')  # "1,299.00"
+    elif ',' in number:
+        head, tail = number.rsplit(',', 1)
+        # "35,00" has a decimal comma, "1,299" a thousands separator
+        number = number.replace(',', '') if len(tail) == 3 else f"{head.replace(',', '')}.{tail}"
+    try:
+        return cast(float(number))
+    except ValueError:
+        return None
+
+
+def parse_availability(value: Any) -> Optional[str]:
+    """Map a schema.org ItemAvailability value (URL or bare name) to a validation status."""
+    if not isinstance(value, str):
+        return None
+    key = value.rstrip('/').rsplit('/', 1)[-1].lower()
+    return AVAILABILITY_STATUSES.get(key, 'unknown')
+
+
+def _types(node: Dict[str, Any]) -> List[str]:
+    types = node.get('@type', [])
+    return [types] if isinstance(types, str) else list(types)
+
+
+def _walk_nodes(data: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every JSON object in a JSON-LD document, including @graph members."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _walk_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        for value in data.values():
+            if isinstance(value, (list, dict)):
+                yield from _walk_nodes(value)
+
+
+def _product_fields(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a schema.org Product node to ProductData fields."""
+    fields = {}
+
+    name = product.get('name')
+    if isinstance(name, str) and name.strip():
+        fields['title'] = html.unescape(name.strip())
+
+    brand = product.get('brand')
+    if isinstance(brand, list):
+        brand = brand[0] if brand else None
+    if isinstance(brand, dict):
+        brand = brand.get('name')
+    if isinstance(brand, str) and brand.strip():
+        fields['brand'] = html.unescape(brand.strip())
+
+    image = product.get('image')
+    if isinstance(image, list):
+        image = image[0] if image else None
+    if isinstance(image, dict):
+        image = image.get('url')
+    if isinstance(image, str):
+        fields['image_url'] = image
+
+    offers = product.get('offers')
+    if isinstance(offers, list):
+        offers = next((offer for offer in offers if isinstance(offer, dict)), None)
+    if isinstance(offers, dict):
+        price = offers.get('price', offers.get('lowPrice'))
+        if price is None and isinstance(offers.get('priceSpecification'), dict):
+            price = offers['priceSpecification'].get('price')
+        price = parse_number(price)
+        if price is not None:
+            fields['price'] = price
+        if isinstance(offers.get('priceCurrency'), str):
+            fields['currency'] = offers['priceCurrency']
+        availability = parse_availability(offers.get('availability'))
+        if availability:
+            fields['availability'] = availability
+
+    rating = product.get('aggregateRating')
+    if isinstance(rating, dict):
+        rating_value = parse_number(rating.get('ratingValue'))
+        if rating_value is not None:
+            fields['rating'] = rating_value
+        reviews_count = parse_number(rating.get('reviewCount', rating.get('ratingCount')), int)
+        if reviews_count is not None:
+            fields['reviews_count'] = reviews_count
+
+    return fields
+
+
+def _json_ld_fields(html_content: str) -> Dict[str, Any]:
+    for block in _JSON_LD.finditer(html_content):
+        try:
+            data = json.loads(block.group(1).strip())
+        except ValueError:
+            continue
+        for node in _walk_nodes(data):
+            if 'Product' in _types(node) or 'ProductGroup' in _types(node):
+                fields = _product_fields(node)
+                if fields:
+                    return fields
+    return {}
+
+
+def _microdata_fields(html_content: str) -> Dict[str, Any]:
+    fields = {}
+    for tag in _ITEMPROP_TAG.finditer(html_content):
+        for prop in tag.group(1).split():
+            field = MICRODATA_FIELDS.get(prop)
+            if field is None or field in fields:
+                continue
+            attribute = _CONTENT.search(tag.group(0)) or (_HREF.search(tag.group(0)) if field == 'availability' else None)
+            if not attribute:
+                continue
+            value = html.unescape(next(group for group in attribute.groups() if group is not None))
+            if field == 'availability':
+                value = parse_availability(value)
+            elif field == 'currency':
+                value = value.strip() or None
+            else:
+                value = parse_number(value, int if field == 'reviews_count' else float)
+            if value is not None:
+                fields[field] = value
+    return fields
+
+
+def extract_structured_data(html_content: str) -> Dict[str, Any]:
+    """
+    Extract product fields from JSON-LD and microdata without building a DOM.
+
+    Args:
+        html_content: Raw page HTML
+
+    Returns:
+        dict: ProductData field values that were found (title, price, currency,
+            availability, brand, image_url, rating, reviews_count). JSON-LD wins
+            over microdata where both are present.
+    """
+    if not html_content:
+        return {}
+    fields = _microdata_fields(html_content) if 'itemprop' in html_content else {}
+    if 'ld+json' in html_content:
+        fields.update(_json_ld_fields(html_content))
+    return fields
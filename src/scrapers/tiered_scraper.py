@@ -0,0 +1,141 @@
+"""
+Tiered scrapers: plain HTTP first, a browser only for pages that need one.
+"""
+
+from typing import Dict, List, Optional, Type
+
+from .base_scraper import AbstractScraper
+from .data_models import ProductData, ScrapingError
+from .static_scraper import AmazonScraper, EbayScraper, ShopGeScraper
+from .selenium_scraper import AmazonSeleniumScraper, EbaySeleniumScraper, ShopGeSeleniumScraper
+from ..data.fetch_tiers import fetch_tier_store, STATIC, SELENIUM
+
+
+class TieredScraper:
+    """
+    Mixin for static scrapers that escalate to their Selenium variant.
+    A page is fetched statically unless its URL (or its URL pattern) is known to
+    need a browser; when the static result lacks a required field it is fetched
+    again with the Selenium scraper. The tier that worked is remembered.
+    """
+
+    selenium_class: Type[AbstractScraper] = None
+
+    def _init_tiers(self) -> None:
+        self.tier_store = fetch_tier_store
+        self.required_fields: List[str] = self.config.get(
+            'required_fields', list(AbstractScraper.STRUCTURED_DATA_REQUIRED_FIELDS))
+        self._selenium_scraper: Optional[AbstractScraper] = None
+        # Error of each URL's static attempt, kept per URL since async scrapes interleave
+        self._errors: Dict[str, Exception] = {}
+        self.tier_stats = {
+            STATIC: 0,
+            'escalated': 0,
+            SELENIUM: 0
+        }
+
+    @property
+    def selenium_scraper(self) -> AbstractScraper:
+        """Selenium variant of this scraper, created on the first escalation."""
+        if self._selenium_scraper is None:
+            self._selenium_scraper = self.selenium_class()
+        return self._selenium_scraper
+
+    def handle_error(self, error: Exception, url: str) -> None:
+        self._errors[url] = error
+        super().handle_error(error, url)
+
+    def _needs_browser(self, url: str, product_data: Optional[ProductData]) -> bool:
+        """Whether a static result is missing data a browser could render."""
+        error = self._errors.pop(url, None)
+        if product_data is None:
+            # A page that could not be downloaded will not render either
+            return not (isinstance(error, ScrapingError) and error.error_type == 'network')
+        if product_data.metadata.get('content_unchanged'):
+            return False
+        return any(getattr(product_data, field, None) is None for field in self.required_fields)
+
+    def _complete(self, product_data: Optional[ProductData]) -> bool:
+        return product_data is not None and (
+            product_data.metadata.get('content_unchanged')
+            or all(getattr(product_data, field, None) is not None for field in self.required_fields))
+
+    def _settle(self, url: str, product_data: Optional[ProductData],
+                static_data: Optional[ProductData]) -> Optional[ProductData]:
+        """Remember a complete browser result; otherwise keep whatever the static fetch found."""
+        if self._complete(product_data):
+            return self._remember(url, SELENIUM, product_data)
+        return product_data or static_data
+
+    def _remember(self, url: str, tier: str, product_data: ProductData) -> ProductData:
+        self.tier_store.observe(url, tier)
+        self.tier_stats[tier] += 1
+        product_data.metadata['fetch_tier'] = tier
+        return product_data
+
+    def _escalating(self, url: str, static_data: Optional[ProductData]) -> None:
+        self.tier_stats['escalated'] += 1
+        reason = "missing fields" if static_data else "parse failed"
+        self.logger.info(f"Escalating to Selenium ({reason}): {url}")
+
+    def scrape_product(self, url: str, known_fingerprint: Optional[str] = None) -> Optional[ProductData]:
+        """Scrape a product at its remembered tier, escalating static pages that need a browser."""
+        static_data = None
+        if self.tier_store.tier_for(url) != SELENIUM:
+            static_data = super().scrape_product(url, known_fingerprint)
+            if not self._needs_browser(url, static_data):
+                return self._remember(url, STATIC, static_data) if static_data else None
+            self._escalating(url, static_data)
+
+        product_data = self.selenium_scraper.scrape_product(url, known_fingerprint)
+        return self._settle(url, product_data, static_data)
+
+    async def scrape_product_async(self, url: str, http_session, rate_limiter=None,
+                                   known_fingerprint: Optional[str] = None) -> Optional[ProductData]:
+        """Async counterpart of scrape_product; browser fetches run in a worker thread."""
+        static_data = None
+        if self.tier_store.tier_for(url) != SELENIUM:
+            static_data = await super().scrape_product_async(url, http_session, rate_limiter, known_fingerprint)
+            if not self._needs_browser(url, static_data):
+                return self._remember(url, STATIC, static_data) if static_data else None
+            self._escalating(url, static_data)
+
+        product_data = await self.selenium_scraper.scrape_product_async(
+            url, http_session, rate_limiter, known_fingerprint)
+        return self._settle(url, product_data, static_data)
+
+    def get_scraper_stats(self):
+        stats = super().get_scraper_stats()
+        stats['fetch_tiers'] = dict(self.tier_stats)
+        return stats
+
+    def close(self) -> None:
+        super().close()
+        selenium_scraper = getattr(self, '_selenium_scraper', None)
+        if selenium_scraper is not None:
+            selenium_scraper.close()
+            self._selenium_scraper = None
+
+
+class AmazonTieredScraper(TieredScraper, AmazonScraper):
+    selenium_class = AmazonSeleniumScraper
+
+    def __init__(self):
+        AmazonScraper.__init__(self)
+        self._init_tiers()
+
+
+class EbayTieredScraper(TieredScraper, EbayScraper):
+    selenium_class = EbaySeleniumScraper
+
+    def __init__(self):
+        EbayScraper.__init__(self)
+        self._init_tiers()
+
+
+class ShopGeTieredScraper(TieredScraper, ShopGeScraper):
+    selenium_class = ShopGeSeleniumScraper
+
+    def __init__(self):
+        ShopGeScraper.__init__(self)
+        self._init_tiers()
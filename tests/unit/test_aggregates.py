@@ -0,0 +1,113 @@
+"""
+Unit tests for the incrementally maintained price aggregates.
+"""
+
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import event
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.aggregates import rebuild_price_aggregates
+from src.data.batch_writer import PriceHistoryBatchWriter
+from src.data.database import db_manager
+from src.data.models import LatestPrice, DailyPriceRollup
+from src.scrapers.data_models import ProductData
+
+
+@pytest.fixture
+def price_db(tmp_path):
+    """Fixture providing an empty temporary database."""
+    previous_config = db_manager.db_config
+    db_manager.initialize(f"sqlite:///{tmp_path / 'prices.db'}")
+    yield db_manager
+    db_manager.db_config = previous_config
+
+
+def make_product(price: float) -> ProductData:
+    """Build scraped product data for a single test product."""
+    product = ProductData(url="https://www.amazon.com/dp/TEST")
+    product.title = "Test Wireless Headphones"
+    product.price = price
+    product.availability = "in_stock"
+    return product
+
+
+def latest_snapshot():
+    """Read the latest-price rows as comparable tuples."""
+    with db_manager.get_session() as session:
+        return [(row.product_url_id, row.price_history_id, float(row.price),
+                 float(row.price_sum), row.price_count, row.scraped_at)
+                for row in session.query(LatestPrice).order_by(LatestPrice.product_url_id)]
+
+
+def rollup_snapshot():
+    """Read the daily rollup rows as comparable tuples."""
+    with db_manager.get_session() as session:
+        return [(row.product_url_id, row.day, float(row.min_price), float(row.max_price),
+                 float(row.price_sum), row.price_count, float(row.last_price))
+                for row in session.query(DailyPriceRollup).order_by(DailyPriceRollup.day)]
+
+
+def test_latest_price_follows_scraped_at_not_insert_order(price_db):
+    """Test that a late-arriving older price doesn't replace the latest one but counts toward the average."""
+    writer = PriceHistoryBatchWriter(db=price_db)
+    writer.write_batch([(make_product(100.0), 'Amazon', datetime(2025, 1, 2))])
+    writer.write_batch([(make_product(80.0), 'Amazon', datetime(2025, 1, 1))])
+
+    latest = price_db.get_latest_price(1)
+
+    assert float(latest.price) == 100.0
+    assert latest_snapshot()[0][3:5] == (180.0, 2)
+
+
+def test_incremental_aggregates_match_rebuild(price_db):
+    """Test that aggregates maintained on insert equal a full rebuild from history."""
+    writer = PriceHistoryBatchWriter(db=price_db)
+    writer.write_batch([(make_product(price), 'Amazon', datetime(2025, 1, day))
+                        for day, price in [(3, 90.0), (1, 100.0), (2, 95.0)]])
+    price_db.add_price_record(1, price=85.0)
+
+    incremental = latest_snapshot(), rollup_snapshot()
+    with price_db.get_session() as session:
+        rebuild_price_aggregates(session)
+
+    assert incremental == (latest_snapshot(), rollup_snapshot())
+    assert incremental[0][0][2] == 85.0
+
+
+def test_daily_rollup_summarizes_each_day(price_db):
+    """Test that scrapes on the same day fold into one rollup with min/max/sum/count/last."""
+    writer = PriceHistoryBatchWriter(db=price_db)
+    writer.write_batch([(make_product(100.0), 'Amazon', datetime(2025, 1, 1, 18))])
+    writer.write_batch([(make_product(price), 'Amazon', datetime(2025, 1, 1, hour))
+                        for hour, price in [(9, 120.0), (12, 90.0)]])
+    writer.write_batch([(make_product(110.0), 'Amazon', datetime(2025, 1, 2, 9))])
+
+    rollups = rollup_snapshot()
+
+    assert [row[1].day for row in rollups] == [1, 2]
+    assert rollups[0][2:] == (90.0, 120.0, 310.0, 3, 100.0)
+    assert rollups[1][2:] == (110.0, 110.0, 110.0, 1, 110.0)
+
+
+def test_aggregates_are_updated_without_reading_them(price_db):
+    """Test that folding prices is done by upserts in the database, so concurrent writers can't lose updates."""
+    writer = PriceHistoryBatchWriter(db=price_db)
+    writer.write_batch([(make_product(100.0), 'Amazon', datetime(2025, 1, 1, 9))])
+
+    statements = []
+    event.listen(price_db.db_config.engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    writer.write_batch([(make_product(90.0), 'Amazon', datetime(2025, 1, 1, 12))])
+
+    aggregate_statements = [statement for statement in statements
+                            if 'latest_prices' in statement or 'daily_price_rollups' in statement]
+    assert len(aggregate_statements) == 2
+    assert all('ON CONFLICT' in statement for statement in aggregate_statements)
+    assert latest_snapshot()[0][2:5] == (90.0, 190.0, 2)
+    assert rollup_snapshot()[0][2:] == (90.0, 100.0, 190.0, 2, 90.0)
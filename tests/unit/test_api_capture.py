@@ -0,0 +1,128 @@
+"""
+Unit tests for JSON API capture in Selenium mode and recorded endpoints.
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.scrapers.api_capture import ApiCapture, EndpointStore
+from src.scrapers.driver_pool import DriverPool
+from src.scrapers.selenium_scraper import AmazonSeleniumScraper
+
+CAPTURE_CONFIG = {
+    'api_capture': {
+        'url_patterns': [r'/api/products/\w+'],
+        'fields': {
+            'title': 'product.name',
+            'price': 'product.offers.0.price',
+            'availability': 'product.offers.0.inStock',
+            'metadata.sku': 'product.sku'
+        }
+    }
+}
+
+ENDPOINT = 'https://www.amazon.com/api/products/B0ACME0001'
+PAYLOAD = {'product': {'name': 'Acme Headphones', 'sku': 'ACME-1',
+                       'offers': [{'price': '1,249.99', 'inStock': False}]}}
+
+
+def log_entry(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+class CapturingDriver:
+    """Browser stand-in whose page calls the product API while it loads."""
+
+    def __init__(self):
+        self.visited = []
+        self.log = []
+
+    def get(self, url):
+        self.visited.append(url)
+        self.log = [
+            log_entry('Network.requestWillBeSent', requestId='1',
+                      request={'url': 'https://www.amazon.com/api/products/reviews', 'method': 'POST'}),
+            log_entry('Network.requestWillBeSent', requestId='2', request={'url': ENDPOINT, 'method': 'GET'}),
+            log_entry('Network.responseReceived', requestId='2',
+                      response={'url': ENDPOINT, 'status': 200, 'mimeType': 'application/json'}),
+            log_entry('Network.loadingFinished', requestId='1'),
+            log_entry('Network.loadingFinished', requestId='2')
+        ]
+
+    def get_log(self, log_type):
+        entries, self.log = self.log, []
+        return entries
+
+    def execute_cdp_cmd(self, command, params):
+        assert command == 'Network.getResponseBody' and params == {'requestId': '2'}
+        return {'body': json.dumps(PAYLOAD), 'base64Encoded': False}
+
+    def find_elements(self, by, selector):
+        raise AssertionError("captured pages must not wait for rendering")
+
+    @property
+    def page_source(self):
+        return '<html><body>Loading...</body></html>'
+
+    def quit(self):
+        pass
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+def test_api_capture_maps_payload_and_validates_config():
+    """Test dot-path mapping to ProductData and rejection of incomplete configurations."""
+    capture = ApiCapture.from_config(CAPTURE_CONFIG)
+    assert capture.matches(ENDPOINT) and not capture.matches('https://www.amazon.com/dp/B0ACME0001')
+
+    product = capture.to_product(PAYLOAD, 'https://www.amazon.com/dp/B0ACME0001')
+    assert product.title == 'Acme Headphones'
+    assert product.price == 1249.99
+    assert product.availability == 'out_of_stock'
+    assert product.metadata['sku'] == 'ACME-1' and product.metadata['extraction'] == 'api'
+    assert capture.to_product({'product': {'name': 'No offers'}}, ENDPOINT) is None
+
+    assert ApiCapture.from_config({}) is None
+    with pytest.raises(ValueError):
+        ApiCapture.from_config({'api_capture': {'url_patterns': ['/api'], 'fields': {'title': 'name'}}})
+    with pytest.raises(ValueError):
+        ApiCapture.from_config({'api_capture': {'url_patterns': ['(']}})
+
+
+def test_selenium_capture_records_endpoint_for_static_path(tmp_path, monkeypatch):
+    """Test that a captured API response replaces rendering and is called directly afterwards."""
+    url = 'https://www.amazon.com/dp/B0ACME0001'
+    drivers = []
+    pool = DriverPool(max_drivers=1, driver_factory=lambda: drivers.append(CapturingDriver()) or drivers[-1])
+
+    scraper = AmazonSeleniumScraper()
+    scraper.driver_pool = pool
+    scraper.rate_limit = 0
+    scraper.api_capture = ApiCapture.from_config(CAPTURE_CONFIG)
+    scraper.endpoint_store = EndpointStore(str(tmp_path / 'endpoints.json'))
+
+    product = scraper.scrape_product(url)
+    assert product.title == 'Acme Headphones' and product.metadata['api_endpoint'] == ENDPOINT
+    assert product.metadata['asin'] == 'B0ACME0001'
+    assert EndpointStore(str(tmp_path / 'endpoints.json')).get(url) == ENDPOINT
+
+    requested = []
+    monkeypatch.setattr(scraper, '_request_page',
+                        lambda endpoint, headers=None: requested.append(endpoint) or FakeResponse(json.dumps(PAYLOAD)))
+    repeat = scraper.scrape_product(url, known_fingerprint=product.metadata['content_fingerprint'])
+    assert requested == [ENDPOINT] and len(drivers[0].visited) == 1
+    assert repeat.metadata['content_unchanged']
+
+    # An endpoint that stops serving the product is forgotten
+    monkeypatch.setattr(scraper, '_request_page', lambda endpoint, headers=None: FakeResponse('{"error": "gone"}'))
+    assert scraper._fetch_from_api(url) is None
+    assert scraper.endpoint_store.get(url) is None
+    pool.close_all()
@@ -0,0 +1,103 @@
+"""
+Unit tests for the asyncio fetch engine and its retry policy.
+"""
+
+import asyncio
+import pytest
+import sys
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pytest.importorskip('aiohttp')
+
+from src.scrapers.async_engine import AsyncFetchEngine
+
+FIXTURE = Path(__file__).resolve().parents[1] / 'fixtures' / 'amazon_product.html'
+
+# Statuses answered before the page is served, per path
+FAILURES = {
+    '/dp/B0MISSING': [404, 404, 404, 404],
+    '/dp/B0FORBIDDEN': [403, 403, 403, 403],
+    '/dp/B0THROTTLED': [429],
+    '/dp/B0UNAVAILABLE': [503, 503]
+}
+
+
+@pytest.fixture
+def page_server():
+    """Fixture serving the stored Amazon page after each path's scripted failures, counting requests."""
+    body = FIXTURE.read_bytes()
+    requests = Counter()
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                attempt = requests[self.path]
+                requests[self.path] += 1
+            failures = FAILURES.get(self.path, [])
+            if attempt < len(failures):
+                self.send_response(failures[attempt])
+                self.send_header('Retry-After', '0')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', requests
+    server.shutdown()
+    server.server_close()
+
+
+async def scrape_all(base_url, paths):
+    """Scrape paths concurrently through one engine without rate limits or retry delays."""
+    async with AsyncFetchEngine(max_concurrency=4, limit_per_host=4) as engine:
+        scraper = engine.get_scraper('amazon')
+        scraper.rate_limit = 0
+        scraper.retry_delays = [0]
+        scraper.max_retries = 3
+        scraper.api_capture = None
+        results = await asyncio.gather(*(engine.scrape_product('amazon', base_url + path) for path in paths))
+        return dict(zip(paths, results))
+
+
+def test_async_engine_scrapes_over_pooled_connections(page_server):
+    """Test that pages fetched on the event loop parse like the threaded path."""
+    base_url, requests = page_server
+    paths = [f'/dp/B0ASYNC{number:03d}' for number in range(6)]
+    results = asyncio.run(scrape_all(base_url, paths))
+
+    assert all(result is not None and result.title and result.price for result in results.values())
+    assert {result.title for result in results.values()} == {results[paths[0]].title}
+    assert all(requests[path] == 1 for path in paths)
+
+
+def test_async_fetch_retries_only_throttling_and_server_errors(page_server):
+    """Test that 404s and 403s fail after one request while 429s and 5xx answers are retried."""
+    base_url, requests = page_server
+    results = asyncio.run(scrape_all(base_url, list(FAILURES)))
+
+    assert results['/dp/B0MISSING'] is None
+    assert results['/dp/B0FORBIDDEN'] is None
+    assert requests['/dp/B0MISSING'] == 1
+    assert requests['/dp/B0FORBIDDEN'] == 1
+
+    assert results['/dp/B0THROTTLED'] is not None
+    assert results['/dp/B0UNAVAILABLE'] is not None
+    assert requests['/dp/B0THROTTLED'] == 2
+    assert requests['/dp/B0UNAVAILABLE'] == 3
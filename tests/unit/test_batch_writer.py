@@ -0,0 +1,113 @@
+"""
+Unit tests for the write-behind batch writer and its id cache.
+"""
+
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data import batch_writer
+from src.data.batch_writer import PriceHistoryBatchWriter
+from src.data.database import db_manager
+from src.data.models import PriceHistory, Product, ProductURL, Site
+from src.scrapers.data_models import ProductData
+
+URL = "https://www.amazon.com/dp/WRITER"
+
+
+@pytest.fixture
+def price_db(tmp_path):
+    """Fixture providing an empty temporary database."""
+    previous_config = db_manager.db_config
+    db_manager.initialize(f"sqlite:///{tmp_path / 'prices.db'}")
+    yield db_manager
+    db_manager.db_config = previous_config
+
+
+def make_product(price: float, url: str = URL, title: str = "Writer Test Headphones") -> ProductData:
+    """Build scraped product data."""
+    product = ProductData(url=url)
+    product.title = title
+    product.price = price
+    product.availability = "in_stock"
+    return product
+
+
+def stored_prices():
+    """Read the stored prices with their product name and URL."""
+    with db_manager.get_session() as session:
+        return [(name, url, float(price)) for name, url, price in session.query(
+            Product.name, ProductURL.url, PriceHistory.price
+        ).join(ProductURL, PriceHistory.product_url_id == ProductURL.id)
+         .join(Product, ProductURL.product_id == Product.id)
+         .order_by(PriceHistory.id)]
+
+
+def test_stop_flushes_buffered_results(price_db):
+    """Test that results still buffered when the writer stops are written."""
+    writer = PriceHistoryBatchWriter(batch_size=100, flush_interval_ms=60000, db=price_db)
+    writer.start()
+    for price in (10.0, 11.0, 12.0):
+        writer.add(make_product(price), 'Amazon')
+    writer.stop()
+
+    assert writer.pending() == 0
+    assert [price for _, _, price in stored_prices()] == [10.0, 11.0, 12.0]
+    assert writer.stats['rows_written'] == 3
+
+
+def test_failed_batch_is_retried_row_by_row(price_db):
+    """Test that one bad result only loses itself, not the rest of its batch."""
+    writer = PriceHistoryBatchWriter(db=price_db)
+    # A product without a title violates products.name NOT NULL
+    batch = [(make_product(price, title=title), 'Amazon', datetime(2025, 1, 1))
+             for price, title in ((10.0, "Writer Test Headphones"), (20.0, None), (30.0, "Writer Test Headphones"))]
+
+    assert writer.write_batch(batch) == {'rows_written': 2, 'items_stored': 2, 'items_failed': 1,
+                                         'products_created': 1, 'urls_created': 1}
+    assert [price for _, _, price in stored_prices()] == [10.0, 30.0]
+    assert writer.stats['batches_written'] == 0
+    assert writer.stats['rows_failed'] == 1
+
+
+def test_ids_from_a_rolled_back_batch_are_not_cached(price_db, monkeypatch):
+    """Test that ids created in a failed transaction are not reused once other rows take them."""
+    writer = PriceHistoryBatchWriter(db=price_db)
+
+    def fail(session, rows):
+        raise RuntimeError("aggregates unavailable")
+
+    monkeypatch.setattr(batch_writer, 'apply_price_rows', fail)
+    assert writer.write_batch([(make_product(10.0), 'Amazon', datetime(2025, 1, 1))])['items_failed'] == 1
+    monkeypatch.undo()
+
+    # Other rows now take the ids the rolled-back transaction had created
+    with price_db.get_session() as session:
+        session.add(Site(name='Other', base_url='https://www.other.com', scraper_type='static'))
+        session.add(Product(name='Other Product', category='electronics'))
+
+    assert writer.write_batch([(make_product(20.0), 'Amazon', datetime(2025, 1, 2))])['rows_written'] == 1
+    assert stored_prices() == [("Writer Test Headphones", URL, 20.0)]
+    with price_db.get_session() as session:
+        assert session.query(Site.name).join(ProductURL).scalar() == 'Amazon'
+
+
+def test_new_url_of_a_product_replaces_the_stored_one(price_db):
+    """Test that a product found at a new URL on the same site moves its URL instead of merging silently."""
+    writer = PriceHistoryBatchWriter(db=price_db)
+    moved = URL + "-v2"
+    writer.write_batch([(make_product(10.0), 'Amazon', datetime(2025, 1, 1))])
+    writer.write_batch([(make_product(11.0, url=moved), 'Amazon', datetime(2025, 1, 2))])
+
+    with price_db.get_session() as session:
+        assert [url for url, in session.query(ProductURL.url)] == [moved]
+    assert [url for _, url, _ in stored_prices()] == [moved, moved]
+
+    # The old URL is no longer cached, so scraping it again moves the URL back
+    writer.write_batch([(make_product(12.0), 'Amazon', datetime(2025, 1, 3))])
+    with price_db.get_session() as session:
+        assert [url for url, in session.query(ProductURL.url)] == [URL]
@@ -0,0 +1,56 @@
+"""
+Unit tests for the SQLite connection profile.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.cli.utils.config import config_manager
+from src.data.database import db_manager
+from src.data.models import DatabaseConfig
+
+
+def read_pragmas(engine):
+    """Read journal_mode, synchronous and busy_timeout on two separate pooled connections."""
+    with engine.connect() as first, engine.connect() as second:
+        return [tuple(connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+                      for name in ('journal_mode', 'synchronous', 'busy_timeout'))
+                for connection in (first, second)]
+
+
+def test_default_pragmas_apply_to_every_connection(tmp_path):
+    """Test that each new connection gets WAL, synchronous=NORMAL and the busy timeout."""
+    config = DatabaseConfig(f"sqlite:///{tmp_path / 'prices.db'}")
+    config.initialize()
+
+    # synchronous reads back as a number: 1 = NORMAL
+    assert read_pragmas(config.engine) == [('wal', 1, 5000)] * 2
+    config.engine.dispose()
+
+
+def test_configured_pragmas_override_the_defaults(tmp_path, monkeypatch):
+    """Test that database.sqlite_pragmas settings reach new connections and null skips a pragma."""
+    previous_config = db_manager.db_config
+    monkeypatch.setitem(config_manager.settings['database'], 'sqlite_pragmas',
+                        {'journal_mode': None, 'synchronous': 'FULL', 'busy_timeout': 1234})
+    db_manager.initialize(f"sqlite:///{tmp_path / 'prices.db'}")
+    try:
+        # journal_mode keeps SQLite's own default; 2 = FULL
+        assert read_pragmas(db_manager.db_config.engine) == [('delete', 2, 1234)] * 2
+    finally:
+        db_manager.db_config.engine.dispose()
+        db_manager.db_config = previous_config
+
+
+def test_invalid_pragma_is_rejected(tmp_path):
+    """Test that a pragma value that isn't a plain word or number never reaches SQL."""
+    config = DatabaseConfig(f"sqlite:///{tmp_path / 'prices.db'}",
+                            sqlite_pragmas={'synchronous': 'OFF; DROP TABLE products'})
+    config.initialize()
+
+    with pytest.raises(ValueError):
+        config.engine.connect()
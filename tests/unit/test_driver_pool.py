@@ -0,0 +1,87 @@
+"""
+Unit tests for the shared Selenium driver pool.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from selenium.common.exceptions import WebDriverException
+
+from src.scrapers.driver_pool import DriverPool
+from src.scrapers.selenium_scraper import AmazonSeleniumScraper
+
+
+class FakeDriver:
+    """Browser stand-in whose product renders after a few polls."""
+
+    def __init__(self, renders_after: int = 1):
+        self.renders_after = renders_after
+        self.polls = 0
+        self.visited = []
+        self.quit_called = False
+
+    def get(self, url):
+        self.visited.append(url)
+        self.polls = 0
+
+    def find_elements(self, by, selector):
+        self.polls += 1
+        return [object()] if self.polls > self.renders_after else []
+
+    @property
+    def page_source(self):
+        return '<html><h1 id="productTitle">Rendered Product</h1></html>'
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_pool_reuses_bounds_and_recycles_drivers():
+    """Test reuse, the driver limit, page-count recycling and crash replacement."""
+    started = []
+    pool = DriverPool(max_drivers=2, max_pages_per_driver=3,
+                      driver_factory=lambda: started.append(FakeDriver()) or started[-1])
+
+    first = pool.acquire()
+    second = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    pool.release(second)
+    assert pool.acquire() is second
+
+    for _ in range(2):
+        pool.release(first)
+        assert pool.acquire() is first
+    pool.release(first)
+    assert first.driver.quit_called and pool.stats['recycled'] == 1
+
+    with pytest.raises(WebDriverException):
+        with pool.lease():
+            raise WebDriverException("chrome not reachable")
+    assert pool.stats['crashed'] == 1 and len(started) == 3
+
+    pool.release(second)
+    pool.close_all()
+    assert all(driver.quit_called for driver in started)
+
+
+def test_selenium_fetch_waits_for_selectors_on_pooled_driver():
+    """Test that dynamic scrapers share pooled browsers and wait for selectors instead of sleeping."""
+    drivers = []
+    pool = DriverPool(max_drivers=1, driver_factory=lambda: drivers.append(FakeDriver()) or drivers[-1])
+    scrapers = [AmazonSeleniumScraper(), AmazonSeleniumScraper()]
+
+    for number, scraper in enumerate(scrapers):
+        scraper.driver_pool = pool
+        scraper.rate_limit = 0
+        html_content = scraper.fetch_page(f'https://www.amazon.com/dp/B0ACME000{number}')
+        assert 'Rendered Product' in html_content
+        scraper.close()
+
+    assert len(drivers) == 1 and len(drivers[0].visited) == 2
+    assert scrapers[0].wait_selectors == ['#productTitle', '.a-price-whole, .a-price-fraction']
+    pool.close_all()
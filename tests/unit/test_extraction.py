@@ -0,0 +1,101 @@
+"""
+Unit tests for compiled extraction plans.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pytest.importorskip("lxml.cssselect")
+
+from src.scrapers.data_models import ProductData
+from src.scrapers.extraction import ExtractionPlan
+from src.scrapers.parsers import SelectorGroup, parse_html
+
+PAGE = ('<html><body><div id="main"><p class="x">first</p><span class="price">n/a</span>'
+        '<ul><li>one</li><li class="x">two</li></ul><h2>Head</h2><p>after</p></div>'
+        '<span class="price" data-v="7">USD 1,299.50</span><img id="pic" data-src="/a.jpg">'
+        '<i class="stars" title="4.5 out of 5">*</i></body></html>')
+
+
+def test_selector_group_matches_select_one_on_both_backends():
+    """Test that each selector in a group resolves to its select_one result, combinators included."""
+    selectors = ['.x', 'div > p', 'ul li', 'h2 + p', 'li.x, h2', '#main span.price', 'span[data-v]',
+                 "span[data-v='7'].price", 'P', '#pic', '.missing']
+    group = SelectorGroup(selectors)
+
+    for backend in ('html.parser', 'lxml'):
+        document = parse_html(PAGE, backend)
+        grouped = document.select_group(group)
+        expected = [document.select_one(selector) for selector in selectors]
+        assert [element.get_text() if element else None for element in grouped] == \
+               [element.get_text() if element else None for element in expected]
+
+
+def test_plan_applies_fallbacks_patterns_and_types():
+    """Test candidate fallback, attribute reads, regex post-processing and type conversion."""
+    plan = ExtractionPlan.from_config({
+        'selectors': {'title': 'h2'},
+        'extraction': {
+            'title': None,
+            'price': {'selectors': ['.missing', '.price'], 'remove': ',', 'pattern': r'\d+\.?\d*', 'type': 'float'},
+            'image_url': {'selectors': '#pic', 'attribute': ['src', 'data-src']},
+            'rating': {'selectors': ['.stars'], 'attribute': 'title', 'pattern': r'([\d.]+) out of', 'type': 'float'},
+            'metadata.section': {'selectors': ['#main p'], 'pattern': r'f(\w+)'}
+        }
+    })
+
+    for backend in ('html.parser', 'lxml'):
+        product = plan.apply(parse_html(PAGE, backend), ProductData('https://example.com/p'))
+        assert product.title == 'Head'
+        # '.price' first matches "n/a", which fails the pattern, so the next candidate is not used either
+        assert product.price is None
+        assert product.image_url == '/a.jpg'
+        assert product.rating == 4.5
+        assert product.metadata == {'section': 'irst'}
+
+
+def test_plan_falls_back_to_next_selector():
+    """Test that a candidate whose value fails post-processing yields to the next one."""
+    plan = ExtractionPlan.from_config({'extraction': {
+        'price': {'selectors': ['#main .price', 'body > .price'], 'remove': ',', 'pattern': r'\d+\.?\d*', 'type': 'float'}
+    }})
+
+    for backend in ('html.parser', 'lxml'):
+        assert plan.extract(parse_html(PAGE, backend)) == {'price': 1299.5}
+
+
+def test_plan_rejects_invalid_config():
+    """Test that configuration errors surface when the plan is compiled."""
+    with pytest.raises(ValueError):
+        ExtractionPlan.from_config({'extraction': {'title': {}}})
+    with pytest.raises(ValueError):
+        ExtractionPlan.from_config({'extraction': {'price': {'selectors': ['.p'], 'type': 'decimal'}}})
+    with pytest.raises(ValueError):
+        ExtractionPlan.from_config({'extraction': {'price': {'selectors': ['.p'], 'pattern': '('}}})
+
+
+def test_shopge_reads_product_nodes_not_widget_prices():
+    """Test that Shop.ge prices come from the product block, ignoring recommendation widgets."""
+    from src.scrapers.static_scraper import ShopGeScraper
+
+    page = ('<html><body><div class="cart"><span>0 ₾</span></div>'
+            '<div class="product"><h1>Acme <b>ყურსასმენი</b></h1><div class="stock">მარაგშია</div>'
+            '<div class="price"><span>1 249,50 ₾</span></div></div>'
+            '<div class="related"><span>19.99 ₾</span><span>არ არის მარაგში</span></div></body></html>')
+    fallback_page = '<html><body><h1>Acme</h1><p>ფასი: 35,00 ₾</p><p>მარაგშია</p></body></html>'
+
+    scraper = ShopGeScraper()
+    for backend in ('html.parser', 'lxml'):
+        scraper.parser_backend = backend
+        product = scraper.parse_page(page, 'https://www.shop.ge/product/1')
+        assert product.title == 'Acme ყურსასმენი'
+        assert product.price == 1249.5 and product.currency == '₾'
+        assert product.availability == 'in_stock'
+
+        product = scraper.parse_page(fallback_page, 'https://www.shop.ge/product/2')
+        assert product.price == 35.0 and product.availability == 'in_stock'
+    scraper.close()
@@ -0,0 +1,92 @@
+"""
+Unit tests for content fingerprints and unchanged-page short-circuiting.
+"""
+
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.batch_writer import PriceHistoryBatchWriter
+from src.data.database import db_manager
+from src.data.models import PriceHistory, PageFingerprint
+from src.scrapers.fingerprint import compute_fingerprint
+from src.scrapers.static_scraper import AmazonScraper
+
+PAGE = ('<html><script>var requestId = "{request_id}";</script>'
+        '<h1 id="productTitle">Fingerprint Test Product</h1>'
+        '<span class="a-price-whole">{price}</span></html>')
+
+
+class FakeResponse:
+    """Minimal requests.Response stand-in."""
+
+    def __init__(self, text: str):
+        self.status_code = 200
+        self.text = text
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def price_db(tmp_path):
+    """Fixture providing an empty temporary database."""
+    previous_config = db_manager.db_config
+    db_manager.initialize(f"sqlite:///{tmp_path / 'prices.db'}")
+    yield db_manager
+    db_manager.db_config = previous_config
+
+
+def test_fingerprint_ignores_scripts_and_whitespace():
+    """Test that volatile scripts and formatting don't change the fingerprint but prices do."""
+    base = compute_fingerprint(PAGE.format(request_id='a1', price='12.50'))
+
+    assert compute_fingerprint(PAGE.format(request_id='b2', price='12.50').replace('><', '>\n  <')) == base
+    assert compute_fingerprint(PAGE.format(request_id='a1', price='11.99')) != base
+
+    markers = [r'<span class="a-price-whole">.*?</span>']
+    assert compute_fingerprint(PAGE.format(request_id='a1', price='12.50') + '<p>ad</p>', markers) == \
+        compute_fingerprint(PAGE.format(request_id='a1', price='12.50'), markers)
+
+
+def test_fingerprint_keeps_json_ld_prices():
+    """Test that a price change only visible in JSON-LD data changes the fingerprint."""
+    page = ('<html><script type="application/ld+json">{{"@type": "Product", "offers": {{"price": "{price}"}}}}'
+            '</script><h1 id="productTitle">Fingerprint Test Product</h1></html>')
+
+    assert compute_fingerprint(page.format(price='10.00')) != compute_fingerprint(page.format(price='12.00'))
+    assert compute_fingerprint(page.replace('application/ld+json', 'application/json').format(price='10.00')) != \
+        compute_fingerprint(page.replace('application/ld+json', 'application/json').format(price='12.00'))
+
+
+def test_unchanged_page_only_touches_verification_time(price_db):
+    """Test that a page matching its stored fingerprint skips parsing and adds no price row."""
+    scraper = AmazonScraper()
+    scraper.rate_limit = 0
+    scraper.streaming = None  # FakeResponse carries its text, not a body stream
+    scraper.http_cache.enabled = False
+    responses = iter([PAGE.format(request_id='a1', price='12.50'), PAGE.format(request_id='b2', price='12.50')])
+    scraper.session.get = lambda url, timeout=None, headers=None: FakeResponse(next(responses))
+    writer = PriceHistoryBatchWriter(db=price_db)
+    url = 'https://www.amazon.com/dp/FINGERPRINT'
+
+    first = scraper.scrape_product(url, known_fingerprint=writer.fingerprints.get(url))
+    writer.write_batch([(first, 'Amazon', datetime(2025, 1, 1))])
+
+    scraper.parse_page = lambda html_content, url: pytest.fail("unchanged page was parsed")
+    second = scraper.scrape_product(url, known_fingerprint=writer.fingerprints.get(url))
+    writer.write_batch([(second, 'Amazon', datetime(2025, 1, 2))])
+    scraper.close()
+
+    assert second.metadata['content_unchanged'] is True
+    assert writer.stats['pages_unchanged'] == 1
+    with db_manager.get_session() as session:
+        assert session.query(PriceHistory).count() == 1
+        fingerprint = session.query(PageFingerprint).one()
+        assert fingerprint.last_changed_at == datetime(2025, 1, 1)
+        assert fingerprint.last_verified_at == datetime(2025, 1, 2)
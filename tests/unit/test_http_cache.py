@@ -0,0 +1,95 @@
+"""
+Unit tests for the HTTP response cache.
+"""
+
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.batch_writer import PriceHistoryBatchWriter
+from src.data.database import db_manager
+from src.data.models import PageFingerprint, PriceHistory
+from src.scrapers.http_cache import HttpCache
+from src.scrapers.static_scraper import AmazonScraper
+
+PAGE = ('<html><h1 id="productTitle">Cached Test Product</h1>'
+        '<span class="a-price-whole">12.50</span></html>')
+
+
+class FakeResponse:
+    """Minimal requests.Response stand-in."""
+
+    def __init__(self, status_code: int, text: str = '', headers: dict = None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    """Fixture providing an Amazon scraper whose site serves PAGE with an ETag."""
+    scraper = AmazonScraper()
+    scraper.rate_limit = 0
+    scraper.streaming = None  # FakeResponse carries its text, not a body stream
+    scraper.http_cache = HttpCache(str(tmp_path / 'cache'), enabled=True)
+    scraper.requests_sent = []
+
+    def get(url, timeout=None, headers=None):
+        scraper.requests_sent.append(headers or {})
+        if (headers or {}).get('If-None-Match') == '"v1"':
+            return FakeResponse(304, headers={'ETag': '"v1"'})
+        return FakeResponse(200, PAGE, {'ETag': '"v1"'})
+
+    scraper.session.get = get
+    yield scraper
+    scraper.close()
+
+
+def test_fresh_entry_skips_request(scraper):
+    """Test that a page within its TTL is served from the cache without a request."""
+    first = scraper.scrape_product('https://www.amazon.com/dp/TEST')
+    second = scraper.scrape_product('https://www.amazon.com/dp/TEST')
+
+    assert len(scraper.requests_sent) == 1
+    assert second.title == first.title == 'Cached Test Product'
+    assert second.metadata['http_cache'] == 'hit'
+    assert second.metadata['content_unchanged']
+    assert second.scraped_at == first.scraped_at
+
+
+def test_stale_entry_is_revalidated(scraper):
+    """Test that a stale entry sends If-None-Match and a 304 reuses the cached parse."""
+    scraper.cache_ttl = 0
+    scraper.scrape_product('https://www.amazon.com/dp/TEST')
+
+    product = scraper.scrape_product('https://www.amazon.com/dp/TEST')
+
+    assert scraper.requests_sent[-1] == {'If-None-Match': '"v1"'}
+    assert product.price == 12.5
+    assert product.metadata['http_cache'] == 'revalidated'
+    assert scraper.http_cache.stats['revalidated'] == 1
+
+
+def test_cache_hits_verify_the_stored_price_instead_of_adding_one(scraper, tmp_path):
+    """Test that storing a cache hit marks the page verified rather than writing another price row."""
+    previous_config = db_manager.db_config
+    db_manager.initialize(f"sqlite:///{tmp_path / 'prices.db'}")
+    try:
+        writer = PriceHistoryBatchWriter(db=db_manager)
+        url = 'https://www.amazon.com/dp/TEST'
+        writer.write_batch([(scraper.scrape_product(url), 'Amazon', datetime(2025, 1, 1))])
+        writer.write_batch([(scraper.scrape_product(url), 'Amazon', datetime(2025, 1, 2))])
+
+        with db_manager.get_session() as session:
+            assert session.query(PriceHistory).count() == 1
+            assert session.query(PageFingerprint.last_verified_at).scalar() == datetime(2025, 1, 2)
+        assert writer.stats['pages_unchanged'] == 1
+    finally:
+        db_manager.db_config = previous_config
@@ -0,0 +1,177 @@
+"""
+Unit tests for the durable, resumable job queue of scraping sessions.
+"""
+
+import json
+import pytest
+import sys
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.cli.utils.config import config_manager
+from src.data.batch_writer import PriceHistoryBatchWriter
+from src.data.database import db_manager
+from src.data.job_queue import JobQueue
+from src.data.models import PriceHistory, ScrapingSession
+from src.scrapers.concurrent_manager import ConcurrentScrapingManager
+from src.scrapers.data_models import ProductData
+
+FIXTURE = Path(__file__).resolve().parents[1] / 'fixtures' / 'amazon_product.html'
+
+
+@pytest.fixture
+def price_db(tmp_path):
+    """Fixture providing an empty temporary database."""
+    previous_config = db_manager.db_config
+    db_manager.initialize(f"sqlite:///{tmp_path / 'prices.db'}")
+    yield db_manager
+    db_manager.db_config = previous_config
+
+
+@pytest.fixture
+def page_server():
+    """Fixture serving the stored Amazon page and recording requested paths."""
+    body = FIXTURE.read_bytes()
+    requested = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requested.append(self.path)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', requested
+    server.shutdown()
+    server.server_close()
+
+
+def make_jobs(base_url, count):
+    return [{'site_name': 'amazon', 'url': f'{base_url}/dp/B0QUEUE{number:03d}', 'priority': number % 2}
+            for number in range(count)]
+
+
+def test_claims_are_exclusive_and_expired_leases_return(price_db):
+    """Test that two workers never claim the same job and a dead worker's jobs come back."""
+    first = JobQueue.create({'sites': ['amazon']}, owner='first', lease_seconds=60)
+    second = JobQueue(first.session_id, owner='second', lease_seconds=60)
+    first.enqueue(make_jobs('https://www.amazon.com', 5))
+    now = datetime(2025, 1, 1, 12, 0)
+
+    claimed = first.claim(limit=3, now=now)
+    rest = second.claim(limit=10, now=now)
+    assert [job.priority for job in claimed] == [0, 0, 0]
+    assert {job.id for job in claimed}.isdisjoint(job.id for job in rest) and len(rest) == 2
+    assert second.claim(now=now) == []
+
+    # 'first' stops renewing; after its lease runs out 'second' takes over its jobs
+    second.heartbeat(now=now + timedelta(seconds=50))
+    taken_over = second.claim(now=now + timedelta(seconds=90))
+    assert sorted(job.id for job in taken_over) == sorted(job.id for job in claimed)
+    assert all(job.attempts == 2 for job in taken_over)
+
+    second.fail(taken_over[0].id, 'HTTP 404')
+    assert second.counts() == {'pending': 0, 'leased': 4, 'done': 0, 'failed': 1}
+
+
+def test_jobs_are_acknowledged_with_their_results_and_resume_skips_them(price_db):
+    """Test that only jobs whose price rows were committed are done when a session resumes."""
+    queue = JobQueue.create({'sites': ['amazon']})
+    queue.enqueue(make_jobs('https://www.amazon.com', 4))
+    claimed = queue.claim()
+
+    writer = PriceHistoryBatchWriter(db=price_db)
+    writer.job_queue = queue
+    stored = []
+    for job in claimed[:2]:
+        product = ProductData(url=job.url)
+        product.title = f'Queued {job.id}'
+        product.price = 10.0 + job.id
+        product.metadata['queue_job_id'] = job.id
+        stored.append((product, 'Amazon', datetime(2025, 1, 1)))
+    writer.write_batch(stored)
+
+    # The run dies here: two jobs still leased, the session still 'running'
+    assert queue.finish() == 'interrupted'
+    resumed = JobQueue.resume(queue.session_id)
+    remaining = resumed.claim()
+
+    assert sorted(job.id for job in remaining) == sorted(job.id for job in claimed[2:])
+    with price_db.get_session() as session:
+        assert session.query(PriceHistory).count() == 2
+        assert 'queue_job_id' not in session.query(PriceHistory).first().scraper_metadata
+        row = session.query(ScrapingSession).filter_by(session_id=queue.session_id).one()
+        assert row.status == 'running' and row.products_scraped == 2
+        assert json.loads(row.session_metadata)['checkpoint']['jobs']['done'] == 2
+
+
+
+def test_jobs_stored_by_the_row_by_row_fallback_are_acknowledged(price_db, monkeypatch):
+    """Test that a failed batch retried row by row still acknowledges the jobs it stores."""
+    queue = JobQueue.create({'sites': ['amazon']})
+    queue.enqueue(make_jobs('https://www.amazon.com', 3))
+    claimed = queue.claim()
+
+    writer = PriceHistoryBatchWriter(db=price_db)
+    writer.job_queue = queue
+    calls = []
+
+    def record(session, product_url_id, tier, captured_at):
+        # The first call fails the whole batch; the per-row retries succeed except the last
+        calls.append(product_url_id)
+        if len(calls) in (1, 4):
+            raise RuntimeError("tier store unavailable")
+
+    monkeypatch.setattr(writer.fetch_tiers, 'record', record)
+    batch = []
+    for job in claimed:
+        product = ProductData(url=job.url)
+        product.title = f'Fallback {job.id}'
+        product.price = 20.0 + job.id
+        product.metadata.update(queue_job_id=job.id, fetch_tier='static')
+        batch.append((product, 'Amazon', datetime(2025, 1, 1)))
+
+    assert writer.write_batch(batch)['rows_written'] == 2
+    assert writer.stats['rows_failed'] == 1
+    assert queue.counts() == {'pending': 0, 'leased': 1, 'done': 2, 'failed': 0}
+    # Only the stored items drop their job id; the failed one keeps it for a later retry
+    assert [product.metadata.get('queue_job_id') for product, _, _ in batch] == [None, None, claimed[2].id]
+
+def test_manager_runs_only_the_remaining_jobs_of_a_session(price_db, page_server, monkeypatch):
+    """Test that a resumed run fetches the unfinished jobs and completes the session."""
+    base_url, requested = page_server
+    monkeypatch.setitem(config_manager.get_scraper_config('amazon'), 'rate_limit', 0)
+    queue = JobQueue.create({'sites': ['amazon']})
+    jobs = make_jobs(base_url, 4)
+    queue.enqueue(jobs)
+
+    # An earlier run stored the first job before being interrupted
+    done = queue.claim(limit=1)
+    with price_db.get_session() as session:
+        queue.ack(session, [done[0].id])
+
+    manager = ConcurrentScrapingManager(max_workers=2, job_queue=JobQueue.resume(queue.session_id))
+    assert manager.load_queued_jobs() == 3
+    manager.start_workers()
+    assert manager.wait_completion(timeout=60)
+    manager.stop_workers()
+
+    assert sorted(requested) == sorted(job['url'][len(base_url):] for job in jobs
+                                       if job['url'] != done[0].url)
+    assert queue.counts()['done'] == 4
+    with price_db.get_session() as session:
+        row = session.query(ScrapingSession).filter_by(session_id=queue.session_id).one()
+        assert row.status == 'completed' and row.completed_at is not None
@@ -0,0 +1,93 @@
+"""
+Unit tests for the SiteReadyScheduler.
+"""
+
+import threading
+import time
+import pytest
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.scrapers.job_scheduler import SiteReadyScheduler
+
+
+@dataclass
+class FakeJob:
+    """Minimal job with the attributes the scheduler needs."""
+    site_name: str
+    url: str
+    priority: int = 1
+
+
+@pytest.fixture
+def scheduler():
+    """Fixture providing a scheduler with a long interval for 'slow' and none for other sites."""
+    return SiteReadyScheduler(lambda site_name: 60.0 if site_name == 'slow' else 0.0)
+
+
+def test_jobs_for_a_site_are_fifo_within_priority(scheduler):
+    """Test that jobs for one site come out by priority, then insertion order."""
+    scheduler.put(FakeJob('fast', 'a', priority=2))
+    scheduler.put(FakeJob('fast', 'b', priority=1))
+    scheduler.put(FakeJob('fast', 'c', priority=1))
+
+    urls = [scheduler.get(timeout=1).url for _ in range(3)]
+
+    assert urls == ['b', 'c', 'a']
+
+
+def test_rate_limited_site_does_not_block_other_sites(scheduler):
+    """Test that a site waiting on its rate limit doesn't starve jobs behind it."""
+    scheduler.put(FakeJob('slow', 'slow-1'))
+    scheduler.put(FakeJob('slow', 'slow-2'))
+    scheduler.put(FakeJob('fast', 'fast-1'))
+
+    first = scheduler.get(timeout=1)
+    second = scheduler.get(timeout=1)
+
+    assert {first.url, second.url} == {'slow-1', 'fast-1'}
+    assert scheduler.get(timeout=0.05) is None
+    assert scheduler.qsize() == 1
+
+
+def test_close_wakes_waiting_consumer(scheduler):
+    """Test that close() releases a consumer blocked in get()."""
+    results = []
+    consumer = threading.Thread(target=lambda: results.append(scheduler.get()))
+    consumer.start()
+
+    time.sleep(0.05)
+    scheduler.close()
+    consumer.join(timeout=1)
+
+    assert not consumer.is_alive()
+    assert results == [None]
+
+
+def test_put_wakes_waiting_consumer(scheduler):
+    """Test that a new job is handed to a consumer that is already waiting."""
+    results = []
+    consumer = threading.Thread(target=lambda: results.append(scheduler.get(timeout=2)))
+    consumer.start()
+
+    time.sleep(0.05)
+    scheduler.put(FakeJob('fast', 'late'))
+    consumer.join(timeout=1)
+
+    assert [job.url for job in results] == ['late']
+
+
+def test_drain_returns_all_jobs(scheduler):
+    """Test that drain() empties the scheduler regardless of ready times."""
+    scheduler.put(FakeJob('slow', 'slow-1'))
+    scheduler.put(FakeJob('slow', 'slow-2'))
+    scheduler.put(FakeJob('fast', 'fast-1'))
+
+    jobs = scheduler.drain()
+
+    assert sorted(job.url for job in jobs) == ['fast-1', 'slow-1', 'slow-2']
+    assert scheduler.qsize() == 0
@@ -0,0 +1,95 @@
+"""
+Unit tests for parsing pages in a process pool while threads download them.
+"""
+
+import pytest
+import sys
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.cli.utils.config import config_manager
+from src.data.database import db_manager
+from src.data.processors import DataProcessor
+from src.scrapers.concurrent_manager import ConcurrentScrapingManager
+from src.scrapers.parse_pool import ParsePool
+from src.scrapers.static_scraper import AmazonScraper
+
+FIXTURE = Path(__file__).resolve().parents[1] / 'fixtures' / 'amazon_product.html'
+
+
+@pytest.fixture
+def page_server():
+    """Fixture serving the stored Amazon page for every path."""
+    body = FIXTURE.read_bytes()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_parses_and_processes_like_the_thread():
+    """Test that a page parsed in a pool process matches the in-process parse and processing."""
+    url = 'https://www.amazon.com/dp/B0POOL0001'
+    html_content = FIXTURE.read_text(encoding='utf-8')
+    local = DataProcessor().process(AmazonScraper().extract_product(html_content, url)).to_dict()
+
+    pool = ParsePool(max_workers=1, max_pending=1)
+    try:
+        pooled = pool.extract('amazon', html_content, url)
+        empty = pool.extract('amazon', '<html></html>', url)
+    finally:
+        pool.close()
+
+    # Validation failures come back with the product instead of raising in the pool
+    assert 'validation failed' in empty.metadata['validation_error']
+    assert pooled.metadata.pop('processed') is True
+    for field in ('title', 'price', 'currency', 'availability', 'brand', 'image_url', 'rating'):
+        assert pooled.to_dict()[field] == local[field]
+    stats = pool.get_stats()
+    assert stats['parsed'] == 2 and stats['invalid'] == 1 and stats['processes'] == 1
+
+
+def test_multiprocessing_manager_downloads_in_threads_and_parses_in_processes(page_server, tmp_path,
+                                                                              monkeypatch):
+    """Test that --use-multiprocessing runs jobs through the two-stage pipeline."""
+    monkeypatch.setitem(config_manager.get_scraper_config('amazon'), 'rate_limit', 0)
+    previous_config = db_manager.db_config
+    db_manager.initialize(f"sqlite:///{tmp_path / 'prices.db'}")
+    run = uuid.uuid4().hex[:8]
+
+    try:
+        manager = ConcurrentScrapingManager(max_workers=3, use_multiprocessing=True)
+        manager.add_bulk_jobs([{'site_name': 'amazon', 'url': f'{page_server}/dp/B0{run}{number}'}
+                               for number in range(4)])
+        manager.start_workers()
+        assert manager.wait_completion(timeout=120)
+        stats = manager.get_statistics()
+        manager.stop_workers()
+    finally:
+        db_manager.db_config = previous_config
+
+    assert stats['jobs_completed'] == 4 and stats['jobs_failed'] == 0
+    assert stats['parse_pool']['parsed'] == 4 and stats['parse_pool']['processes'] >= 1
+    assert manager.result_writer.stats['rows_written'] == 4
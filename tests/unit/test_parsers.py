@@ -0,0 +1,56 @@
+"""
+Unit tests for the HTML parser backends.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pytest.importorskip("lxml.cssselect")
+
+from src.scrapers.parsers import parse_html
+from src.scrapers.static_scraper import AmazonScraper, EbayScraper, ShopGeScraper
+
+FIXTURES = Path(__file__).resolve().parents[1] / 'fixtures'
+
+
+@pytest.mark.parametrize('scraper_class, fixture, url', [
+    (AmazonScraper, 'amazon_product.html', 'https://www.amazon.com/dp/B0ACME1234'),
+    (EbayScraper, 'ebay_product.html', 'https://www.ebay.com/itm/123456'),
+    (ShopGeScraper, 'shopge_product.html', 'https://www.shop.ge/product/1'),
+])
+def test_backends_extract_identical_products(scraper_class, fixture, url):
+    """Test that the lxml backend extracts exactly what the BeautifulSoup backend does."""
+    html_content = (FIXTURES / fixture).read_text(encoding='utf-8')
+    scraper = scraper_class()
+    results = {}
+    for backend in ('html.parser', 'lxml'):
+        scraper.parser_backend = backend
+        product = scraper.parse_page(html_content, url).to_dict()
+        product.pop('scraped_at', None)
+        results[backend] = product
+    scraper.close()
+
+    assert results['lxml'] == results['html.parser']
+    assert results['lxml']['title'] and results['lxml']['price']
+
+
+def test_element_api_matches_across_backends():
+    """Test text, attribute and traversal semantics of the common element API."""
+    html_content = ('<html><body><!-- note --><h1 class="a b"> Main <b>Title</b> </h1>'
+                    '<script>var x = 1;</script><table><tr><th>Brand</th><td> Acme </td></tr></table>'
+                    '</body></html>')
+
+    for backend in ('html.parser', 'lxml'):
+        document = parse_html(html_content, backend)
+        heading = document.select_one('h1')
+
+        assert heading.get_text() == ' Main Title '
+        assert heading.get_text(' ', strip=True) == 'Main Title'
+        assert heading.get('class') == 'a b'
+        assert 'var x' not in document.get_text()
+        assert document.select_one('th').find_next('td').get_text(strip=True) == 'Acme'
+        assert document.select_one('') is None and document.select('.missing') == []
@@ -0,0 +1,134 @@
+"""
+Unit tests for worker nodes sharing the job queue and per-site rate budgets.
+"""
+
+import multiprocessing
+import pytest
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.cli.utils.config import config_manager
+from src.data.database import db_manager
+from src.data.job_queue import JobQueue
+from src.data.models import ScrapingSession
+from src.data.rate_budget import RateBudgetStore
+from src.scrapers.concurrent_manager import ConcurrentScrapingManager
+
+FIXTURE = Path(__file__).resolve().parents[1] / 'fixtures' / 'amazon_product.html'
+INTERVAL = 0.2
+
+
+@pytest.fixture
+def price_db(tmp_path, monkeypatch):
+    """Fixture providing an empty temporary database opened for several processes."""
+    previous_config = db_manager.db_config
+    monkeypatch.setitem(config_manager.settings['database'], 'sqlite_begin', 'IMMEDIATE')
+    database_url = f"sqlite:///{tmp_path / 'prices.db'}"
+    db_manager.initialize(database_url)
+    yield database_url
+    db_manager.db_config = previous_config
+
+
+@pytest.fixture
+def page_server():
+    """Fixture serving the stored Amazon page and recording when each path was requested."""
+    body = FIXTURE.read_bytes()
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append((time.time(), self.path))
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', requests
+    server.shutdown()
+    server.server_close()
+
+
+def run_worker_process(database_url, results):
+    """Worker process body: serve the queue until it is empty and report the worker's totals."""
+    from src.scrapers.queue_worker import QueueWorker
+
+    config_manager.set_setting('database.sqlite_begin', 'IMMEDIATE')
+    config_manager.set_setting('scraping.rate_limiter.burst', 1)
+    config_manager.get_scraper_config('amazon')['rate_limit'] = INTERVAL
+    db_manager.initialize(database_url)
+    results.put(QueueWorker(max_workers=2, batch_size=2, exit_when_idle=True, poll_interval=0.2).run())
+
+
+def test_budget_slots_are_shared_between_nodes(price_db):
+    """Test that two nodes reserving for one site get consecutive slots, and pauses apply to both."""
+    first, second = RateBudgetStore(), RateBudgetStore()
+    now = 1000.0
+
+    waits = [store.reserve('amazon', 1.0, burst=2, now=now) for store in (first, second, first, second)]
+    assert waits == [0.0, 0.0, 1.0, 2.0]
+    assert first.wait_time('amazon', 1.0, burst=2, now=now) == pytest.approx(3.0)
+
+    second.pause('amazon', now + 10.0)
+    assert first.reserve('amazon', 1.0, burst=2, now=now) == pytest.approx(10.0)
+    assert second.reserve('ebay', 1.0, now=now) == 0.0
+
+
+def test_stopping_worker_returns_unstarted_jobs_and_leaves_the_session_running(price_db):
+    """Test that a worker leaving a session other workers still run neither interrupts it nor keeps its jobs."""
+    queue = JobQueue.create({'sites': ['amazon']})
+    queue.enqueue({'site_name': 'amazon', 'url': f'https://www.amazon.com/dp/B0STOP{number:04d}'}
+                  for number in range(4))
+    JobQueue(queue.session_id, owner='other-node').claim(limit=1)
+
+    manager = ConcurrentScrapingManager(max_workers=1, job_queue=JobQueue(queue.session_id, owner='this-node'))
+    assert manager.load_queued_jobs(2) == 2
+    # The worker stops before starting the jobs it claimed
+    manager._finish_session()
+
+    assert manager.session_stats['jobs_released'] == 2
+    assert queue.counts() == {'pending': 3, 'leased': 1, 'done': 0, 'failed': 0}
+    with db_manager.get_session() as session:
+        assert session.query(ScrapingSession).filter_by(session_id=queue.session_id).one().status == 'running'
+
+
+def test_worker_processes_split_the_queue_within_one_site_budget(price_db, page_server):
+    """Test that two worker processes run every job once and together respect the site's rate."""
+    base_url, requests = page_server
+    queue = JobQueue.create({'sites': ['amazon']})
+    urls = [f'{base_url}/dp/B0WORKER{number:02d}' for number in range(16)]
+    queue.enqueue({'site_name': 'amazon', 'url': url} for url in urls)
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    processes = [context.Process(target=run_worker_process, args=(price_db, results)) for _ in range(2)]
+    for process in processes:
+        process.start()
+    stats = [results.get(timeout=120) for _ in processes]
+    for process in processes:
+        process.join(timeout=30)
+
+    assert sorted(path for _, path in requests) == sorted(url[len(base_url):] for url in urls)
+    assert all(worker['jobs_completed'] > 0 for worker in stats)
+    assert sum(worker['jobs_completed'] for worker in stats) == 16
+
+    # Both processes drew on one budget: 16 requests at one per interval span at least
+    # 15 intervals (server-side gaps between single requests jitter on a loaded machine)
+    times = sorted(at for at, _ in requests)
+    assert times[-1] - times[0] >= (len(times) - 1) * INTERVAL - 0.1
+
+    assert queue.counts()['done'] == 16
+    with db_manager.get_session() as session:
+        assert session.query(ScrapingSession).filter_by(session_id=queue.session_id).one().status == 'completed'
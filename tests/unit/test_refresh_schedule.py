@@ -0,0 +1,82 @@
+"""
+Unit tests for the volatility-driven refresh schedule.
+"""
+
+import pytest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.cli.utils.config import config_manager
+from src.data.batch_writer import PriceHistoryBatchWriter
+from src.data.database import db_manager
+from src.data.refresh_schedule import RefreshScheduler
+from src.scrapers.data_models import ProductData
+
+START = datetime(2025, 3, 1)
+VOLATILE = 'https://www.amazon.com/dp/VOLATILE'
+STABLE = 'https://www.amazon.com/dp/STABLE'
+NEW = 'https://www.amazon.com/dp/NEW'
+
+
+@pytest.fixture
+def price_db(tmp_path):
+    """Fixture providing a database with a volatile, a stable and a never-priced URL."""
+    previous_config = db_manager.db_config
+    db_manager.initialize(f"sqlite:///{tmp_path / 'prices.db'}")
+
+    def product(url, price):
+        data = ProductData(url=url)
+        data.title = f"Refresh test {url[-8:]}"
+        data.price = price
+        data.availability = 'in_stock'
+        return data
+
+    batch = [(product(VOLATILE, 100.0 + hour % 2), 'Amazon', START + timedelta(hours=hour))
+             for hour in range(48)]
+    batch += [(product(STABLE, 50.0), 'Amazon', START + timedelta(days=day - 7)) for day in range(10)]
+    batch.append((product(NEW, None), 'Amazon', START))
+    PriceHistoryBatchWriter(db=db_manager).write_batch(batch)
+    yield db_manager
+    db_manager.db_config = previous_config
+
+
+def test_volatile_prices_come_due_first_and_stable_ones_wait_for_the_sla(price_db):
+    """Test that intervals follow the observed change rate within the SLA and the due order."""
+    scheduler = RefreshScheduler(freshness_sla_hours=24, min_interval_hours=1, staleness_target=0.1)
+    now = START + timedelta(hours=50)
+    plan = {entry.url: entry for entry in scheduler.plan(now=now)}
+
+    assert plan[VOLATILE].changes_per_day > 10
+    assert plan[VOLATILE].refresh_interval == timedelta(hours=1)
+    assert plan[STABLE].refresh_interval == timedelta(hours=24)
+    # Without history a URL starts between the two
+    assert timedelta(hours=1) < plan[NEW].refresh_interval < timedelta(hours=24)
+    assert plan[NEW].last_scraped_at is None
+
+    due = scheduler.due(now=now)
+    assert [entry.url for entry in due] == [NEW, VOLATILE]
+    assert scheduler.due(sites=['ebay'], now=now) == []
+    assert [entry.url for entry in scheduler.due(limit=1, now=now)] == [NEW]
+
+    # A day later the stable price is due too, but less overdue than the volatile one
+    later = [entry.url for entry in scheduler.due(now=now + timedelta(hours=24))]
+    assert later == [NEW, VOLATILE, STABLE]
+
+
+def test_intervals_stretch_to_fit_the_site_rate_budget(price_db, monkeypatch):
+    """Test that a site too slow to refresh every URL on time gets proportionally longer intervals."""
+    scheduler = RefreshScheduler(freshness_sla_hours=24, min_interval_hours=1, site_budget_share=0.8)
+    now = START + timedelta(hours=50)
+    relaxed = {entry.url: entry.refresh_interval for entry in scheduler.plan(now=now)}
+
+    monkeypatch.setitem(config_manager.get_scraper_config('amazon'), 'rate_limit', 3000.0)
+    stretched = {entry.url: entry.refresh_interval for entry in scheduler.plan(now=now)}
+
+    utilization = sum(3000.0 / interval.total_seconds() for interval in relaxed.values())
+    assert utilization > 0.8
+    for url, interval in relaxed.items():
+        assert stretched[url] / interval == pytest.approx(utilization / 0.8)
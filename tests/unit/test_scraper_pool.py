@@ -0,0 +1,82 @@
+"""
+Unit tests for reuse and recycling of pooled scrapers.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.scrapers import scraper_pool
+from src.scrapers.data_models import ScrapingError
+from src.scrapers.scraper_pool import ScraperPool
+
+
+class FakeScraper:
+    """Scraper stand-in recording whether it was closed."""
+
+    def __init__(self, site_name):
+        self.site_name = site_name
+        self.closed = False
+
+    def is_healthy(self):
+        return not self.closed
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Fixture providing a pool that creates fake scrapers."""
+    monkeypatch.setattr(scraper_pool.ScraperFactory, 'create_scraper', FakeScraper)
+    return ScraperPool(max_jobs_per_scraper=3, max_idle_per_site=2)
+
+
+def test_scrapers_are_reused_until_worn_out(pool):
+    """Test that a released scraper serves the next job of its site until it reaches its job limit."""
+    first = pool.acquire('amazon')
+    pool.release(first)
+    assert pool.acquire('amazon') is first
+    assert pool.acquire('ebay').scraper is not first.scraper
+
+    pool.release(first)
+    assert pool.acquire('amazon') is first
+    pool.release(first)
+
+    assert first.scraper.closed
+    assert pool.acquire('amazon') is not first
+    assert pool.get_stats()['created'] == 3
+    assert pool.get_stats()['reused'] == 2
+    assert pool.get_stats()['recycled'] == 1
+
+
+@pytest.mark.parametrize('error', [
+    ScrapingError("Failed to fetch page after 4 attempts", "network", response_code=404),
+    ScrapingError("Failed to fetch page after 4 attempts", "network", response_code=429),
+    ScrapingError("Failed to parse product data", "parsing")
+])
+def test_page_errors_keep_the_scraper(pool, error):
+    """Test that missing, throttled or unparseable pages don't cost the scraper its session."""
+    pooled = pool.acquire('amazon')
+    pool.release(pooled, error=error)
+
+    assert not pooled.scraper.closed
+    assert pool.acquire('amazon') is pooled
+
+
+@pytest.mark.parametrize('error', [
+    ScrapingError("Failed to fetch page after 4 attempts", "network"),
+    ScrapingError("Selenium failed to fetch page: chrome not reachable", "selenium"),
+    RuntimeError("session state corrupted")
+])
+def test_scraper_errors_recycle_the_scraper(pool, error):
+    """Test that connection, browser and unexpected errors replace the scraper."""
+    pooled = pool.acquire('amazon')
+    pool.release(pooled, error=error)
+
+    assert pooled.scraper.closed
+    assert pool.acquire('amazon') is not pooled
+    assert pool.get_stats()['recycled'] == 1
@@ -0,0 +1,78 @@
+"""
+Unit tests for the buffered Scrapy database pipeline.
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pytest.importorskip('scrapy')
+
+from twisted.internet.defer import maybeDeferred
+
+from src.data.database import db_manager
+from src.data.models import PriceHistory, Product, ProductURL
+from src.scrapers.scrapy_crawler import pipelines
+from src.scrapers.scrapy_crawler.pipelines import BufferedDatabasePipeline
+
+
+@pytest.fixture
+def price_db(tmp_path, monkeypatch):
+    """Fixture providing an empty temporary database, written to synchronously instead of in reactor threads."""
+    previous_config = db_manager.db_config
+    db_manager.initialize(f"sqlite:///{tmp_path / 'prices.db'}")
+    monkeypatch.setattr(pipelines, 'deferToThread', maybeDeferred)
+    yield db_manager
+    db_manager.db_config = previous_config
+
+
+def make_item(url: str, title: str, price: float = None, brand: str = None) -> dict:
+    """Build a validated spider item."""
+    return {'url': url, 'site_name': 'Amazon', 'title': title, 'price': price, 'brand': brand,
+            'availability': 'in_stock', 'scraper_name': 'amazon_spider'}
+
+
+def test_buffered_pipeline_counts_what_each_batch_stored(price_db):
+    """Test that stats count stored and failed items and created rows, not just batch sizes."""
+    pipeline = BufferedDatabasePipeline(batch_size=3)
+    items = [
+        make_item('https://www.amazon.com/dp/PIPE1', 'Pipeline Test Speaker', 30.0, brand='Acme'),
+        # Same title under another brand is the same product
+        make_item('https://www.amazon.com/dp/PIPE1', 'Pipeline Test Speaker', 31.0, brand='Other'),
+        # A missing title fails on products.name NOT NULL and only loses this item
+        make_item('https://www.amazon.com/dp/PIPE2', None, 12.0),
+        make_item('https://www.amazon.com/dp/PIPE3', 'Pipeline Test Cable')
+    ]
+    for item in items:
+        assert pipeline.process_item(item, spider=None) is item
+    # The first three were written as a full batch, the last one on close
+    assert len(pipeline.buffer) == 1
+    pipeline.close_spider(spider=None)
+
+    assert pipeline.stats == {'items_stored': 3, 'items_failed': 1, 'products_created': 2,
+                              'urls_created': 2, 'prices_recorded': 2}
+    assert not pipeline.pending_writes
+    with price_db.get_session() as session:
+        assert session.query(Product).count() == 2
+        assert session.query(ProductURL).count() == 2
+        assert [float(price) for price, in session.query(PriceHistory.price).order_by(PriceHistory.id)] == [30.0, 31.0]
+        # Metadata stays JSON, as DatabasePipeline stored it
+        metadata = [json.loads(row) for row, in session.query(PriceHistory.scraper_metadata).order_by(PriceHistory.id)]
+    assert metadata == [{'scraper_name': 'amazon_spider', 'category': 'electronics'}] * 2
+
+
+def test_buffered_pipeline_moves_a_products_url(price_db):
+    """Test that a product seen at a new URL on the site gets its stored URL updated, as DatabasePipeline did."""
+    pipeline = BufferedDatabasePipeline(batch_size=1)
+    pipeline.process_item(make_item('https://www.amazon.com/dp/OLD', 'Pipeline Test Speaker', 30.0), spider=None)
+    pipeline.process_item(make_item('https://www.amazon.com/dp/NEW', 'Pipeline Test Speaker', 29.0), spider=None)
+    pipeline.close_spider(spider=None)
+
+    with price_db.get_session() as session:
+        assert [url for url, in session.query(ProductURL.url)] == ['https://www.amazon.com/dp/NEW']
+    assert pipeline.stats['urls_created'] == 1
+    assert pipeline.stats['prices_recorded'] == 2
@@ -0,0 +1,132 @@
+"""
+Unit tests for the PriceHistorySnapshot.
+"""
+
+import pytest
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pytest.importorskip("pyarrow")
+
+from src.analysis.snapshot import PriceHistorySnapshot
+from src.analysis.statistics import StatisticsAnalyzer
+from src.data.database import db_manager
+from src.data.models import Product, Site, ProductURL, PriceHistory
+
+
+@pytest.fixture
+def price_db(tmp_path):
+    """Fixture providing a temporary database with one product priced daily on two sites."""
+    previous_config = db_manager.db_config
+    db_manager.initialize(f"sqlite:///{tmp_path / 'prices.db'}")
+
+    with db_manager.get_session() as session:
+        product = Product(name="Test Laptop", category="electronics")
+        amazon = Site(name="Amazon", base_url="https://www.amazon.com", scraper_type="static")
+        ebay = Site(name="eBay", base_url="https://www.ebay.com", scraper_type="static")
+        session.add_all([product, amazon, ebay])
+        session.flush()
+
+        for site in (amazon, ebay):
+            product_url = ProductURL(product_id=product.id, site_id=site.id,
+                                     url=f"{site.base_url}/laptop")
+            session.add(product_url)
+            session.flush()
+            for day in range(4):
+                session.add(PriceHistory(product_url_id=product_url.id, price=100.0 + day,
+                                         scraped_at=datetime(2025, 1, 1) + timedelta(days=day)))
+
+    yield db_manager
+
+    db_manager.db_config = previous_config
+
+
+def add_price(price: float, scraped_at: datetime):
+    """Append a price record to the first product URL."""
+    with db_manager.get_session() as session:
+        session.add(PriceHistory(product_url_id=1, price=price, scraped_at=scraped_at))
+
+
+def test_refresh_only_appends_new_rows(price_db, tmp_path):
+    """Test that a refresh exports new rows only, tracked by the id watermark."""
+    snapshot = PriceHistorySnapshot(str(tmp_path / 'snapshot'), chunk_size=3)
+
+    assert snapshot.refresh() == 8
+    assert snapshot.refresh() == 0
+
+    add_price(90.0, datetime(2025, 1, 10))
+
+    assert snapshot.refresh() == 1
+    assert snapshot.get_info()['last_id'] == 9
+    assert len(snapshot.read()) == 9
+
+
+def test_read_pushes_down_filters(price_db, tmp_path):
+    """Test that site and date filters restrict the rows read."""
+    snapshot = PriceHistorySnapshot(str(tmp_path / 'snapshot'))
+    snapshot.refresh()
+
+    df = snapshot.read(columns=['price', 'site_name'], site_name='eBay',
+                       start_date=date(2025, 1, 2), end_date=date(2025, 1, 3))
+
+    assert sorted(df['price']) == [101.0, 102.0]
+    assert set(df['site_name']) == {'eBay'}
+
+
+def test_snapshot_statistics_match_database(price_db, tmp_path):
+    """Test that product statistics are identical whether read from the ORM or the snapshot."""
+    snapshot = PriceHistorySnapshot(str(tmp_path / 'snapshot'))
+    snapshot.refresh()
+
+    snapshot_analyzer = StatisticsAnalyzer()
+    snapshot_analyzer.snapshot = snapshot
+
+    assert snapshot_analyzer.get_price_statistics_for_product(1) == \
+        StatisticsAnalyzer().get_price_statistics_for_product(1)
+
+
+def test_refresh_picks_up_rows_committed_behind_the_watermark(price_db, tmp_path):
+    """Test that a row whose id was taken before the last refresh but committed after it is exported once."""
+    snapshot = PriceHistorySnapshot(str(tmp_path / 'snapshot'), rescan_window=10)
+    snapshot.refresh()
+
+    # Another writer committed id 10 while id 9 was still in flight
+    with db_manager.get_session() as session:
+        session.add(PriceHistory(id=10, product_url_id=1, price=95.0, scraped_at=datetime(2025, 1, 10)))
+    assert snapshot.refresh() == 1
+
+    with db_manager.get_session() as session:
+        session.add(PriceHistory(id=9, product_url_id=1, price=96.0, scraped_at=datetime(2025, 1, 9)))
+    assert snapshot.refresh() == 1
+    assert snapshot.refresh() == 0
+
+    assert sorted(snapshot.read(columns=['id'])['id']) == list(range(1, 11))
+    assert snapshot.get_info()['last_id'] == 10
+
+
+def test_interrupted_refresh_does_not_duplicate_rows(price_db, tmp_path, monkeypatch):
+    """Test that a part written but never recorded is replaced when the refresh runs again."""
+    snapshot = PriceHistorySnapshot(str(tmp_path / 'snapshot'), chunk_size=3)
+    snapshot.refresh()
+    add_price(90.0, datetime(2025, 1, 10))
+
+    save_state = snapshot._save_state
+
+    def crash_after_writing(state):
+        if 'writing' not in state:
+            raise KeyboardInterrupt
+        save_state(state)
+
+    monkeypatch.setattr(snapshot, '_save_state', crash_after_writing)
+    with pytest.raises(KeyboardInterrupt):
+        snapshot.refresh()
+    monkeypatch.undo()
+
+    # More rows arrive, so the resumed refresh covers a different range than the lost one
+    add_price(91.0, datetime(2025, 1, 11))
+    assert snapshot.refresh() == 2
+    assert sorted(snapshot.read(columns=['id'])['id']) == list(range(1, 11))
@@ -0,0 +1,96 @@
+"""
+Unit tests for the StatisticsAnalyzer.
+"""
+
+import pytest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.analysis.statistics import StatisticsAnalyzer
+from src.data.batch_writer import PriceHistoryBatchWriter
+from src.data.database import db_manager
+from src.data.models import Product, Site, ProductURL, PriceHistory
+from src.scrapers.data_models import ProductData
+
+
+@pytest.fixture
+def price_db(tmp_path):
+    """Fixture providing a temporary database with three products priced on two sites."""
+    previous_config = db_manager.db_config
+    db_manager.initialize(f"sqlite:///{tmp_path / 'prices.db'}")
+
+    with db_manager.get_session() as session:
+        sites = [Site(name="Amazon", base_url="https://www.amazon.com", scraper_type="static"),
+                 Site(name="eBay", base_url="https://www.ebay.com", scraper_type="static")]
+        session.add_all(sites)
+        session.flush()
+
+        for index in range(3):
+            product = Product(name=f"Product {index}", category="electronics")
+            session.add(product)
+            session.flush()
+            for site in sites:
+                product_url = ProductURL(product_id=product.id, site_id=site.id,
+                                         url=f"{site.base_url}/product-{index}")
+                session.add(product_url)
+                session.flush()
+                for day in range(3 + index):
+                    session.add(PriceHistory(product_url_id=product_url.id,
+                                             price=50.0 * (index + 1) + day * (site.id + 1),
+                                             scraped_at=datetime(2025, 1, 1) + timedelta(days=day, hours=site.id)))
+
+        # A product without price history is left out of the results
+        session.add(Product(name="Unpriced Product", category="electronics"))
+
+    yield db_manager
+
+    db_manager.db_config = previous_config
+
+
+def test_bulk_statistics_match_per_product_statistics(price_db):
+    """Test that bulk statistics equal the single-product statistics for every product."""
+    analyzer = StatisticsAnalyzer()
+
+    bulk_stats = analyzer.get_price_statistics_bulk()
+
+    assert sorted(bulk_stats) == [1, 2, 3]
+    for product_id, stats in bulk_stats.items():
+        expected = analyzer.get_price_statistics_for_product(product_id)
+        assert stats.keys() == expected.keys()
+        for key in ('product_name', 'total_data_points'):
+            assert stats[key] == expected[key]
+        for key in ('mean_price', 'median_price', 'min_price', 'max_price',
+                    'std_dev_price', 'last_price', 'price_range'):
+            assert stats[key] == pytest.approx(expected[key])
+        assert stats['stats_by_site'].keys() == expected['stats_by_site'].keys()
+        for site_name, site_stats in stats['stats_by_site'].items():
+            assert site_stats == pytest.approx(expected['stats_by_site'][site_name])
+
+
+def test_bulk_statistics_for_selected_products(price_db):
+    """Test that only the requested products are returned."""
+    analyzer = StatisticsAnalyzer()
+
+    assert sorted(analyzer.get_price_statistics_bulk([2, 4])) == [2]
+    assert analyzer.get_price_statistics_bulk([]) == {}
+
+
+def test_best_deals_average_whole_number_prices_exactly(price_db):
+    """Test that the average of whole-number prices keeps its fraction, so a small drop is still a deal."""
+    writer = PriceHistoryBatchWriter(db=price_db)
+    for day, price in enumerate((101, 101, 100)):
+        product = ProductData(url="https://www.amazon.com/dp/DEAL")
+        product.title = "Deal Test Speaker"
+        product.metadata["category"] = "audio"
+        product.price = price
+        writer.write_batch([(product, 'Amazon', datetime(2025, 2, 1) + timedelta(days=day))])
+
+    deals = StatisticsAnalyzer().get_best_deals(category="audio")
+
+    assert list(deals['product_name']) == ["Deal Test Speaker"]
+    assert deals['avg_price'].iloc[0] == pytest.approx(302 / 3)
+    assert deals['latest_price'].iloc[0] == 100.0
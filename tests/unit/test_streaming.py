@@ -0,0 +1,87 @@
+"""
+Unit tests for streamed downloads that stop at their targets.
+"""
+
+import pytest
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.scrapers.static_scraper import AmazonScraper
+from src.scrapers.streaming import StreamSettings, StreamingBody, read_streamed, stream_stats
+
+FIXTURE = Path(__file__).resolve().parents[1] / 'fixtures' / 'amazon_product.html'
+
+
+@pytest.fixture
+def page_server():
+    """Fixture serving the stored Amazon page over HTTP with a Content-Length."""
+    body = FIXTURE.read_bytes()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/dp/B0STREAM01', len(body)
+    server.shutdown()
+    server.server_close()
+
+
+def test_targets_split_across_chunks_and_byte_cap():
+    """Test that targets spanning chunk boundaries are found and the cap ends reading."""
+    settings = StreamSettings.from_config({'streaming': {
+        'enabled': True, 'stop_selectors': ['#productTitle', 'span.price'], 'stop_margin': 10}})
+    page = ('<html>' + 'x' * 50 + '<h1 id="productTitle">Phone</h1>' + 'y' * 50 +
+            '<span class="big price">9.99</span>' + 'z' * 1000 + '</html>').encode('utf-8')
+
+    body = StreamingBody(settings, 'utf-8')
+    text = read_streamed((page[i:i + 7] for i in range(0, len(page), 7)), body)
+    assert body.outcome == 'stopped' and '9.99</span>' in text and len(text) < 200
+
+    capped = StreamingBody(StreamSettings(targets=settings.targets, max_bytes=64), 'utf-8')
+    read_streamed((page[i:i + 16] for i in range(0, len(page), 16)), capped)
+    assert capped.outcome == 'capped' and capped.bytes_read == 64
+
+    assert StreamSettings.from_config({}) is None
+    with pytest.raises(ValueError):
+        StreamSettings.from_config({'streaming': {'enabled': True, 'stop_selectors': ['div > span']}})
+
+
+def test_streamed_fetch_stops_early_with_same_product(page_server):
+    """Test that a streamed fetch closes the connection early and parses the same product."""
+    url, page_size = page_server
+    scraper = AmazonScraper()
+    scraper.rate_limit = 0
+    scraper.http_cache.enabled = False
+    scraper.streaming = StreamSettings.from_config({'streaming': {
+        'enabled': True, 'chunk_size': 4096,
+        'stop_selectors': ['#productTitle', '.a-price-whole', '#availability', '#bylineInfo', '#landingImage']}})
+    before = stream_stats.get_stats().get('amazon', {}).get('bytes_saved', 0)
+
+    html_content = scraper.fetch_page(url)
+    streamed = scraper.parse_page(html_content, url).to_dict()
+    full = scraper.parse_page(FIXTURE.read_text(encoding='utf-8'), url).to_dict()
+    scraper.close()
+
+    assert len(html_content) < page_size // 2
+    for field in ('title', 'price', 'availability', 'brand', 'image_url'):
+        assert streamed[field] == full[field]
+    stats = stream_stats.get_stats()['amazon']
+    assert stats['stopped_early'] >= 1 and stats['bytes_saved'] - before > page_size // 2
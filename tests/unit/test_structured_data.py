@@ -0,0 +1,77 @@
+"""
+Unit tests for the JSON-LD / microdata fast path.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.scrapers.structured_data import extract_structured_data
+from src.scrapers.static_scraper import AmazonScraper
+
+JSON_LD_PAGE = '''<html><head>
+<script type="application/ld+json">{"@context": "https://schema.org", "@type": "BreadcrumbList"}</script>
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "WebPage", "name": "Acme store"},
+  {"@type": ["Product"], "name": "Acme Headphones &amp; Case", "brand": {"@type": "Brand", "name": "Acme"},
+   "image": ["https://img.example.com/1.jpg"],
+   "offers": [{"@type": "Offer", "price": "1,249.99", "priceCurrency": "EUR",
+               "availability": "https://schema.org/InStock"}],
+   "aggregateRating": {"ratingValue": "4.6", "reviewCount": "1,024"}}
+]}
+</script></head><body><h1 id="productTitle">DOM title</h1></body></html>'''
+
+MICRODATA_PAGE = ('<html><body><div itemscope itemtype="https://schema.org/Product">'
+                  '<h1 id="productTitle">Microdata Product</h1>'
+                  '<meta itemprop="price" content="35,00"><meta itemprop="priceCurrency" content="GEL">'
+                  '<link itemprop="availability" href="https://schema.org/OutOfStock">'
+                  '<span itemprop="ratingValue" content="4"></span><span data-content="9" itemprop="reviewCount">9</span>'
+                  '</div></body></html>')
+
+
+def test_json_ld_product_fields():
+    """Test that a Product inside @graph is mapped to ProductData fields."""
+    assert extract_structured_data(JSON_LD_PAGE) == {
+        'title': 'Acme Headphones & Case',
+        'brand': 'Acme',
+        'image_url': 'https://img.example.com/1.jpg',
+        'price': 1249.99,
+        'currency': 'EUR',
+        'availability': 'in_stock',
+        'rating': 4.6,
+        'reviews_count': 1024
+    }
+
+
+def test_microdata_content_attributes():
+    """Test microdata read from content/href attributes, ignoring text-only properties."""
+    assert extract_structured_data(MICRODATA_PAGE) == {
+        'price': 35.0,
+        'currency': 'GEL',
+        'availability': 'out_of_stock',
+        'rating': 4.0
+    }
+    assert extract_structured_data('<script type="application/ld+json">{broken</script>') == {}
+
+
+def test_complete_structured_data_skips_dom_parse():
+    """Test that parse_page only runs when structured data lacks required fields."""
+    scraper = AmazonScraper()
+    url = 'https://www.amazon.com/dp/B0ACME1234'
+
+    parse_page = scraper.parse_page
+    scraper.parse_page = lambda html_content, url: pytest.fail("page with complete JSON-LD was parsed")
+    product = scraper.extract_product(JSON_LD_PAGE, url)
+    assert product.title == 'Acme Headphones & Case' and product.price == 1249.99
+    assert product.metadata == {'asin': 'B0ACME1234', 'extraction': 'structured_data'}
+
+    scraper.parse_page = parse_page
+    product = scraper.extract_product(MICRODATA_PAGE, url)
+    assert product.title == 'Microdata Product'
+    assert product.price == 35.0 and product.availability == 'out_of_stock'
+    assert 'extraction' not in product.metadata
+    scraper.close()
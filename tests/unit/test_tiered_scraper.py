@@ -0,0 +1,149 @@
+"""
+Unit tests for static-to-Selenium escalation and remembered fetch tiers.
+"""
+
+import pytest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.data.batch_writer import PriceHistoryBatchWriter
+from src.data.database import db_manager
+from src.data.fetch_tiers import FetchTierStore, url_pattern
+from src.data.models import FetchTier
+from src.scrapers.data_models import ProductData, ScrapingError
+from src.scrapers.factory import ScraperFactory
+from src.scrapers.static_scraper import AmazonScraper
+from src.scrapers.tiered_scraper import AmazonTieredScraper
+
+STATIC_PAGE = '<html><h1 id="productTitle">{title}</h1>{price}</html>'
+
+
+class FakeSeleniumScraper:
+    """Selenium variant stand-in returning a fully rendered product."""
+
+    def __init__(self):
+        self.urls = []
+
+    def scrape_product(self, url, known_fingerprint=None):
+        self.urls.append(url)
+        product = ProductData(url)
+        product.title = f"Rendered {url.rsplit('/', 1)[-1]}"
+        product.price = 19.99
+        return product
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def price_db(tmp_path):
+    """Fixture providing an empty temporary database."""
+    previous_config = db_manager.db_config
+    db_manager.initialize(f"sqlite:///{tmp_path / 'prices.db'}")
+    yield db_manager
+    db_manager.db_config = previous_config
+
+
+def tiered_scraper(store, pages):
+    scraper = AmazonTieredScraper()
+    scraper.rate_limit = 0
+    scraper.http_cache.enabled = False
+    scraper.api_capture = None
+    scraper.tier_store = store
+    scraper.fetch_page = lambda url: pages[url]
+    scraper._selenium_scraper = FakeSeleniumScraper()
+    return scraper
+
+
+def test_url_pattern_keeps_routes_and_hides_identifiers():
+    """Test that product URLs of one kind share a pattern."""
+    assert url_pattern('https://www.amazon.com/Acme-Phone/dp/B0ACME0001?th=1') == 'www.amazon.com/*/dp/*'
+    assert url_pattern('https://www.ebay.com/itm/1234567890') == 'www.ebay.com/itm/*'
+    assert isinstance(ScraperFactory.create_scraper('amazon'), AmazonScraper)
+
+
+def test_escalates_only_pages_missing_fields_and_remembers_tier(price_db):
+    """Test escalation, per-URL memory across stores and per-pattern decisions for new URLs."""
+    store = FetchTierStore(db=price_db, min_pattern_samples=2)
+    static_url = 'https://www.amazon.com/dp/STATIC01'
+    js_urls = [f'https://www.amazon.com/gp/product/JSPAGE0{number}' for number in range(3)]
+    pages = {static_url: STATIC_PAGE.format(title='Static Product', price='<span class="a-price-whole">9.99</span>')}
+    pages.update({url: STATIC_PAGE.format(title='Loading', price='') for url in js_urls})
+    scraper = tiered_scraper(store, pages)
+    writer = PriceHistoryBatchWriter(db=price_db)
+    writer.fetch_tiers = store
+
+    static = scraper.scrape_product(static_url)
+    assert static.price == 9.99 and static.metadata['fetch_tier'] == 'static'
+
+    rendered = [scraper.scrape_product(url) for url in js_urls[:2]]
+    assert [product.metadata['fetch_tier'] for product in rendered] == ['selenium', 'selenium']
+    assert scraper.tier_stats == {'static': 1, 'escalated': 2, 'selenium': 2}
+    writer.write_batch([(product, 'Amazon', datetime(2025, 1, 1)) for product in [static] + rendered])
+
+    # The pattern now sends unseen URLs straight to the browser
+    scraper.fetch_page = lambda url: pytest.fail("static fetch for a Selenium pattern")
+    assert scraper.scrape_product(js_urls[2]).title == 'Rendered JSPAGE02'
+    assert scraper.tier_stats['escalated'] == 2
+
+    reloaded = FetchTierStore(db=price_db)
+    assert reloaded.tier_for(js_urls[0], now=datetime(2025, 1, 2)) == 'selenium'
+    assert reloaded.tier_for(static_url) == 'static'
+    with db_manager.get_session() as session:
+        assert session.query(FetchTier).count() == 3
+    scraper.close()
+
+
+def test_network_failures_are_not_escalated():
+    """Test that pages that could not be downloaded do not start a browser."""
+    store = FetchTierStore(db=db_manager, min_pattern_samples=2)
+    store._by_url = {}
+    scraper = tiered_scraper(store, {})
+
+    def unreachable(url):
+        raise ScrapingError("Failed to fetch page", "network", url)
+    scraper.fetch_page = unreachable
+
+    assert scraper.scrape_product('https://www.amazon.com/dp/OFFLINE01') is None
+    assert scraper._selenium_scraper.urls == []
+    scraper.close()
+
+
+def test_selenium_tier_is_rechecked_statically_once_it_ages(price_db):
+    """Test that old Selenium tiers are probed with plain HTTP and renewed or dropped by the result."""
+    store = FetchTierStore(db=price_db, selenium_recheck_hours=24)
+    urls = [f'https://www.amazon.com/dp/RECHECK0{number}' for number in range(2)]
+    writer = PriceHistoryBatchWriter(db=price_db)
+    writer.fetch_tiers = store
+
+    def rendered(url):
+        product = ProductData(url)
+        product.title, product.price = 'Rendered Product', 19.99
+        product.metadata['fetch_tier'] = 'selenium'
+        return product
+
+    store.observe(urls[0], 'selenium', seen_at=datetime(2025, 1, 1))
+    writer.write_batch([(rendered(url), 'Amazon', datetime(2025, 1, 1)) for url in urls])
+    assert store.tier_for(urls[0], now=datetime(2025, 1, 1, 12)) == 'selenium'
+    assert store.tier_for(urls[0], now=datetime(2025, 1, 2)) is None
+
+    # A recheck that still needs the browser renews the stored tier
+    writer.write_batch([(rendered(urls[0]), 'Amazon', datetime(2025, 1, 3))])
+    reloaded = FetchTierStore(db=price_db, selenium_recheck_hours=24)
+    assert reloaded.tier_for(urls[0], now=datetime(2025, 1, 3, 12)) == 'selenium'
+    assert reloaded.tier_for(urls[1], now=datetime(2025, 1, 3, 12)) is None
+
+    # A page that no longer needs JavaScript moves back to the static tier
+    recent = FetchTierStore(db=price_db, selenium_recheck_hours=24)
+    recent.observe(urls[1], 'selenium', seen_at=datetime.utcnow() - timedelta(days=2))
+    scraper = tiered_scraper(recent, {urls[1]: STATIC_PAGE.format(
+        title='Static Again', price='<span class="a-price-whole">9.99</span>')})
+    product = scraper.scrape_product(urls[1])
+    assert product.metadata['fetch_tier'] == 'static'
+    assert scraper._selenium_scraper.urls == []
+    assert recent.tier_for(urls[1]) == 'static'
+    scraper.close()